@@ -0,0 +1,1032 @@
+"""DX OUTLET 매출 분석 로직
+
+세 대시보드(streamlit_app, dashboard_streamlit, dashboard_streamlit_backup)와
+배치 리포트가 함께 사용하는 적재/필터/요약/순위/효율/인사이트 함수 모음입니다.
+Streamlit과 Plotly에 의존하지 않으므로(numpy, pandas만 사용) 서버 없이도
+호출하거나 따로 캐시, 벤치마크, 병렬 실행할 수 있습니다.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.environ.get('DX_OUTLET_DATA', 'DX OUTLET MS DB.csv')
+DATA_BACKEND = os.environ.get('DX_DATA_BACKEND', 'pandas')  # pandas, sqlite, mmap
+SALES_COLUMNS = ['23SS', '23FW', '24SS', '24FW', '25SS']
+DATA_COLUMNS = ['형태', '유통사', '매장명', '브랜드'] + SALES_COLUMNS + ['매장 면적']
+FOCUS_BRAND = '디스커버리'
+PYEONG_TO_SQM = 3.3058  # 1평 = 3.3058㎡
+
+
+# 적재 검증 규칙: (키, 사유, 제외 여부). 제외 규칙에 걸린 행은 분석에서 빠지고
+# 나머지 규칙은 행을 유지한 채 경고로만 표시합니다.
+VALIDATION_RULES = [
+    ('missing_key', "필수값 누락", True),
+    ('malformed', "숫자 형식 오류", True),
+    ('duplicate', "매장-브랜드 중복", True),
+    ('negative', "음수 값", False),
+    ('area_conflict', "매장 면적 불일치", False),
+]
+DIMENSION_COLUMNS = ['형태', '유통사', '매장명', '브랜드']
+NUMERIC_COLUMNS = SALES_COLUMNS + ['매장 면적']
+KEY_COLUMNS = ['유통사', '매장명', '브랜드']  # 행 식별 키 (중복 검사, 데이터 변경 비교)
+VALUE_COLUMNS = ['형태'] + NUMERIC_COLUMNS  # 내용 해시 대상
+QUARANTINE_COLUMNS = ['행 번호', '구분', '사유']
+
+
+def load_dataset(path=DATA_PATH):
+    """CSV 파일을 로드하고 데이터를 전처리합니다."""
+    return load_validated_dataset(path)[0]
+
+
+def load_validated_dataset(path=DATA_PATH):
+    """CSV 파일을 로드하고 검증하여 (데이터프레임, DataQuality)를 반환합니다."""
+    return validate_dataset(pd.read_csv(path))
+
+
+def check_columns(columns):
+    """필수 컬럼이 모두 있는지 확인합니다. (없으면 ValueError)"""
+    missing_columns = [col for col in DIMENSION_COLUMNS + NUMERIC_COLUMNS if col not in columns]
+    if missing_columns:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing_columns)}")
+
+
+def validate_dataset(raw):
+    """원본 데이터프레임을 검증하여 (정제된 데이터프레임, DataQuality)를 반환합니다.
+
+    모든 규칙을 컬럼 단위 벡터 연산으로 계산하므로 행 수가 늘어도 파이썬
+    반복이 없습니다. 중복 매장-브랜드 행은 첫 행만 남기고, 매장 면적은
+    같은 매장에 서로 다른 값이 있을 때만 불일치로 봅니다. (면적은 보통
+    매장의 첫 행에만 있음) 빈 매출/면적 값은 기존과 같이 0으로 채웁니다.
+    """
+    check_columns(raw.columns)
+
+    masks = {'missing_key': raw[DIMENSION_COLUMNS].isna().any(axis=1).to_numpy()}
+    malformed = np.zeros(len(raw), dtype=bool)
+    negative = np.zeros(len(raw), dtype=bool)
+    numeric = {}
+    for col in NUMERIC_COLUMNS:
+        values = raw[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors='coerce')
+            malformed |= (raw[col].notna() & values.isna()).to_numpy()
+        negative |= (values < 0).to_numpy()
+        numeric[col] = values
+    df = raw.assign(**numeric)
+    masks['malformed'] = malformed
+    masks['negative'] = negative
+
+    # 중복은 제외되지 않은 행끼리만 비교 (형식 오류 행 때문에 정상 행이 빠지지 않도록)
+    valid = ~(masks['missing_key'] | malformed)
+    duplicate = np.zeros(len(raw), dtype=bool)
+    duplicate[valid] = df[valid].duplicated(KEY_COLUMNS).to_numpy()
+    masks['duplicate'] = duplicate
+
+    kept = valid & ~duplicate
+    area = df['매장 면적'].where(kept)
+    distinct_areas = area.groupby([df['유통사'], df['매장명']]).transform('nunique')
+    masks['area_conflict'] = (area.notna() & (distinct_areas > 1)).to_numpy()
+
+    excluded = ~kept
+    flagged = excluded.copy()
+    for key, _, _ in VALIDATION_RULES:
+        flagged |= masks[key]
+
+    reasons = pd.Series('', index=raw.index[flagged])
+    for key, label, _ in VALIDATION_RULES:
+        reasons += np.where(masks[key][flagged], label + ', ', '')
+    quarantine = raw[flagged].reset_index(drop=True)
+    quarantine.insert(0, '사유', reasons.str[:-2].to_numpy())
+    quarantine.insert(0, '구분', np.where(excluded[flagged], '제외', '경고'))
+    quarantine.insert(0, '행 번호', np.flatnonzero(flagged) + 2)  # CSV 줄 번호 (헤더가 1행)
+
+    summary = {
+        'rows': len(raw),
+        'excluded': int(excluded.sum()),
+        'warned': int((flagged & ~excluded).sum()),
+        'rules': {label: int(masks[key].sum()) for key, label, _ in VALIDATION_RULES},
+    }
+
+    # 결측값 처리
+    df = df[kept].fillna(0).reset_index(drop=True)
+    return df, DataQuality(summary, quarantine)
+
+
+class DataQuality:
+    """적재 검증 결과 (규칙별 행 수 요약과 제외/경고 행을 모은 격리 테이블)"""
+
+    def __init__(self, summary, quarantine):
+        self.summary = summary
+        self.quarantine = quarantine
+
+    @property
+    def clean(self):
+        return not self.summary['excluded'] and not self.summary['warned']
+
+    def to_json(self):
+        """SQLite/행렬 백엔드에 함께 저장할 JSON 문자열을 만듭니다."""
+        return _report_json(self.summary, self.quarantine)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(*_report_from_json(text))
+
+
+def row_hashes(df):
+    """행별 내용 해시(uint64 배열)를 반환합니다. (키를 뺀 값 컬럼, 숫자는 실수로 맞춰 비교)"""
+    values = df[VALUE_COLUMNS].astype({col: float for col in NUMERIC_COLUMNS})
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def content_version(df):
+    """키와 내용 해시로 데이터셋 내용 버전 문자열을 만듭니다. (내용이 같으면 파일을 다시 저장해도 같음)"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df[KEY_COLUMNS], index=False).to_numpy().tobytes())
+    digest.update(row_hashes(df).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def key_hashes(df):
+    """(유통사, 매장명, 브랜드) 키, 행 내용 해시, 행 위치 테이블을 반환합니다. (changed_keys 비교용)"""
+    return df[KEY_COLUMNS].assign(
+        _hash=pd.array(row_hashes(df), dtype='UInt64'), _position=np.arange(len(df))
+    ).reset_index(drop=True)
+
+
+def changed_keys(previous, current):
+    """두 key_hashes 테이블을 비교하여 추가/삭제/변경된 행의 키를 반환합니다.
+
+    남은 행끼리의 순서가 바뀌었으면 필터 결과의 행 순서도 달라지므로 모든 키를
+    바뀐 것으로 봅니다.
+    """
+    merged = pd.merge(previous, current, on=KEY_COLUMNS, how='outer', suffixes=(' (이전)', ''), indicator=True)
+    both = (merged['_merge'] == 'both').to_numpy()
+    changed = ~both | merged['_hash (이전)'].ne(merged['_hash']).fillna(False).to_numpy(dtype=bool)
+    kept = merged[both].sort_values('_position')
+    if (np.diff(kept['_position (이전)'].to_numpy()) <= 0).any():
+        changed[:] = True
+    return merged.loc[changed, KEY_COLUMNS].reset_index(drop=True)
+
+
+def diff_datasets(previous, current, previous_version=None, current_version=None):
+    """두 데이터셋을 (유통사, 매장명, 브랜드) 키로 맞춰 추가/삭제/변경된 행을 DatasetChanges로 반환합니다.
+
+    변경 여부는 행 내용 해시로 판단하며, 변경 테이블에는 값 컬럼마다
+    이전 값('<컬럼> (이전)')과 현재 값을 나란히 둡니다. 두 데이터셋 모두
+    validate_dataset을 거쳐 키가 유일하다고 가정합니다.
+    """
+    merged = pd.merge(
+        previous[KEY_COLUMNS + VALUE_COLUMNS].assign(_hash=pd.array(row_hashes(previous), dtype='UInt64')),
+        current[KEY_COLUMNS + VALUE_COLUMNS].assign(_hash=pd.array(row_hashes(current), dtype='UInt64')),
+        on=KEY_COLUMNS, how='outer', suffixes=(' (이전)', ''), indicator=True
+    )
+    side = merged['_merge'].to_numpy()
+    modified = merged['_hash (이전)'].ne(merged['_hash']).fillna(False).to_numpy(dtype=bool)
+    status = np.select([side == 'left_only', side == 'right_only', modified], ['삭제', '추가', '변경'], default='')
+
+    changed = status != ''
+    columns = KEY_COLUMNS + [name for col in VALUE_COLUMNS for name in (f'{col} (이전)', col)]
+    table = merged.loc[changed, columns].reset_index(drop=True)
+    table.insert(0, '변경', status[changed])
+    summary = {
+        'previous_version': previous_version,
+        'current_version': current_version,
+        'added': int((status == '추가').sum()),
+        'removed': int((status == '삭제').sum()),
+        'changed': int((status == '변경').sum()),
+        'unchanged': int(len(merged) - changed.sum()),
+    }
+    return DatasetChanges(summary, table)
+
+
+class DatasetChanges:
+    """두 데이터셋 버전 사이의 키 단위 추가/삭제/변경 내역"""
+
+    def __init__(self, summary, table):
+        self.summary = summary
+        self.table = table
+
+    @property
+    def empty(self):
+        return self.table.empty
+
+    def to_json(self):
+        return _report_json(self.summary, self.table)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(*_report_from_json(text))
+
+
+def _report_json(summary, frame):
+    frame = frame.astype(object).where(frame.notna(), None)
+    return json.dumps({
+        'summary': summary,
+        'columns': frame.columns.tolist(),
+        'rows': frame.to_numpy().tolist(),
+    }, ensure_ascii=False, default=str)
+
+
+def _report_from_json(text):
+    data = json.loads(text)
+    return data['summary'], pd.DataFrame(data['rows'], columns=data['columns'])
+
+
+def dataset_version(path=DATA_PATH):
+    """데이터 파일의 경로, 크기, 수정 시각으로 데이터셋 버전 문자열을 만듭니다."""
+    stat = os.stat(path)
+    return hashlib.sha1(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+
+
+def filter_options(df, column, distributor='전체'):
+    """필터 선택지('전체' + 정렬된 고유값)를 반환합니다. 유통사를 지정하면 해당 유통사 행만 사용"""
+    if distributor != '전체':
+        df = df[df['유통사'] == distributor]
+    return ['전체'] + sorted(df[column].unique().tolist())
+
+
+def filter_dataset(df, distributor='전체', store='전체', brand='전체'):
+    """유통사/매장/브랜드 조건으로 데이터를 필터링합니다."""
+    mask = np.ones(len(df), dtype=bool)
+    if distributor != '전체':
+        mask &= (df['유통사'] == distributor).to_numpy()
+    if store != '전체':
+        mask &= (df['매장명'] == store).to_numpy()
+    if brand != '전체':
+        mask &= (df['브랜드'] == brand).to_numpy()
+    return df[mask]
+
+
+def season_columns(season):
+    """시즌(SS/FW)에 해당하는 현재/전년 컬럼을 반환합니다."""
+    if season == 'SS':
+        return '25SS', '24SS'
+    return '24FW', '23FW'  # 25FW가 없으므로 24FW 사용
+
+
+def growth_rate(current, previous):
+    """전년 대비 신장률(%)을 계산합니다. 전년 값이 0 이하이면 0"""
+    current = np.asarray(current, dtype=float)
+    previous = np.asarray(previous, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(previous > 0, (current - previous) / previous * 100, 0.0)
+    return rate if rate.ndim else float(rate)
+
+
+# 금액을 억원 단위로 변환
+def format_amount(value):
+    if value == 0:
+        return "0억원"
+    amount_in_hundred_millions = value / 100_000_000  # 억원 단위
+    if amount_in_hundred_millions >= 1:
+        return f"{amount_in_hundred_millions:.2f}억원"
+    else:
+        return f"{value/10_000:.0f}만원"
+
+
+# 신장률 포맷팅 (색상과 아이콘)
+def format_growth_rate(value):
+    if value > 0:
+        return f"🟢 ▲ {value}%"
+    elif value < 0:
+        return f"🔴 ▼ {value}%"
+    else:
+        return f"⚪ {value}%"
+
+
+# 순위 변동 포맷팅 (순위 - 전년순위 기준, 양수면 하락)
+def format_rank_shift(rank, change):
+    if change == 0:
+        return f"{rank} ⚪(-)"
+    elif change > 0:
+        return f"{rank} 🔴▼{change}"
+    else:
+        return f"{rank} 🟢▲{abs(change)}"
+
+
+# 순위 변화 포맷팅 (전년순위 - 순위 기준, 양수면 상승)
+def format_rank_change(rank, change):
+    if change == 0:
+        return f"{rank}(-)"
+    elif change > 0:
+        return f"{rank}(▲{change})"
+    else:
+        return f"{rank}(▼{abs(change)})"
+
+
+def format_to_hundred_million(value):
+    """억원 단위로 변환합니다."""
+    return f"{value / 100000000:.1f}억원"
+
+
+# HTML 강조 스타일 (large는 MS 테이블용 큰 글씨와 진한 색상)
+_HTML_STYLES = {
+    False: {
+        'up': "color: #0066cc; font-weight: bold;",
+        'down': "color: #cc0000; font-weight: bold;",
+        'flat': "color: #666;",
+    },
+    True: {
+        'up': "color: #0066ff; font-weight: bold; font-size: 14px;",
+        'down': "color: #ff0000; font-weight: bold; font-size: 14px;",
+        'flat': "color: #666; font-size: 14px;",
+    },
+}
+
+
+def format_growth_with_color(growth, large=False):
+    """전년비를 색상과 함께 표시합니다."""
+    styles = _HTML_STYLES[large]
+    if growth > 0:
+        return f"<span style='{styles['up']}'>▲ {growth:+.1f}%</span>"
+    elif growth < 0:
+        return f"<span style='{styles['down']}'>▼ {growth:+.1f}%</span>"
+    else:
+        return f"<span style='{styles['flat']}'>0.0%</span>"
+
+
+def format_efficiency_to_hundred_million(value):
+    """평당 매출을 억원 단위로 변환합니다."""
+    return f"{value / 100000000:.1f}억원/평"
+
+
+def format_efficiency_to_million(value):
+    """평당 매출을 백만원 단위로 변환합니다."""
+    return f"{value / 1000000:.2f}백만원/평"
+
+
+def format_rank_change_html(rank, change, large=False):
+    """순위와 전년 대비 변동(양수면 상승)을 색상과 함께 표시합니다."""
+    styles = _HTML_STYLES[large]
+    if change > 0:
+        return f"{rank}<span style='{styles['up']}'>(▲{change})</span>"
+    elif change < 0:
+        return f"{rank}<span style='{styles['down']}'>(▼{abs(change)})</span>"
+    else:
+        return f"{rank}(-)"
+
+
+def kpi_summary(df, sales_col='25SS'):
+    """매장 수, 브랜드 수, 시즌 총 매출, 평균 매장 면적(값이 없으면 None)을 계산합니다."""
+    avg_area = df['매장 면적'].mean()
+    return {
+        'stores': df['매장명'].nunique(),
+        'brands': df['브랜드'].nunique(),
+        'sales': df[sales_col].sum(),
+        'avg_area': None if pd.isna(avg_area) else avg_area,
+    }
+
+
+def season_totals(df):
+    """시즌별 총 매출(SALES_COLUMNS 순서)을 계산합니다."""
+    return df[SALES_COLUMNS].sum()
+
+
+def top_sales(df, by, column='25SS', top_n=10):
+    """그룹별 매출 합계 상위 top_n개를 내림차순으로 반환합니다."""
+    return df.groupby(by)[column].sum().sort_values(ascending=False).head(top_n)
+
+
+def area_sales(df, column='25SS'):
+    """매장별 면적과 매출 합계를 반환합니다. (면적 또는 매출이 없는 매장 제외)"""
+    return df.groupby('매장명').agg({'매장 면적': 'first', column: 'sum'}).dropna().reset_index()
+
+
+def brand_season_matrix(df, top_n=15, sort_column='25SS'):
+    """브랜드 × 시즌 매출 합계 중 sort_column 기준 상위 top_n개 브랜드를 반환합니다."""
+    matrix = df.groupby('브랜드')[SALES_COLUMNS].sum()
+    return matrix.sort_values(sort_column, ascending=False).head(top_n)
+
+
+def rank_changes(previous_values):
+    """현재 순위 순서로 정렬된 항목들의 전년 대비 순위 변동(전년순위 - 현재순위, 양수면 상승)을 계산합니다.
+
+    전년 순위는 previous_values 내림차순이며, 값이 같으면 현재 순서를 따릅니다.
+    """
+    previous_values = np.asarray(previous_values, dtype=float)
+    previous_order = (-previous_values).argsort(kind='stable')
+    previous_rank = np.empty(len(previous_values), dtype=int)
+    previous_rank[previous_order] = np.arange(1, len(previous_values) + 1)
+    return previous_rank - np.arange(1, len(previous_values) + 1)
+
+
+def generate_ai_insights(df, season, current_col, previous_col):
+    """데이터 기반 규칙으로 인사이트 카드 목록을 생성합니다."""
+    insights = []
+
+    # 1. 디스커버리 브랜드 성과 분석
+    discovery_data = df[df['브랜드'] == FOCUS_BRAND]
+    discovery_current = 0
+    discovery_previous = 0
+    discovery_growth = 0
+
+    # 변수 초기화
+    discovery_stores = pd.Series(dtype=int)
+    top_distributor = None
+    top_distributor_stores = 0
+
+    if not discovery_data.empty:
+        discovery_current = discovery_data[current_col].sum()
+        discovery_previous = discovery_data[previous_col].sum()
+        discovery_growth = ((discovery_current - discovery_previous) / discovery_previous * 100) if discovery_previous > 0 else 0
+
+        # 디스커버리 브랜드 심층 분석
+        discovery_stores = discovery_data.groupby('유통사').size().sort_values(ascending=False)
+        top_distributor = discovery_stores.index[0] if not discovery_stores.empty else None
+        top_distributor_stores = discovery_stores.iloc[0] if not discovery_stores.empty else 0
+
+        if discovery_growth > 0:
+            growth_analysis = f"디스커버리 브랜드가 {current_col} 시즌에 전년 대비 {discovery_growth:.1f}%의 성장을 달성했습니다. "
+            growth_analysis += f"이는 시장 내에서 상당한 경쟁력을 보유하고 있음을 시사합니다. "
+            growth_analysis += f"특히 {top_distributor} 유통사가 {top_distributor_stores}개 매장으로 최대 점포수를 운영하고 있어, "
+            growth_analysis += f"해당 유통사와의 파트너십이 성장의 핵심 동력이 되고 있습니다."
+
+            insights.append({
+                'type': 'success',
+                'title': '🎯 디스커버리 브랜드 강력한 성장세',
+                'content': growth_analysis,
+                'recommendation': f"성장 모멘텀을 지속하기 위해 {top_distributor}와의 협력을 더욱 강화하고, 다른 유통사와의 파트너십 확대를 검토하세요. 또한 고성장 브랜드로서 프리미엄 포지셔닝을 통해 수익성을 개선할 수 있습니다."
+            })
+        else:
+            decline_analysis = f"디스커버리 브랜드가 {current_col} 시즌에 전년 대비 {abs(discovery_growth):.1f}% 감소했습니다. "
+            decline_analysis += f"이는 시장 경쟁이 치열해지고 있거나 고객 선호도 변화가 있을 수 있음을 의미합니다. "
+            decline_analysis += f"현재 {len(discovery_stores)}개 유통사를 통해 운영되고 있으며, "
+            decline_analysis += f"각 유통사별 성과 차이가 클 가능성이 높습니다."
+
+            insights.append({
+                'type': 'warning',
+                'title': '⚠️ 디스커버리 브랜드 성과 개선 필요',
+                'content': decline_analysis,
+                'recommendation': f"유통사별 성과를 세분화하여 분석하고, 저성과 유통사에 대한 지원을 강화하세요. 또한 브랜드 차별화 전략과 타겟 고객 재정의를 통해 경쟁력을 회복해야 합니다."
+            })
+
+    # 2. 시장 점유율 및 경쟁 분석
+    total_current = df[current_col].sum()
+    total_previous = df[previous_col].sum()
+    market_growth = ((total_current - total_previous) / total_previous * 100) if total_previous > 0 else 0
+
+    if not discovery_data.empty and total_current > 0:
+        discovery_share = (discovery_current / total_current) * 100
+
+        # 경쟁 브랜드 분석
+        brand_performance = df.groupby('브랜드')[current_col].sum().sort_values(ascending=False)
+        discovery_rank = (brand_performance.index == FOCUS_BRAND).argmax() + 1 if FOCUS_BRAND in brand_performance.index else 0
+
+        market_analysis = f"디스커버리 브랜드의 현재 시장 점유율은 {discovery_share:.1f}%로 시장에서 {discovery_rank}위를 차지하고 있습니다. "
+        market_analysis += f"전체 시장이 {market_growth:+.1f}% 성장한 상황에서, 디스커버리의 상대적 위치를 분석해보면 "
+        market_analysis += f"시장 성장률 대비 브랜드 성장률이 {'상회' if discovery_growth > market_growth else '하회'}하고 있습니다. "
+        market_analysis += f"이는 시장 점유율 {'확대' if discovery_growth > market_growth else '축소'}를 의미하며, "
+        market_analysis += f"경쟁 브랜드 대비 {'우위' if discovery_growth > market_growth else '열위'}를 보이고 있음을 나타냅니다."
+
+        insights.append({
+            'type': 'info',
+            'title': '📊 시장 점유율 및 경쟁력 분석',
+            'content': market_analysis,
+            'recommendation': f"시장 점유율 확대를 위해 경쟁사 대비 차별화된 마케팅 전략과 제품 포트폴리오 강화가 필요합니다. 또한 타겟 고객 세분화를 통해 특정 시장에서의 경쟁 우위를 확보하세요."
+        })
+
+    # 3. 매장 효율성 및 운영 최적화 분석
+    has_area = (df['매장 면적'] > 0).to_numpy()
+    if has_area.any():
+        efficiency_data = df.loc[has_area, ['매장명', '유통사']]
+        efficiency = df.loc[has_area, current_col].to_numpy(dtype=float) / df.loc[has_area, '매장 면적'].to_numpy(dtype=float)
+        best_store = efficiency_data.iloc[int(np.argmax(efficiency))]
+        best_efficiency = efficiency.max()
+        avg_efficiency = efficiency.mean()
+        efficiency_std = efficiency.std(ddof=1) if len(efficiency) > 1 else float('nan')
+
+        efficiency_analysis = f"{best_store['매장명']}({best_store['유통사']}) 매장이 평당 {best_efficiency/10000:.0f}만원의 최고 효율을 달성했습니다. "
+        efficiency_analysis += f"전체 매장의 평균 효율성은 평당 {avg_efficiency/10000:.0f}만원이며, "
+        efficiency_analysis += f"표준편차는 {efficiency_std/10000:.0f}만원으로 매장 간 효율성 격차가 상당합니다. "
+        efficiency_analysis += f"이는 매장 운영 방식, 입지 조건, 고객 특성 등 다양한 요인이 매장 성과에 영향을 미치고 있음을 시사합니다."
+
+        insights.append({
+            'type': 'success',
+            'title': '🏆 매장 효율성 최적화 기회',
+            'content': efficiency_analysis,
+            'recommendation': f"최고 효율 매장의 운영 방식을 벤치마킹하여 다른 매장에 적용하세요. 특히 매장별 특성을 고려한 맞춤형 운영 전략 수립과 정기적인 성과 모니터링을 통해 전체 효율성을 개선할 수 있습니다."
+        })
+
+    # 4. 시장 트렌드 및 전략적 방향성
+    if market_growth > 5:
+        trend_analysis = f"전체 시장이 {market_growth:.1f}%의 강력한 성장률을 보이고 있어, 아울렛 시장이 활발한 성장 국면에 있습니다. "
+        trend_analysis += f"이는 경제 회복, 소비 심리 개선, 아울렛 쇼핑 문화 확산 등 다양한 긍정적 요인이 작용하고 있음을 의미합니다. "
+        trend_analysis += f"이러한 시장 환경에서는 적극적인 확장과 투자가 시장 점유율 확대의 기회가 될 수 있습니다."
+
+        insights.append({
+            'type': 'success',
+            'title': '📈 시장 확장 기회 포착',
+            'content': trend_analysis,
+            'recommendation': f"시장 성장에 맞춰 적극적인 매장 확장과 신규 입지를 검토하세요. 또한 시장 성장기에 브랜드 인지도 향상과 고객 기반 확충에 집중하는 것이 장기적 성장에 유리합니다."
+        })
+    elif market_growth < -5:
+        trend_analysis = f"전체 시장이 {abs(market_growth):.1f}% 감소하여 시장 환경이 어려운 상황입니다. "
+        trend_analysis += f"이는 경제적 불확실성, 소비 위축, 온라인 쇼핑 증가 등 다양한 요인이 영향을 미치고 있음을 의미합니다. "
+        trend_analysis += f"이러한 시장 상황에서는 효율성과 수익성 중심의 운영이 더욱 중요해집니다."
+
+        insights.append({
+            'type': 'warning',
+            'title': '📉 시장 위축 대응 전략 필요',
+            'content': trend_analysis,
+            'recommendation': f"비용 최적화와 고객 유지 전략에 집중하세요. 저성과 매장의 운영 방식을 재검토하고, 핵심 고객층에 대한 서비스 품질 향상과 충성도 강화에 투자하는 것이 중요합니다."
+        })
+
+    return insights
+
+
+def outlet_trend_insights(discovery_data, efficiency_data, current_col='25SS', previous_col='24SS'):
+    """아울렛 동향 분석(유통사별 디스커버리 매출, 매장 효율) 규칙 기반 인사이트 카드 목록을 생성합니다.
+
+    efficiency_data는 discovery_store_efficiency()의 결과입니다.
+    """
+    insights = []
+    if discovery_data.empty:
+        return insights
+
+    # 1. 유통사별 디스커버리 매출
+    by_distributor = discovery_data.groupby('유통사')[[current_col, previous_col]].sum()
+    by_distributor = by_distributor.sort_values(current_col, ascending=False)
+    total_current = by_distributor[current_col].sum()
+    if total_current > 0:
+        growth = pd.Series(
+            growth_rate(by_distributor[current_col], by_distributor[previous_col]), index=by_distributor.index
+        )
+        top_distributor = by_distributor.index[0]
+        top_share = by_distributor[current_col].iloc[0] / total_current * 100
+        weakest = growth.idxmin()
+
+        content = f"{current_col} 디스커버리 아울렛 매출은 {top_distributor}이(가) {format_amount(by_distributor[current_col].iloc[0])}으로 "
+        content += f"전체의 {top_share:.1f}%를 차지합니다 (전년 대비 {growth[top_distributor]:+.1f}%). "
+        if len(by_distributor) > 1:
+            content += f"{len(by_distributor)}개 유통사 중 {weakest}의 신장률이 {growth[weakest]:+.1f}%로 가장 낮습니다."
+
+        insights.append({
+            'type': 'success' if growth[top_distributor] > 0 else 'warning',
+            'title': '🏬 유통사별 디스커버리 매출',
+            'content': content,
+            'recommendation': f"매출 비중이 큰 {top_distributor}의 성과를 유지하면서, 신장률이 낮은 {weakest}의 매장별 원인을 점검하세요."
+            if weakest != top_distributor else f"{top_distributor} 매장별 매출 추이를 점검하여 신장률이 낮은 매장의 원인을 파악하세요."
+        })
+
+    # 2. 매장 효율 (평균 평당 매출 기준)
+    efficient = efficiency_data[efficiency_data['평균효율성'] > 0] if not efficiency_data.empty else efficiency_data
+    if not efficient.empty:
+        best_store = efficient.iloc[0]
+        avg_efficiency = efficient['평균효율성'].mean()
+        best_distributor_share = (efficient.head(3)['유통사'] == best_store['유통사']).sum()
+
+        content = f"{best_store['매장명']}({best_store['유통사']})의 평균 평당 매출이 {best_store['평균효율성']/10000:.0f}만원으로 가장 높고, "
+        content += f"면적 정보가 있는 {len(efficient)}개 매장의 평균은 {avg_efficiency/10000:.0f}만원입니다. "
+        content += f"효율 상위 3개 매장 중 {best_distributor_share}개가 {best_store['유통사']} 매장입니다."
+
+        insights.append({
+            'type': 'info',
+            'title': '⚡ 디스커버리 매장 효율',
+            'content': content,
+            'recommendation': "효율 상위 매장의 면적 대비 상품 구성과 운영 방식을 평균 이하 매장에 적용할 수 있는지 검토하세요."
+        })
+
+    return insights
+
+
+def peer_ms_insights(brand_df, current_col='25SS', previous_col='24SS', growth_col='SS_전년비'):
+    """동업계 MS 현황(브랜드 순위, 점유율, 경쟁 브랜드 성장) 규칙 기반 인사이트 카드 목록을 생성합니다.
+
+    brand_df는 season_group_summary(df, '브랜드')의 결과입니다.
+    """
+    insights = []
+    brands = brand_df[brand_df[current_col] > 0].sort_values(current_col, ascending=False, kind='stable')
+    if brands.empty:
+        return insights
+    total_current = brands[current_col].sum()
+    total_previous = brands[previous_col].sum()
+    market_growth = ((total_current - total_previous) / total_previous * 100) if total_previous > 0 else 0
+
+    # 1. 디스커버리 순위와 점유율
+    if FOCUS_BRAND in brands['브랜드'].values:
+        rank = int((brands['브랜드'] == FOCUS_BRAND).to_numpy().argmax()) + 1
+        row = brands.iloc[rank - 1]
+        share = row[current_col] / total_current * 100
+        outgrowing = row[growth_col] > market_growth
+
+        content = f"{current_col} 디스커버리는 {len(brands)}개 브랜드 중 {rank}위, 점유율 {share:.1f}%입니다. "
+        content += f"디스커버리 전년비 {row[growth_col]:+.1f}%는 동업계 전체 {market_growth:+.1f}%를 {'상회' if outgrowing else '하회'}합니다."
+
+        insights.append({
+            'type': 'success' if outgrowing else 'warning',
+            'title': '📊 디스커버리 동업계 포지션',
+            'content': content,
+            'recommendation': "점유율 확대 추세를 유지하도록 상위 매장 중심의 물량과 프로모션을 배분하세요." if outgrowing
+            else "동업계보다 성장이 느린 원인을 매장별 MS 변화로 확인하고 경쟁 브랜드 대비 차별화 요소를 강화하세요."
+        })
+
+    # 2. 경쟁 브랜드 동향
+    competitors = brands[brands['브랜드'] != FOCUS_BRAND]
+    if not competitors.empty:
+        leader = competitors.iloc[0]
+        fastest = competitors.loc[competitors[growth_col].idxmax()]
+
+        content = f"경쟁 브랜드 중 {leader['브랜드']}이(가) {format_amount(leader[current_col])}으로 매출 1위이며, "
+        content += f"{fastest['브랜드']}이(가) 전년비 {fastest[growth_col]:+.1f}%로 가장 빠르게 성장했습니다."
+
+        insights.append({
+            'type': 'info',
+            'title': '🏢 경쟁 브랜드 동향',
+            'content': content,
+            'recommendation': f"{fastest['브랜드']}의 성장 매장과 디스커버리 매장이 겹치는 유통사를 우선 점검하세요."
+        })
+
+    return insights
+
+
+def discovery_distributor_summary(df, current_col, previous_col):
+    """디스커버리 브랜드의 유통사별 매출/신장률/순위 요약을 계산합니다."""
+    discovery_df = df[df['브랜드'] == FOCUS_BRAND]
+    if discovery_df.empty:
+        return pd.DataFrame()
+
+    # 유통사별 집계
+    summary = discovery_df.groupby('유통사').agg(
+        매장수=('매장명', 'count'),
+        **{current_col: (current_col, 'sum'), previous_col: (previous_col, 'sum')}
+    ).reset_index()
+
+    # 평균 매출 계산
+    summary['현재_평균매출'] = summary[current_col] / summary['매장수']
+    summary['전년_평균매출'] = summary[previous_col] / summary['매장수']
+
+    # 신장률 계산 (0으로 나누기 방지)
+    summary['총매출_신장률'] = growth_rate(summary[current_col], summary[previous_col]).round(1)
+    summary['평균매출_신장률'] = growth_rate(summary['현재_평균매출'], summary['전년_평균매출']).round(1)
+
+    # 순위 계산 (총 매출 기준) 및 전년 순위
+    summary = summary.sort_values(current_col, ascending=False).reset_index(drop=True)
+    summary['순위'] = summary.index + 1
+    previous_order = (-summary[previous_col].to_numpy(dtype=float)).argsort(kind='stable')
+    previous_rank = np.empty(len(summary), dtype=int)
+    previous_rank[previous_order] = np.arange(1, len(summary) + 1)
+    summary['전년순위'] = previous_rank
+    summary['순위변동'] = summary['순위'] - summary['전년순위']
+    return summary
+
+
+def discovery_summary_table(summary, current_col, previous_col):
+    """유통사별 요약을 화면 표시용 문자열 테이블로 변환합니다."""
+    return pd.DataFrame({
+        '순위변동표시': [format_rank_shift(rank, change) for rank, change in zip(summary['순위'], summary['순위변동'])],
+        '유통사': summary['유통사'],
+        '매장수': summary['매장수'],
+        f'{current_col} 총 매출': summary[current_col].map(format_amount),
+        f'{previous_col} 총 매출': summary[previous_col].map(format_amount),
+        '총매출 신장률': summary['총매출_신장률'].map(format_growth_rate),
+        f'{current_col} 평균매출': summary['현재_평균매출'].map(format_amount),
+        f'{previous_col} 평균매출': summary['전년_평균매출'].map(format_amount),
+        '평균매출 신장률': summary['평균매출_신장률'].map(format_growth_rate)
+    })
+
+
+def season_group_summary(df, by, store_column='매장명'):
+    """그룹별 시즌 합계, 매출 발생 매장 수, 평균 매출, SS/FW 전년비를 한 번에 계산합니다.
+
+    매장 단위로 먼저 합산한 뒤 그룹별로 다시 집계하므로, 반환되는
+    '<시즌>_유효매장수'는 해당 시즌 매출이 0보다 큰 매장 수입니다.
+    그룹 순서는 데이터에 처음 등장한 순서를 따릅니다.
+
+    Returns:
+        그룹 컬럼과 매장수, <시즌>, <시즌>_유효매장수, <시즌>_평균,
+        SS_전년비, FW_전년비, SS_평균_전년비, FW_평균_전년비 컬럼을 가진 데이터프레임
+    """
+    columns = [by, store_column] + SALES_COLUMNS
+    if df.empty:
+        return pd.DataFrame(columns=[by, '매장수'] + SALES_COLUMNS)
+
+    # 매장 단위 합계 (같은 매장의 중복 행 통합)
+    store_totals = df[columns].groupby([by, store_column], sort=False)[SALES_COLUMNS].sum()
+    valid = store_totals.gt(0)
+    valid.columns = [f'{season}_유효매장수' for season in SALES_COLUMNS]
+
+    # 그룹 단위 집계
+    grouped = pd.concat([store_totals, valid], axis=1).groupby(level=0, sort=False)
+    summary = grouped.sum()
+    summary.insert(0, '매장수', grouped.size())
+
+    sales = summary[SALES_COLUMNS].to_numpy(dtype=float)
+    valid_counts = summary[valid.columns].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        averages = np.where(valid_counts > 0, sales / valid_counts, 0.0)
+    for i, season in enumerate(SALES_COLUMNS):
+        summary[f'{season}_평균'] = averages[:, i]
+
+    summary['SS_전년비'] = growth_rate(summary['25SS'], summary['24SS'])
+    summary['FW_전년비'] = growth_rate(summary['24FW'], summary['23FW'])
+    summary['SS_평균_전년비'] = growth_rate(summary['25SS_평균'], summary['24SS_평균'])
+    summary['FW_평균_전년비'] = growth_rate(summary['24FW_평균'], summary['23FW_평균'])
+    return summary.rename_axis(by).reset_index()
+
+
+def brand_comparison(df, current_col, previous_col, analysis_type="총 매출 기준"):
+    """브랜드별 현재/전년 매출(총 매출 또는 유효 매장 평균)을 계산합니다."""
+    if analysis_type == "총 매출 기준":
+        brand_totals = df.groupby('브랜드')[[current_col, previous_col]].sum()
+        current = brand_totals[current_col].sort_values(ascending=False)
+        previous = brand_totals[previous_col]
+    else:
+        # 매장 매출이 0인 경우 제외
+        current = df[df[current_col] > 0].groupby('브랜드')[current_col].mean().sort_values(ascending=False)
+        previous = df[df[previous_col] > 0].groupby('브랜드')[previous_col].mean()
+    return current, previous
+
+
+def calculate_rank_change(current_series, previous_series):
+    """브랜드별 순위 변화(전년순위 - 현재순위)를 계산합니다. 신규 브랜드는 0"""
+    previous_rank = pd.Series(
+        np.arange(1, len(previous_series) + 1),
+        index=previous_series.sort_values(ascending=False).index
+    )
+    current_rank = pd.Series(np.arange(1, len(current_series) + 1), index=current_series.index)
+    change = (previous_rank.reindex(current_series.index) - current_rank).fillna(0).astype(int)
+    return change.to_dict()
+
+
+def ms_comparison_data(current, previous):
+    """브랜드별 MS 비교 수치(현재/전년 매출, 증감률, 순위, 순위변동)를 반환합니다."""
+    changes = calculate_rank_change(current, previous)
+    previous_values = previous.reindex(current.index, fill_value=0)
+    return pd.DataFrame({
+        '순위': np.arange(1, len(current) + 1),
+        '순위변동': [changes.get(brand, 0) for brand in current.index],
+        '브랜드': current.index,
+        '현재': current.to_numpy(),
+        '전년': previous_values.to_numpy(),
+        '증감률': growth_rate(current.to_numpy(), previous_values.to_numpy()),
+    })
+
+
+def ms_comparison_table(current, previous, current_col, previous_col, analysis_type="총 매출 기준"):
+    """브랜드별 MS 비교 표시용 테이블을 생성합니다."""
+    changes = calculate_rank_change(current, previous)
+    previous_values = previous.reindex(current.index, fill_value=0)
+    growth = growth_rate(current.to_numpy(), previous_values.to_numpy())
+
+    suffix = '총매출' if analysis_type == "총 매출 기준" else '평균매출'
+    return pd.DataFrame({
+        '순위변동': [format_rank_change(i + 1, changes.get(brand, 0)) for i, brand in enumerate(current.index)],
+        '브랜드': current.index,
+        f'{current_col} {suffix}': [f"{value/100_000_000:.2f}억원" for value in current.to_numpy()],
+        f'{previous_col} {suffix}': [f"{value/100_000_000:.2f}억원" for value in previous_values.to_numpy()],
+        '증감률': [f"{value:+.1f}%" for value in growth]
+    })
+
+
+def store_efficiency(df, current_col='25SS', previous_col='24SS'):
+    """매장 면적(평) 대비 매출 효율과 순위 변동을 계산합니다."""
+    efficiency_data = df[df['매장 면적'] > 0].copy()
+    if efficiency_data.empty:
+        return efficiency_data
+
+    # 매장 면적을 평 단위로 변환 (CSV의 매장 면적이 평 단위)
+    efficiency_data['매장면적_평'] = efficiency_data['매장 면적']
+    efficiency_data['매장면적_제곱미터'] = efficiency_data['매장 면적'] * PYEONG_TO_SQM
+
+    # 현재 시즌과 이전 시즌의 평당 매출 계산 (평 기준)
+    current_efficiency = f'{current_col}_평당매출'
+    previous_efficiency = f'{previous_col}_평당매출'
+    efficiency_data[current_efficiency] = efficiency_data[current_col] / efficiency_data['매장면적_평']
+    efficiency_data[previous_efficiency] = efficiency_data[previous_col] / efficiency_data['매장면적_평']
+
+    # 평당 매출 기준으로 정렬 후 전년 평당 매출 기준 순위와 비교
+    efficiency_data = efficiency_data.sort_values(current_efficiency, ascending=False).reset_index(drop=True)
+    efficiency_data['순위변동'] = rank_changes(efficiency_data[previous_efficiency])
+    return efficiency_data
+
+
+def store_efficiency_table(efficiency_data, current_col='25SS', previous_col='24SS'):
+    """매장 효율 데이터를 화면 표시용 문자열 테이블로 변환합니다."""
+    current_efficiency = efficiency_data[f'{current_col}_평당매출'].to_numpy(dtype=float)
+    previous_efficiency = efficiency_data[f'{previous_col}_평당매출'].to_numpy(dtype=float)
+    current_sales = efficiency_data[current_col].to_numpy(dtype=float)
+    previous_sales = efficiency_data[previous_col].to_numpy(dtype=float)
+    area_pyeong = efficiency_data['매장면적_평'].to_numpy(dtype=float)
+    area_sqm = efficiency_data['매장면적_제곱미터'].to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        '순위변동': [format_rank_change(i + 1, change) for i, change in enumerate(efficiency_data['순위변동'])],
+        '매장명': efficiency_data['매장명'].to_numpy(),
+        '유통사': efficiency_data['유통사'].to_numpy(),
+        '매장면적': [f"{p:.1f}평({m:.1f}㎡)" for p, m in zip(area_pyeong, area_sqm)],
+        f'{current_col}_평당매출': [f"{v/10000:.0f}만원/평" for v in current_efficiency],
+        f'{previous_col}_평당매출': [f"{v/10000:.0f}만원/평" for v in previous_efficiency],
+        '평당매출_신장률': [f"{v:+.1f}%" for v in growth_rate(current_efficiency, previous_efficiency)],
+        f'{current_col}_총매출': [f"{v/100_000_000:.2f}억원" for v in current_sales],
+        f'{previous_col}_총매출': [f"{v/100_000_000:.2f}억원" for v in previous_sales],
+        '총매출_신장률': [f"{v:+.1f}%" for v in growth_rate(current_sales, previous_sales)]
+    })
+
+
+def discovery_store_efficiency(df):
+    """디스커버리 브랜드의 매장별 시즌 매출과 평당 매출(효율성)을 계산합니다."""
+    discovery_df = df[df['브랜드'] == FOCUS_BRAND]
+    if discovery_df.empty:
+        return pd.DataFrame()
+
+    # 매장 정보 (매장별 첫 행 기준)
+    store_info = discovery_df.drop_duplicates('매장명').set_index('매장명')
+    sales = discovery_df.groupby('매장명', sort=False)[SALES_COLUMNS].sum()
+    area_pyeong = store_info['매장 면적'].reindex(sales.index)
+
+    area = area_pyeong.to_numpy(dtype=float)
+    has_area = np.nan_to_num(area) > 0
+    efficiency = np.zeros(sales.shape)
+    efficiency[has_area] = sales.to_numpy(dtype=float)[has_area] / area[has_area, None]
+
+    # 평균 효율성 (효율성이 0보다 큰 시즌만)
+    positive = efficiency > 0
+    counts = positive.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_efficiency = np.where(counts > 0, np.where(positive, efficiency, 0).sum(axis=1) / counts, 0.0)
+
+    efficiency_df = pd.DataFrame({
+        '매장명': sales.index,
+        '유통사': store_info['유통사'].reindex(sales.index).to_numpy(),
+        '매장면적': np.where(has_area, area * PYEONG_TO_SQM, 0.0),  # 평방미터
+        '매장면적_평': area,  # 평 (원본 데이터)
+        '평균효율성': avg_efficiency,
+    })
+    for i, season in enumerate(SALES_COLUMNS):
+        efficiency_df[f'{season}_매출액'] = sales[season].to_numpy()
+    for i, season in enumerate(SALES_COLUMNS):
+        efficiency_df[f'{season}_효율성'] = efficiency[:, i]
+
+    # 평균 효율성 기준으로 정렬
+    return efficiency_df.sort_values('평균효율성', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def outlet_store_efficiency(df, current_col='25SS', previous_col='24SS'):
+    """매장별 평당 매출(백만원/평), 총 매출과 신장률, 순위 변동을 계산합니다.
+
+    면적 정보가 있는 매장만 포함하며 면적은 매장의 첫 행 기준입니다.
+    현재 시즌 평당 매출 내림차순으로 정렬됩니다.
+    """
+    columns = ['매장명', '면적(평)', f'{current_col}_평당매출', f'{previous_col}_평당매출', '평당매출_신장율',
+               f'{current_col}_총매출', f'{previous_col}_총매출', '총매출_신장율', '순위변동']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    grouped = df.groupby('매장명', sort=False)
+    area = grouped['매장 면적'].first()
+    sales = grouped[[current_col, previous_col]].sum()[area > 0]
+    area = area[area > 0].to_numpy(dtype=float)
+
+    current_sales = sales[current_col].to_numpy(dtype=float)
+    previous_sales = sales[previous_col].to_numpy(dtype=float)
+    current_efficiency = current_sales / area / 1_000_000
+    previous_efficiency = previous_sales / area / 1_000_000
+    result = pd.DataFrame({
+        '매장명': sales.index,
+        '면적(평)': area,
+        f'{current_col}_평당매출': current_efficiency,
+        f'{previous_col}_평당매출': previous_efficiency,
+        '평당매출_신장율': growth_rate(current_efficiency, previous_efficiency),
+        f'{current_col}_총매출': current_sales,
+        f'{previous_col}_총매출': previous_sales,
+        '총매출_신장율': growth_rate(current_sales, previous_sales),
+    })
+    result = result.sort_values(f'{current_col}_평당매출', ascending=False, kind='stable').reset_index(drop=True)
+    result['순위변동'] = rank_changes(result[f'{previous_col}_평당매출'])
+    return result
+
+
+class StoreEfficiencyReport:
+    """시즌(SS/FW) × 정렬 기준(매출순/평당매출순) 매장 효율 테이블을 미리 계산해 둔 리포트
+
+    view(season_type, sales_criteria)는 계산 없이 저장된 결과를 반환합니다.
+    """
+
+    SEASONS = {'SS': ('25SS', '24SS'), 'FW': ('24FW', '23FW')}
+    CRITERIA = {'매출순': '매출액', '평당매출순': '효율성'}
+
+    def __init__(self, efficiency_df):
+        self.efficiency_df = efficiency_df
+        self._views = {}
+        if efficiency_df.empty:
+            return
+        store_label = (efficiency_df['매장명'] + ' (' + efficiency_df['매장면적_평'].map('{:.1f}'.format) + '평)').to_numpy()
+        for season_type, (current_season, prev_season) in self.SEASONS.items():
+            for sales_criteria, metric in self.CRITERIA.items():
+                self._views[(season_type, sales_criteria)] = self._build_view(
+                    season_type, current_season, prev_season, metric, store_label
+                )
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(discovery_store_efficiency(df))
+
+    @property
+    def empty(self):
+        return self.efficiency_df.empty
+
+    def view(self, season_type, sales_criteria):
+        """시즌/정렬 기준에 해당하는 테이블 묶음을 반환합니다."""
+        return self._views[(season_type, sales_criteria)]
+
+    def _build_view(self, season_type, current_season, prev_season, metric, store_label):
+        df = self.efficiency_df
+        current_sales = df[f'{current_season}_매출액'].to_numpy(dtype=float)
+        previous_sales = df[f'{prev_season}_매출액'].to_numpy(dtype=float)
+        current_eff = df[f'{current_season}_효율성'].to_numpy(dtype=float)
+        previous_eff = df[f'{prev_season}_효율성'].to_numpy(dtype=float)
+
+        # 정렬 및 전년 순위 (정렬 기준 지표 사용)
+        sort_current = current_sales if metric == '매출액' else current_eff
+        sort_previous = previous_sales if metric == '매출액' else previous_eff
+        order = (-sort_current).argsort(kind='stable')
+        previous_rank = np.empty(len(df), dtype=int)
+        previous_rank[(-sort_previous).argsort(kind='stable')] = np.arange(1, len(df) + 1)
+        rank = np.arange(1, len(df) + 1)
+        rank_change = previous_rank[order] - rank
+
+        labels = store_label[order]
+        distributors = df['유통사'].to_numpy()[order]
+        current_sales, previous_sales = current_sales[order], previous_sales[order]
+        current_eff, previous_eff = current_eff[order], previous_eff[order]
+
+        current_sales_text = [format_to_hundred_million(v) for v in current_sales]
+        current_eff_text = [format_efficiency_to_million(v) for v in current_eff]
+
+        def top_table(positions):
+            return pd.DataFrame({
+                '순위': [f"{p + 1}위" for p in positions],
+                '매장명': labels[positions],
+                '유통사': distributors[positions],
+                f'{current_season} 매출': [current_sales_text[p] for p in positions],
+                '평당매출': [current_eff_text[p] for p in positions]
+            })
+
+        best_positions = np.arange(min(5, len(df)))
+        worst_positions = np.arange(max(len(df) - 5, 0), len(df))
+
+        summary = pd.DataFrame({
+            '순위': [format_rank_change_html(r, c) for r, c in zip(rank, rank_change)],
+            '매장명': labels,
+            '유통사': distributors,
+            f'{current_season} 매출': current_sales_text,
+            f'{prev_season} 매출': [format_to_hundred_million(v) for v in previous_sales],
+            '매출 전년비': [format_growth_with_color(v) for v in growth_rate(current_sales, previous_sales)],
+            f'{current_season} 평당매출': current_eff_text,
+            f'{prev_season} 평당매출': [format_efficiency_to_million(v) for v in previous_eff],
+            '평당매출 전년비': [format_growth_with_color(v) for v in growth_rate(current_eff, previous_eff)]
+        })
+
+        return {
+            'current_season': current_season,
+            'prev_season': prev_season,
+            'season_label': season_type,
+            'best': top_table(best_positions),
+            'worst': top_table(worst_positions),
+            'summary': summary,
+        }
+
+
+class FrameSource:
+    """메모리의 데이터프레임을 sqlite_store.SQLiteStore와 같은 조회 인터페이스로 감쌉니다."""
+
+    def __init__(self, df, quality=None, changes=None):
+        self.df = df
+        self.quality = quality
+        self.changes = changes
+        self.columns = df.columns.tolist()
+
+    def filter_options(self, column, distributor='전체'):
+        return filter_options(self.df, column, distributor)
+
+    def select(self, distributor='전체', store='전체', brand='전체'):
+        return FrameSelection(filter_dataset(self.df, distributor, store, brand))
+
+
+class FrameSelection:
+    """필터된 데이터프레임에 대한 집계 (sqlite_store.SQLiteSelection과 같은 메서드)"""
+
+    def __init__(self, df):
+        self.df = df
+
+    def __len__(self):
+        return len(self.df)
+
+    def frame(self):
+        return self.df
+
+    def kpi_summary(self, sales_col='25SS'):
+        return kpi_summary(self.df, sales_col)
+
+    def season_totals(self):
+        return season_totals(self.df)
+
+    def top_sales(self, by, column='25SS', top_n=10):
+        return top_sales(self.df, by, column, top_n)
+
+    def area_sales(self, column='25SS'):
+        return area_sales(self.df, column)
+
+    def brand_season_matrix(self, top_n=15, sort_column='25SS'):
+        return brand_season_matrix(self.df, top_n, sort_column)
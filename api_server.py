@@ -0,0 +1,289 @@
+"""대시보드 집계 읽기 전용 HTTP API
+
+streamlit_app.py의 MS 비교, 디스커버리 유통사별 요약, 매장 효율 테이블과
+같은 집계를 Streamlit 세션 없이 JSON 또는 Arrow IPC 스트림으로 제공합니다.
+집계는 analytics 함수를 그대로 사용하며 (데이터셋 버전, 요청) 단위로
+직렬화된 결과를 캐시합니다.
+
+데이터셋 버전은 CSV 파일의 크기와 수정 시각으로 정해지며, 파일이 바뀌면
+다음 요청에서 다시 로드합니다. 응답의 ETag는 데이터셋 버전과 요청
+파라미터로 만들어지므로 If-None-Match가 일치하면 304를 반환합니다.
+연결마다 스레드를 두고(HTTP/1.1 keep-alive), 캐시에 없는 집계 계산만 고정
+크기 스레드 풀(DX_API_WORKERS, 기본 8)에서 실행하므로 유휴 keep-alive 연결이
+계산 워커를 차지하지 않습니다.
+
+엔드포인트 (모두 GET):
+    /api                       사용 가능한 엔드포인트와 데이터셋 버전
+    /api/health                상태 확인
+    /api/ms-comparison         브랜드별 MS 비교 (basis=total|average)
+    /api/discovery-summary     디스커버리 유통사별 요약
+    /api/store-efficiency      매장 면적 대비 매출 효율
+
+공통 파라미터: season=SS|FW, distributor=유통사, store=매장명, format=json|arrow
+(Accept: application/vnd.apache.arrow.stream 헤더로도 Arrow 선택)
+
+사용 예:
+    python api_server.py --port 8502
+    curl 'http://127.0.0.1:8502/api/ms-comparison?season=FW&distributor=롯데'
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow 응답은 pyarrow가 있을 때만
+    pa = None
+
+from analytics import (
+    DATA_PATH, brand_comparison, discovery_distributor_summary, filter_dataset, load_dataset,
+    ms_comparison_data, season_columns, store_efficiency
+)
+from metrics import counter, enable_from_env
+
+API_WORKERS = int(os.environ.get('DX_API_WORKERS', 8))
+RESPONSE_CACHE_ENTRIES = 256
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+JSON_MIME = 'application/json; charset=utf-8'
+ANALYSIS_TYPES = {'total': "총 매출 기준", 'average': "평균 매출 기준"}
+STORE_EFFICIENCY_COLUMNS = ['매장명', '유통사', '브랜드', '매장면적_평', '매장면적_제곱미터']
+
+API_REQUESTS = counter('dx_api_requests_total', "집계 API 요청 수 (엔드포인트/상태별)")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def ms_comparison(df, season, basis):
+    current_col, previous_col = season_columns(season)
+    current, previous = brand_comparison(df, current_col, previous_col, ANALYSIS_TYPES[basis])
+    return ms_comparison_data(current, previous)
+
+
+def discovery_summary(df, season, basis):
+    current_col, previous_col = season_columns(season)
+    return discovery_distributor_summary(df, current_col, previous_col)
+
+
+def efficiency(df, season, basis):
+    current_col, previous_col = season_columns(season)
+    data = store_efficiency(df, current_col, previous_col)
+    if data.empty:
+        return data
+    return data[STORE_EFFICIENCY_COLUMNS + [
+        current_col, previous_col, f'{current_col}_평당매출', f'{previous_col}_평당매출', '순위변동'
+    ]]
+
+
+ENDPOINTS = {
+    'ms-comparison': ms_comparison,
+    'discovery-summary': discovery_summary,
+    'store-efficiency': efficiency,
+}
+
+
+class DatasetStore:
+    """CSV 데이터셋과 버전, 직렬화된 응답 캐시를 관리합니다."""
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self.version = None
+        self.df = None
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _file_version(self):
+        stat = os.stat(self.path)
+        return hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+
+    def current(self):
+        """(버전, 데이터프레임)을 반환합니다. 파일이 바뀌었으면 다시 로드합니다."""
+        version = self._file_version()
+        with self._lock:
+            if version != self.version:
+                self.df = load_dataset(self.path)
+                self.version = version
+                self._responses.clear()
+            return self.version, self.df
+
+    def response(self, key, build):
+        """캐시된 응답 본문을 반환하고, 없으면 build()로 만들어 저장합니다."""
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+                return body
+        body = build()
+        with self._lock:
+            self._responses[key] = body
+            while len(self._responses) > RESPONSE_CACHE_ENTRIES:
+                self._responses.popitem(last=False)
+        return body
+
+
+def _parse_params(query):
+    values = {name: items[-1] for name, items in parse_qs(query).items()}
+    params = {
+        'season': values.get('season', 'SS').upper(),
+        'distributor': values.get('distributor', '전체'),
+        'store': values.get('store', '전체'),
+        'basis': values.get('basis', 'total'),
+    }
+    if params['season'] not in ('SS', 'FW'):
+        raise ApiError(400, "season은 SS 또는 FW여야 합니다.")
+    if params['basis'] not in ANALYSIS_TYPES:
+        raise ApiError(400, "basis는 total 또는 average여야 합니다.")
+    return params, values.get('format')
+
+
+def to_json(version, endpoint, params, frame):
+    rows = frame.to_json(orient='records', force_ascii=False) if not frame.empty else '[]'
+    header = json.dumps({'version': version, 'endpoint': endpoint, 'params': params}, ensure_ascii=False)
+    return f'{header[:-1]}, "rows": {rows}}}'.encode('utf-8')
+
+
+def to_arrow(version, endpoint, params, frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'dx_version': version.encode(),
+        b'dx_endpoint': endpoint.encode(),
+        b'dx_params': json.dumps(params, ensure_ascii=False).encode('utf-8'),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DXOutletAPI/1.0'
+    timeout = 30
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.rstrip('/').removeprefix('/api').lstrip('/')
+        try:
+            if url.path.rstrip('/') == '/api':
+                version, _ = self.server.store.current()
+                self._send(200, json.dumps({'version': version, 'endpoints': sorted(ENDPOINTS)}).encode(), JSON_MIME)
+            elif endpoint == 'health':
+                self._send(200, b'{"status": "ok"}', JSON_MIME)
+            elif endpoint in ENDPOINTS and url.path.startswith('/api/'):
+                self._serve_aggregate(endpoint, url.query)
+            else:
+                raise ApiError(404, "알 수 없는 엔드포인트입니다.")
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+        except Exception as e:
+            self._send_error(500, f"집계 중 오류가 발생했습니다: {e}")
+        API_REQUESTS.inc(endpoint=endpoint or 'index', status=str(self._status))
+
+    def _serve_aggregate(self, endpoint, query):
+        params, fmt = _parse_params(query)
+        if fmt is None:
+            fmt = 'arrow' if ARROW_MIME in self.headers.get('Accept', '') else 'json'
+        if fmt not in ('json', 'arrow'):
+            raise ApiError(400, "format은 json 또는 arrow여야 합니다.")
+        if fmt == 'arrow' and pa is None:
+            raise ApiError(406, "Arrow 응답에는 pyarrow가 필요합니다.")
+
+        version, df = self.server.store.current()
+        key = (version, endpoint, tuple(sorted(params.items())), fmt)
+        etag = '"' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20] + '"'
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self._send(304, b'', None, etag)
+            return
+
+        def build():
+            filtered = filter_dataset(df, params['distributor'], params['store'])
+            frame = ENDPOINTS[endpoint](filtered, params['season'], params['basis'])
+            serialize = to_arrow if fmt == 'arrow' else to_json
+            return serialize(version, endpoint, params, frame)
+
+        body = self.server.store.response(key, lambda: self.server.compute(build))
+        self._send(200, body, ARROW_MIME if fmt == 'arrow' else JSON_MIME, etag)
+
+    def _send(self, status, body, content_type, etag=None):
+        self._status = status
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, JSON_MIME)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ApiHTTPServer(ThreadingHTTPServer):
+    """연결마다 스레드를 두고 집계 계산은 고정 크기 스레드 풀에서 실행하는 HTTP 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, store, workers=API_WORKERS):
+        super().__init__(address, handler)
+        self.store = store
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+
+    def compute(self, build):
+        """집계 계산을 스레드 풀에서 실행하고 결과를 기다립니다."""
+        return self._pool.submit(build).result()
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):  # 클라이언트가 keep-alive 연결을 끊은 경우
+            return
+        super().handle_error(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def create_server(host='127.0.0.1', port=8502, data_path=DATA_PATH, workers=API_WORKERS):
+    store = DatasetStore(data_path)
+    store.current()  # 첫 요청 전에 미리 로드
+    return ApiHTTPServer((host, port), ApiHandler, store, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 집계 읽기 전용 API 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--workers', type=int, default=API_WORKERS, help="집계 계산 스레드 수")
+    parser.add_argument('--data', default=DATA_PATH, help="데이터 CSV 경로")
+    args = parser.parse_args(argv)
+
+    enable_from_env()
+    server = create_server(args.host, args.port, args.data, args.workers)
+    print(f"API 서버 시작: http://{args.host}:{args.port}/api (데이터 버전 {server.store.version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""유통사 × 시즌 전체 조합 주간 리포트 일괄 생성
+
+대시보드(streamlit_app.py)와 같은 분석 로직을 사용하여 브라우저나
+Streamlit 서버 없이 모든 유통사/시즌 조합의 리포트를 HTML과 XLSX로
+생성합니다. 조합별 렌더링은 프로세스 풀에서 병렬로 실행됩니다.
+
+사용 예:
+    python batch_report.py --output reports/2025-W42
+    python batch_report.py --seasons SS --distributors 롯데 현대 --format html
+"""
+import argparse
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from analytics import (
+    DATA_PATH, brand_comparison, discovery_distributor_summary, discovery_summary_table,
+    filter_dataset, generate_ai_insights, load_dataset, ms_comparison_table, season_columns,
+    store_efficiency, store_efficiency_table
+)
+
+ANALYSIS_TYPES = ["총 매출 기준", "평균 매출 기준"]
+INSIGHT_COLORS = {'success': '#e8f5e9', 'warning': '#fff8e1', 'info': '#e3f2fd'}
+
+# 워커 프로세스별 데이터셋 (초기화 시 1회 로드)
+_worker_df = None
+
+
+def _init_worker(data_path):
+    global _worker_df
+    _worker_df = load_dataset(data_path)
+
+
+def build_report(df, distributor, season):
+    """한 유통사/시즌 조합의 리포트 구성 요소를 계산합니다."""
+    filtered_df = filter_dataset(df, distributor)
+    current_col, previous_col = season_columns(season)
+
+    summary = discovery_distributor_summary(filtered_df, current_col, previous_col)
+    ms_tables = {}
+    ms_series = {}
+    for analysis_type in ANALYSIS_TYPES:
+        current, previous = brand_comparison(filtered_df, current_col, previous_col, analysis_type)
+        ms_series[analysis_type] = (current, previous)
+        ms_tables[analysis_type] = ms_comparison_table(current, previous, current_col, previous_col, analysis_type)
+
+    efficiency_data = store_efficiency(filtered_df, '25SS', '24SS')
+    efficiency_table = store_efficiency_table(efficiency_data, '25SS', '24SS') if not efficiency_data.empty else pd.DataFrame()
+
+    return {
+        'distributor': distributor,
+        'season': season,
+        'current_col': current_col,
+        'previous_col': previous_col,
+        'insights': generate_ai_insights(filtered_df, season, current_col, previous_col),
+        'discovery_table': discovery_summary_table(summary, current_col, previous_col) if not summary.empty else pd.DataFrame(),
+        'ms_tables': ms_tables,
+        'ms_series': ms_series,
+        'efficiency_table': efficiency_table,
+    }
+
+
+def _table_html(df):
+    if df.empty:
+        return "<p>데이터가 없습니다.</p>"
+    return df.to_html(index=False, classes='report-table', border=0)
+
+
+def render_html(report, plotlyjs=True):
+    """리포트를 단독 실행 가능한 HTML 문서로 변환합니다.
+
+    plotlyjs='directory'이면 plotly.js를 포함하지 않고 같은 폴더의 plotly.min.js를 참조합니다.
+    """
+    from charts import build_brand_comparison_bar, build_brand_share_pie
+
+    title = f"DX OUTLET 주간 리포트 - {report['distributor']} / {report['season']} 시즌"
+    parts = [
+        "<!DOCTYPE html><html lang='ko'><head><meta charset='utf-8'>",
+        f"<title>{html.escape(title)}</title>",
+        "<style>body{font-family:sans-serif;margin:2rem;} .report-table{border-collapse:collapse;margin:1rem 0;}"
+        " .report-table th,.report-table td{border:1px solid #ddd;padding:4px 8px;text-align:right;}"
+        " .insight{padding:1rem;border-radius:8px;margin:0.5rem 0;}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p>현재 시즌: {report['current_col']} / 비교 시즌: {report['previous_col']}</p>",
+        "<h2>🤖 AI 인사이트</h2>",
+    ]
+    for insight in report['insights']:
+        parts.append(
+            f"<div class='insight' style='background:{INSIGHT_COLORS.get(insight['type'], '#f5f5f5')}'>"
+            f"<b>{html.escape(insight['title'])}</b><p>{html.escape(insight['content'])}</p>"
+            f"<p>💡 <b>추천사항</b>: {html.escape(insight['recommendation'])}</p></div>"
+        )
+    if not report['insights']:
+        parts.append("<p>현재 데이터로 생성할 수 있는 AI 인사이트가 없습니다.</p>")
+
+    parts.append("<h2>🏪 아울렛 매출현황 - 디스커버리</h2>")
+    parts.append(_table_html(report['discovery_table']))
+
+    include_js = plotlyjs
+    for analysis_type in ANALYSIS_TYPES:
+        current, previous = report['ms_series'][analysis_type]
+        chart_current = current[current > 0]
+        chart_previous = previous.reindex(chart_current.index, fill_value=0)
+        parts.append(f"<h2>📈 동업계 MS 현황 - {analysis_type}</h2>")
+        if not chart_current.empty:
+            for fig in (
+                build_brand_comparison_bar(chart_current, chart_previous, report['current_col'], report['previous_col'], analysis_type),
+                build_brand_share_pie(chart_current, report['current_col'], analysis_type),
+            ):
+                parts.append(fig.to_html(full_html=False, include_plotlyjs=include_js))
+                include_js = False  # plotly.js는 문서당 한 번만 포함
+        parts.append(_table_html(report['ms_tables'][analysis_type]))
+
+    parts.append("<h2>⚡ 아울렛 매장 효율</h2>")
+    parts.append(_table_html(report['efficiency_table']))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_xlsx(report, path):
+    """리포트 테이블을 시트별로 XLSX 파일에 저장합니다."""
+    insights_df = pd.DataFrame(report['insights'], columns=['type', 'title', 'content', 'recommendation'])
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        insights_df.to_excel(writer, sheet_name='AI 인사이트', index=False)
+        report['discovery_table'].to_excel(writer, sheet_name='디스커버리 유통사별', index=False)
+        for analysis_type in ANALYSIS_TYPES:
+            sheet = 'MS 총매출' if analysis_type == "총 매출 기준" else 'MS 평균매출'
+            report['ms_tables'][analysis_type].to_excel(writer, sheet_name=sheet, index=False)
+        report['efficiency_table'].to_excel(writer, sheet_name='매장 효율', index=False)
+
+
+def _report_basename(distributor, season):
+    return f"report_{distributor}_{season}"
+
+
+def render_combination(distributor, season, output_dir, formats, plotlyjs):
+    """워커에서 한 조합의 리포트를 생성하고 저장된 파일 경로를 반환합니다."""
+    report = build_report(_worker_df, distributor, season)
+    basename = _report_basename(distributor, season)
+    written = []
+    if 'html' in formats:
+        path = os.path.join(output_dir, f"{basename}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_html(report, plotlyjs))
+        written.append(path)
+    if 'xlsx' in formats:
+        path = os.path.join(output_dir, f"{basename}.xlsx")
+        write_xlsx(report, path)
+        written.append(path)
+    return written
+
+
+def write_index(output_dir, combinations, formats):
+    """생성된 리포트 목록 페이지를 작성합니다."""
+    rows = []
+    for distributor, season in combinations:
+        basename = _report_basename(distributor, season)
+        links = " ".join(f"<a href='{html.escape(basename)}.{fmt}'>{fmt.upper()}</a>" for fmt in formats)
+        rows.append(f"<tr><td>{html.escape(distributor)}</td><td>{season}</td><td>{links}</td></tr>")
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html><html lang='ko'><head><meta charset='utf-8'><title>DX OUTLET 주간 리포트</title></head><body>"
+            "<h1>DX OUTLET 주간 리포트</h1><table border='1' cellpadding='4'>"
+            "<tr><th>유통사</th><th>시즌</th><th>파일</th></tr>" + "".join(rows) + "</table></body></html>"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DX OUTLET 유통사 × 시즌 리포트 일괄 생성")
+    parser.add_argument('--data', default=DATA_PATH, help="MS DB CSV 경로")
+    parser.add_argument('--output', default='reports', help="리포트 저장 폴더")
+    parser.add_argument('--seasons', nargs='+', default=['SS', 'FW'], choices=['SS', 'FW'])
+    parser.add_argument('--distributors', nargs='+', help="대상 유통사 (기본: 전체 + 모든 유통사)")
+    parser.add_argument('--format', nargs='+', default=['html', 'xlsx'], choices=['html', 'xlsx'], dest='formats')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="병렬 프로세스 수")
+    parser.add_argument('--shared-js', action='store_true', help="plotly.js를 폴더에 1회 저장하고 각 HTML은 참조만 함 (기본: 각 HTML에 포함)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    os.makedirs(args.output, exist_ok=True)
+
+    distributors = args.distributors
+    if not distributors:
+        distributors = ['전체'] + sorted(load_dataset(args.data)['유통사'].unique().tolist())
+    combinations = [(distributor, season) for distributor in distributors for season in args.seasons]
+
+    plotlyjs = 'directory' if args.shared_js else True
+    if 'html' in args.formats and plotlyjs == 'directory':
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(args.output, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())  # 각 HTML은 같은 폴더의 plotly.min.js를 참조
+
+    written = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.data,)) as executor:
+        futures = {
+            executor.submit(render_combination, distributor, season, args.output, args.formats, plotlyjs): (distributor, season)
+            for distributor, season in combinations
+        }
+        for future in as_completed(futures):
+            distributor, season = futures[future]
+            paths = future.result()
+            written.extend(paths)
+            print(f"✅ {distributor} / {season}: {', '.join(os.path.basename(p) for p in paths)}")
+
+    write_index(args.output, combinations, args.formats)
+    print(f"총 {len(combinations)}개 조합, {len(written)}개 파일 생성 ({time.perf_counter() - start:.1f}초) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
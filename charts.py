@@ -0,0 +1,153 @@
+"""대시보드/배치 리포트 공용 Plotly 차트 생성 함수
+
+plotly는 임포트 비용이 크므로 각 함수 안에서 불러옵니다. 페이지가 시작될 때가
+아니라 첫 차트를 만들 때 한 번만 로드되어, 사이드바와 지표가 먼저 표시됩니다.
+"""
+import numpy as np
+
+# 브랜드별 현재/전년 시즌 비교 바 차트 생성
+def build_brand_comparison_bar(chart_data_current, chart_data_previous, current_col, previous_col, analysis_type):
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    
+    # 현재 시즌 바 (디스커버리는 주황, 나머지는 진한 파랑)
+    is_discovery = chart_data_current.index == '디스커버리'
+    current_colors = np.where(is_discovery, '#FF8C00', '#4682B4').tolist()
+    
+    fig.add_trace(go.Bar(
+        name=current_col,
+        x=chart_data_current.index,
+        y=chart_data_current.values,
+        marker_color=current_colors,
+        opacity=0.9
+    ))
+    
+    # 전년 시즌 바 (디스커버리는 노랑, 나머지는 연한 파랑)
+    previous_colors = np.where(is_discovery, '#FFD700', '#87CEEB').tolist()
+    
+    fig.add_trace(go.Bar(
+        name=previous_col,
+        x=chart_data_current.index,
+        y=chart_data_previous.values,
+        marker_color=previous_colors,
+        opacity=0.7
+    ))
+    
+    # 제목과 y축 단위 설정
+    if analysis_type == "총 매출 기준":
+        title = f"브랜드별 {current_col} vs {previous_col} 총 매출 비교"
+        y_title = "총 매출 (원)"
+    else:
+        title = f"브랜드별 {current_col} vs {previous_col} 평균 매출 비교"
+        y_title = "평균 매출 (원)"
+    
+    # 브랜드 수에 따라 차트 높이 조정
+    chart_height = max(500, len(chart_data_current) * 30)
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="브랜드",
+        yaxis_title=y_title,
+        barmode='group',
+        height=chart_height,
+        showlegend=True
+    )
+    
+    # x축 레이블 회전
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+# 브랜드별 매출 비중 파이 차트 생성
+def build_brand_share_pie(chart_data_current, current_col, analysis_type):
+    import plotly.colors as pc
+    import plotly.express as px
+    color_palette = pc.qualitative.Set3  # 다양한 색상 팔레트
+    
+    # 디스커버리는 빨간색, 다른 브랜드는 팔레트 색상
+    is_discovery = chart_data_current.index == '디스커버리'
+    palette_colors = [color_palette[i % len(color_palette)] for i in range(len(chart_data_current))]
+    pie_colors = np.where(is_discovery, '#FF6B6B', palette_colors).tolist()
+    
+    # 파이 차트 제목 설정
+    if analysis_type == "총 매출 기준":
+        pie_title = f"브랜드별 {current_col} 총 매출 비중"
+    else:
+        pie_title = f"브랜드별 {current_col} 평균 매출 비중"
+    
+    fig_pie = px.pie(
+        values=chart_data_current.values,
+        names=chart_data_current.index,
+        title=pie_title,
+        color_discrete_sequence=pie_colors,
+        category_orders={"names": chart_data_current.index.tolist()}  # 구성비 큰 순으로 정렬
+    )
+    
+    # 디스커버리 부분 강조 (두꺼운 테두리)
+    fig_pie.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>매출: %{value:,.0f}원<br>비중: %{percent}<extra></extra>',
+        marker_line=dict(width=2, color='white')
+    )
+    
+    # 디스커버리 부분만 더 두꺼운 테두리 적용
+    if is_discovery.any():
+        fig_pie.data[0].marker.line.width = np.where(is_discovery, 6, 2).tolist()
+        fig_pie.data[0].marker.line.color = np.where(is_discovery, 'red', 'white').tolist()
+    
+    fig_pie.update_layout(height=500)
+    return fig_pie
+
+# 시즌별 총 매출 추이 라인 차트 생성
+def build_season_trend_line(sales_data):
+    import plotly.express as px
+    return px.line(
+        x=sales_data.index.tolist(),
+        y=sales_data.values,
+        title="시계열별 총 매출 추이",
+        labels={'x': '시즌', 'y': '매출 (원)'}
+    ).update_layout(height=500)
+
+# 시즌별 매출 비교 바 차트 생성
+def build_season_compare_bar(sales_data):
+    import plotly.express as px
+    return px.bar(
+        x=sales_data.index.tolist(),
+        y=sales_data.values,
+        title="시즌별 매출 비교",
+        labels={'x': '시즌', 'y': '매출 (원)'},
+        color=sales_data.values,
+        color_continuous_scale='Blues'
+    )
+
+# 매출 상위 항목 가로 바 차트 생성
+def build_top_sales_bar(sales, title, label):
+    import plotly.express as px
+    return px.bar(
+        x=sales.values,
+        y=sales.index,
+        orientation='h',
+        title=title,
+        labels={'x': '매출 (원)', 'y': label}
+    ).update_layout(height=600)
+
+# 매출 상위 항목 비중 파이 차트 생성
+def build_top_sales_pie(sales, title):
+    import plotly.express as px
+    return px.pie(
+        values=sales.values,
+        names=sales.index,
+        title=title
+    )
+
+# 브랜드 × 시즌 매출 히트맵 생성
+def build_brand_season_heatmap(matrix, title):
+    import plotly.express as px
+    return px.imshow(
+        matrix.values,
+        x=matrix.columns.tolist(),
+        y=matrix.index,
+        title=title,
+        color_continuous_scale='Blues',
+        aspect='auto'
+    ).update_layout(height=600)
@@ -1,9 +1,19 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
+
+from analytics import filter_dataset
+from charts import (
+    build_brand_season_heatmap, build_season_compare_bar, build_season_trend_line, build_top_sales_bar,
+    build_top_sales_pie
+)
+from dataset_registry import get_dataset_cache
+from dataset_selector import load_dataset_source, select_dataset
+from figure_cache import cached_figure
+from instrumentation import page_run, section
+from large_charts import build_scatter
+from memory_diagnostics import enable_from_env as enable_memory_diagnostics
+from metrics import enable_from_env
+from quality_panel import render_quality_summary
+from paged_table import TableIndex, render_paged_table
 
 # 페이지 설정
 st.set_page_config(
@@ -13,28 +23,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 데이터 로드 함수
-@st.cache_data
-def load_data():
-    """CSV 파일을 로드하고 데이터를 전처리합니다."""
-    try:
-        df = pd.read_csv('DX OUTLET MS DB.csv')
-        
-        # 매출 컬럼을 숫자형으로 변환
-        sales_columns = ['23SS', '23FW', '24SS', '24FW', '25SS']
-        for col in sales_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # 매장 면적을 숫자형으로 변환
-        df['매장 면적'] = pd.to_numeric(df['매장 면적'], errors='coerce')
-        
-        # 결측값 처리
-        df = df.fillna(0)
-        
-        return df
-    except Exception as e:
-        st.error(f"데이터 로드 중 오류가 발생했습니다: {e}")
-        return None
+# 운영 지표 내보내기와 메모리 진단 (DX_METRICS_*, DX_MEMORY_DIAGNOSTICS 환경변수를 설정했을 때만)
+enable_from_env()
+enable_memory_diagnostics()
+
+# 필터 조합별 테이블 인덱스 (정렬/검색 인덱스 재사용, 데이터셋 LRU에 함께 보관)
+# 데이터가 바뀌어도 이 필터 조합의 행이 그대로이면 이전 버전의 인덱스를 이어 씀
+def get_table_index(source, selection, filter_key):
+    """필터 조합에 해당하는 서버측 테이블 인덱스를 반환합니다."""
+    return get_dataset_cache().derived(
+        source, ('table_index', filter_key), lambda: TableIndex(selection.frame()), scope=filter_key
+    )
+
+# 필터 조합별 변경 내역 테이블 인덱스
+def get_change_index(source, filter_key):
+    """필터 조합에 해당하는 변경 내역 테이블 인덱스를 반환합니다."""
+    return get_dataset_cache().derived(
+        source, ('change_index', filter_key), lambda: TableIndex(filter_dataset(source.changes.table, *filter_key))
+    )
 
 # 메인 함수
 def main():
@@ -42,188 +48,177 @@ def main():
     st.title("📊 DX OUTLET 매출 분석 대시보드")
     st.markdown("---")
     
-    # 데이터 로드
-    df = load_data()
-    if df is None:
+    # 데이터셋 선택과 로드 (최근에 본 데이터셋은 메모리 한도 안에서 재사용)
+    with section("load_data"):
+        dataset = select_dataset()
+        source = load_dataset_source(dataset) if dataset is not None else None
+    if source is None:
         st.stop()
     
     # 사이드바 필터
-    st.sidebar.header("🔍 필터 옵션")
-    
-    # 유통사 필터
-    distributors = ['전체'] + sorted(df['유통사'].unique().tolist())
-    selected_distributor = st.sidebar.selectbox("유통사 선택", distributors)
-    
-    # 매장 필터
-    if selected_distributor != '전체':
-        store_options = ['전체'] + sorted(df[df['유통사'] == selected_distributor]['매장명'].unique().tolist())
-    else:
-        store_options = ['전체'] + sorted(df['매장명'].unique().tolist())
-    
-    selected_store = st.sidebar.selectbox("매장 선택", store_options)
-    
-    # 브랜드 필터
-    brand_options = ['전체'] + sorted(df['브랜드'].unique().tolist())
-    selected_brand = st.sidebar.selectbox("브랜드 선택", brand_options)
-    
-    # 데이터 필터링
-    filtered_df = df.copy()
-    
-    if selected_distributor != '전체':
-        filtered_df = filtered_df[filtered_df['유통사'] == selected_distributor]
-    
-    if selected_store != '전체':
-        filtered_df = filtered_df[filtered_df['매장명'] == selected_store]
-    
-    if selected_brand != '전체':
-        filtered_df = filtered_df[filtered_df['브랜드'] == selected_brand]
+    with section("filters"):
+        st.sidebar.header("🔍 필터 옵션")
+        
+        # 유통사 필터
+        selected_distributor = st.sidebar.selectbox("유통사 선택", source.filter_options('유통사'))
+        
+        # 매장 필터
+        store_options = source.filter_options('매장명', selected_distributor)
+        selected_store = st.sidebar.selectbox("매장 선택", store_options)
+        
+        # 브랜드 필터
+        selected_brand = st.sidebar.selectbox("브랜드 선택", source.filter_options('브랜드'))
+        
+        # 데이터 필터링 (SQLite 백엔드는 이후 집계를 SQL로 실행)
+        selection = source.select(selected_distributor, selected_store, selected_brand)
+        
+        # 적재 검증 결과
+        render_quality_summary(source.quality)
     
     # 메트릭 표시
-    st.subheader("📈 주요 지표")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        total_stores = len(filtered_df['매장명'].unique())
-        st.metric("총 매장 수", f"{total_stores}개")
-    
-    with col2:
-        total_brands = len(filtered_df['브랜드'].unique())
-        st.metric("총 브랜드 수", f"{total_brands}개")
-    
-    with col3:
-        total_sales_25ss = filtered_df['25SS'].sum()
-        st.metric("25SS 총 매출", f"{total_sales_25ss:,.0f}원")
-    
-    with col4:
-        avg_store_area = filtered_df['매장 면적'].mean()
-        if not pd.isna(avg_store_area):
-            st.metric("평균 매장 면적", f"{avg_store_area:.1f}㎡")
-        else:
-            st.metric("평균 매장 면적", "N/A")
+    with section("metrics"):
+        st.subheader("📈 주요 지표")
+        
+        kpi = selection.kpi_summary()
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("총 매장 수", f"{kpi['stores']}개")
+        
+        with col2:
+            st.metric("총 브랜드 수", f"{kpi['brands']}개")
+        
+        with col3:
+            st.metric("25SS 총 매출", f"{kpi['sales']:,.0f}원")
+        
+        with col4:
+            if kpi['avg_area'] is not None:
+                st.metric("평균 매장 면적", f"{kpi['avg_area']:.1f}㎡")
+            else:
+                st.metric("평균 매장 면적", "N/A")
     
     st.markdown("---")
     
     # 탭으로 구분된 분석
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 시계열 분석", "🏪 매장별 분석", "🏷️ 브랜드별 분석", "📋 데이터 테이블"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["📊 시계열 분석", "🏪 매장별 분석", "🏷️ 브랜드별 분석", "📋 데이터 테이블", "🔄 변경 내역"]
+    )
     
     with tab1:
-        st.subheader("시계열 매출 분석")
-        
-        # 시계열 데이터 준비
-        sales_columns = ['23SS', '23FW', '24SS', '24FW', '25SS']
-        sales_data = filtered_df[sales_columns].sum()
-        
-        # 시계열 차트
-        fig = px.line(
-            x=['23SS', '23FW', '24SS', '24FW', '25SS'],
-            y=sales_data.values,
-            title="시계열별 총 매출 추이",
-            labels={'x': '시즌', 'y': '매출 (원)'}
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 시즌별 매출 비교 (바 차트)
-        fig_bar = px.bar(
-            x=['23SS', '23FW', '24SS', '24FW', '25SS'],
-            y=sales_data.values,
-            title="시즌별 매출 비교",
-            labels={'x': '시즌', 'y': '매출 (원)'},
-            color=sales_data.values,
-            color_continuous_scale='Blues'
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        with section("season_trend"):
+            st.subheader("시계열 매출 분석")
+            
+            # 시계열 데이터 준비
+            sales_data = selection.season_totals()
+            
+            # 시계열 차트
+            fig = cached_figure('season_trend_line', [sales_data], lambda: build_season_trend_line(sales_data))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # 시즌별 매출 비교 (바 차트)
+            fig_bar = cached_figure('season_compare_bar', [sales_data], lambda: build_season_compare_bar(sales_data))
+            st.plotly_chart(fig_bar, use_container_width=True)
     
     with tab2:
-        st.subheader("매장별 분석")
-        
-        # 매장별 25SS 매출 상위 10개
-        store_sales = filtered_df.groupby('매장명')['25SS'].sum().sort_values(ascending=False).head(10)
-        
-        fig = px.bar(
-            x=store_sales.values,
-            y=store_sales.index,
-            orientation='h',
-            title="매장별 25SS 매출 TOP 10",
-            labels={'x': '매출 (원)', 'y': '매장명'}
-        )
-        fig.update_layout(height=600)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 매장 면적 vs 매출 산점도
-        area_sales_df = filtered_df.groupby('매장명').agg({
-            '매장 면적': 'first',
-            '25SS': 'sum'
-        }).dropna()
-        
-        if not area_sales_df.empty:
-            fig_scatter = px.scatter(
-                area_sales_df,
-                x='매장 면적',
-                y='25SS',
-                title="매장 면적 vs 25SS 매출",
-                labels={'매장 면적': '매장 면적 (㎡)', '25SS': '25SS 매출 (원)'},
-                hover_data={'매장명': True}
-            )
-            st.plotly_chart(fig_scatter, use_container_width=True)
+        with section("store_analysis"):
+            st.subheader("매장별 분석")
+            
+            # 매장별 25SS 매출 상위 10개
+            store_sales = selection.top_sales('매장명')
+            
+            fig = cached_figure('store_top10_bar', [store_sales], lambda: build_top_sales_bar(
+                store_sales, "매장별 25SS 매출 TOP 10", '매장명'
+            ))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # 매장 면적 vs 매출 산점도
+            area_sales_df = selection.area_sales()
+            
+            if not area_sales_df.empty:
+                # 매장 수가 많으면 WebGL/구간 집계 모드로 자동 전환
+                fig_scatter = cached_figure('area_sales_scatter', [area_sales_df], lambda: build_scatter(
+                    area_sales_df,
+                    x='매장 면적',
+                    y='25SS',
+                    title="매장 면적 vs 25SS 매출",
+                    labels={'매장 면적': '매장 면적 (㎡)', '25SS': '25SS 매출 (원)'},
+                    hover_name='매장명'
+                ))
+                st.plotly_chart(fig_scatter, use_container_width=True)
     
     with tab3:
-        st.subheader("브랜드별 분석")
-        
-        # 브랜드별 25SS 매출 상위 10개
-        brand_sales = filtered_df.groupby('브랜드')['25SS'].sum().sort_values(ascending=False).head(10)
-        
-        fig = px.pie(
-            values=brand_sales.values,
-            names=brand_sales.index,
-            title="브랜드별 25SS 매출 비중 (TOP 10)"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 브랜드별 시계열 매출 히트맵
-        brand_season_data = filtered_df.groupby('브랜드')[sales_columns].sum()
-        brand_season_data = brand_season_data.sort_values('25SS', ascending=False).head(15)
-        
-        fig_heatmap = px.imshow(
-            brand_season_data.values,
-            x=sales_columns,
-            y=brand_season_data.index,
-            title="브랜드별 시계열 매출 히트맵 (TOP 15)",
-            color_continuous_scale='Blues',
-            aspect='auto'
-        )
-        fig_heatmap.update_layout(height=600)
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        with section("brand_analysis"):
+            st.subheader("브랜드별 분석")
+            
+            # 브랜드별 25SS 매출 상위 10개
+            brand_sales = selection.top_sales('브랜드')
+            
+            fig = cached_figure('brand_top10_pie', [brand_sales], lambda: build_top_sales_pie(
+                brand_sales, "브랜드별 25SS 매출 비중 (TOP 10)"
+            ))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # 브랜드별 시계열 매출 히트맵
+            brand_season_data = selection.brand_season_matrix(top_n=15)
+            
+            fig_heatmap = cached_figure('brand_season_heatmap', [brand_season_data], lambda: build_brand_season_heatmap(
+                brand_season_data, "브랜드별 시계열 매출 히트맵 (TOP 15)"
+            ))
+            st.plotly_chart(fig_heatmap, use_container_width=True)
     
     with tab4:
-        st.subheader("데이터 테이블")
-        
-        # 필터링된 데이터 표시
-        st.write(f"총 {len(filtered_df)}개의 레코드가 표시됩니다.")
-        
-        # 컬럼 선택
-        display_columns = st.multiselect(
-            "표시할 컬럼을 선택하세요:",
-            options=df.columns.tolist(),
-            default=['유통사', '매장명', '브랜드', '25SS', '24FW', '24SS', '23FW', '23SS']
-        )
-        
-        if display_columns:
-            st.dataframe(
-                filtered_df[display_columns],
-                use_container_width=True,
-                height=400
-            )
+        with section("data_table"):
+            st.subheader("데이터 테이블")
             
-            # CSV 다운로드 버튼
-            csv = filtered_df[display_columns].to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                label="📥 필터링된 데이터 다운로드",
-                data=csv,
-                file_name=f"filtered_outlet_data_{selected_distributor}_{selected_store}_{selected_brand}.csv",
-                mime="text/csv"
+            # 필터링된 데이터 표시
+            st.write(f"총 {len(selection)}개의 레코드가 표시됩니다.")
+            
+            # 컬럼 선택
+            display_columns = st.multiselect(
+                "표시할 컬럼을 선택하세요:",
+                options=source.columns,
+                default=['유통사', '매장명', '브랜드', '25SS', '24FW', '24SS', '23FW', '23SS']
             )
+            
+            if display_columns:
+                # 현재 페이지의 선택 컬럼만 전송 (정렬/검색은 서버에서 처리)
+                table_index = get_table_index(source, selection, (selected_distributor, selected_store, selected_brand))
+                render_paged_table(
+                    table_index,
+                    key="data_table",
+                    columns=display_columns,
+                    use_container_width=True
+                )
+                
+                # CSV 다운로드 버튼 (CSV는 버튼을 누를 때만 생성)
+                st.download_button(
+                    label="📥 필터링된 데이터 다운로드",
+                    data=lambda: table_index.df[display_columns].to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"filtered_outlet_data_{selected_distributor}_{selected_store}_{selected_brand}.csv",
+                    mime="text/csv"
+                )
+    
+    with tab5:
+        with section("changes"):
+            st.subheader("이전 데이터 대비 변경 내역")
+            
+            changes = source.changes
+            if changes is None:
+                st.info("비교할 이전 데이터가 없습니다. 새 데이터 파일을 받으면 이전 파일과 달라진 매장-브랜드 행이 표시됩니다.")
+            else:
+                summary = changes.summary
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("추가", f"{summary['added']:,}행")
+                col2.metric("삭제", f"{summary['removed']:,}행")
+                col3.metric("변경", f"{summary['changed']:,}행")
+                col4.metric("동일", f"{summary['unchanged']:,}행")
+                
+                if changes.empty:
+                    st.success("이전 데이터와 내용이 같습니다.")
+                else:
+                    # 사이드바 필터를 변경 내역에도 적용 ('<컬럼> (이전)'은 이전 값)
+                    change_index = get_change_index(source, (selected_distributor, selected_store, selected_brand))
+                    render_paged_table(change_index, key="change_table", use_container_width=True)
     
     # 푸터
     st.markdown("---")
@@ -236,4 +231,5 @@ def main():
     """)
 
 if __name__ == "__main__":
-    main()
+    with page_run("dashboard_streamlit"):
+        main()
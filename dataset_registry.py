@@ -0,0 +1,332 @@
+"""데이터셋 레지스트리와 메모리 한도 LRU
+
+여러 MS DB 변형(아울렛/백화점 채널, 비교 브랜드 구성별 파일 등)을
+레지스트리에 등록해 두면 대시보드 사이드바에서 골라 볼 수 있습니다.
+레지스트리는 DX_DATASETS로 지정한 JSON 파일이며, 지정하지 않으면
+DX_OUTLET_DATA 하나만 등록된 것으로 봅니다. 상대 경로는 레지스트리 파일이
+있는 디렉터리 기준이고, 첫 항목이 기본 선택입니다. "snapshots": false인
+항목은 데이터 드롭 스냅샷과 변경 내역(dataset_snapshots)을 남기지 않습니다.
+
+    [
+        {"name": "아울렛", "path": "DX OUTLET MS DB.csv"},
+        {"name": "백화점", "path": "DX DEPT MS DB.csv", "snapshots": false}
+    ]
+
+불러온 데이터 소스(FrameSource, SQLiteStore, SalesMatrix)와 소스에 딸린
+파생 객체(필터 조합별 테이블 인덱스, 매장 효율 리포트 등)는 프로세스 전역
+LRU에 함께 보관하므로 최근에 본 데이터셋으로는 바로 전환됩니다. 항목
+크기는 데이터프레임/배열/Arrow 테이블의 메모리 사용량(메모리 맵 배열은
+매핑 크기)을 만들 때 한 번 추정하며, 합계가 DX_DATASET_CACHE_MB(기본
+1024)를 넘으면 가장 오래 쓰지 않은 데이터셋부터 파생 객체와 함께
+내보냅니다. 방금 요청한 데이터셋은 내보내지 않으므로, 데이터셋 하나가
+한도보다 크면 경고를 남기고 그 데이터셋의 파생 객체만 줄여 보관합니다.
+
+캐시 항목은 CSV 경로와 백엔드로 구분하며, 원본 CSV가
+바뀌면(analytics.dataset_version) 다음 조회 때 이전 버전 항목을 버리고 다시
+불러옵니다. 이때 필터 범위(scope)를 지정해 만든 파생 객체는 캐시에 있던
+버전과 새 버전을 (유통사, 매장명, 브랜드) 키와 행 내용 해시로
+비교(analytics.changed_keys)하여, 범위 안에 바뀐 행이 없으면 다시 만들지 않고
+새 버전 항목으로 옮깁니다. 범위가 없는 파생 객체는 전부 다시 만듭니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analytics import (
+    DATA_BACKEND, DATA_PATH, FrameSource, changed_keys, dataset_version, filter_dataset, key_hashes,
+    load_validated_dataset
+)
+from dataset_snapshots import load_tracked_dataset
+from metrics import CACHE_COMPUTE_SECONDS, register_cache
+from sales_matrix import open_matrix
+from sqlite_store import SQLiteStore
+
+REGISTRY_PATH = os.environ.get('DX_DATASETS')
+DATASET_CACHE_MAX_BYTES = int(os.environ.get('DX_DATASET_CACHE_MB', 1024)) * 1024 * 1024
+DERIVED_MAX_ENTRIES = 32  # 데이터셋별 파생 객체 수 한도
+
+logger = logging.getLogger(__name__)
+
+
+def load_registry(path=REGISTRY_PATH):
+    """등록된 데이터셋 목록 [{'name', 'path', ...}]을 반환합니다."""
+    if not path:
+        return [{'name': os.path.splitext(os.path.basename(DATA_PATH))[0], 'path': DATA_PATH}]
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    datasets = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get('name') or not entry.get('path'):
+            raise ValueError(f"데이터셋 레지스트리 항목에 name과 path가 필요합니다: {entry!r}")
+        datasets.append(dict(entry, path=os.path.join(base, entry['path'])))
+    names = [dataset['name'] for dataset in datasets]
+    if not datasets or len(set(names)) != len(names):
+        raise ValueError(f"데이터셋 레지스트리가 비어 있거나 이름이 중복됩니다: {path}")
+    return datasets
+
+
+def load_untracked_dataset(path):
+    """스냅샷을 남기지 않고 CSV를 로드/검증하여 (데이터프레임, DataQuality, None)을 반환합니다."""
+    df, quality = load_validated_dataset(path)
+    return df, quality, None
+
+
+def open_source(path, backend=DATA_BACKEND, load=load_tracked_dataset):
+    """데이터 CSV를 백엔드에 맞는 데이터 소스(필터/집계 인터페이스)로 엽니다.
+
+    load(path)는 (데이터프레임, DataQuality, DatasetChanges 또는 None)을
+    반환하며, SQLite/행렬 백엔드는 저장된 파일이 CSV 버전과 다를 때만 호출합니다.
+    """
+    if backend == 'sqlite':
+        return SQLiteStore.open(source=path, load=load)
+    if backend == 'mmap':
+        return open_matrix(path, load=load)
+    df, quality, changes = load(path)
+    return FrameSource(df, quality, changes)
+
+
+def estimate_bytes(obj, _seen=None):
+    """데이터프레임/배열/Arrow 테이블 속성을 따라가며 객체의 메모리 사용량을 추정합니다."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    nbytes = getattr(obj, 'nbytes', None)  # pyarrow.Table 등
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, dict):
+        return sum(estimate_bytes(value, seen) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_bytes(value, seen) for value in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        return sum(estimate_bytes(value, seen) for value in vars(obj).values())
+    return 0
+
+
+class _Entry:
+    """캐시된 데이터 소스 1개와 파생 객체들"""
+
+    def __init__(self, version, source, nbytes):
+        self.version = version
+        self.source = source
+        self.derived = OrderedDict()  # 키 → (객체, 추정 바이트, 필터 범위 또는 None)
+        self.key_hashes = None  # 범위가 있는 파생 객체를 처음 만들 때 계산 (다음 버전과 비교용)
+        self.nbytes = nbytes
+
+
+class DatasetCache:
+    """데이터 소스와 파생 객체를 메모리 한도 안에서 보관하는 LRU 캐시"""
+
+    def __init__(self, max_bytes=DATASET_CACHE_MAX_BYTES, derived_max_entries=DERIVED_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.derived_max_entries = derived_max_entries
+        self._entries = OrderedDict()  # (CSV 절대 경로, 백엔드) → _Entry
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._previous = {}  # 키 → 이전 버전의 (key_hashes, 파생 객체) (새 버전으로 이어 쓰기용, 소스는 보관하지 않음)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key, version):
+        """현재 버전 항목을 최근 사용으로 표시하여 반환합니다. (이전 버전 항목은 버림)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                self._remove(key)
+                if entry.key_hashes is not None:
+                    self._previous[key] = (entry.key_hashes, entry.derived)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def source(self, dataset, backend=DATA_BACKEND):
+        """레지스트리 항목의 데이터 소스를 반환합니다. (없거나 원본이 바뀌었으면 불러옴)"""
+        key = (os.path.abspath(dataset['path']), backend)
+        version = dataset_version(dataset['path'])
+        entry = self._lookup(key, version)
+        if entry is not None:
+            return entry.source
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:  # 여러 세션이 같은 데이터셋을 동시에 요청해도 한 번만 불러옴
+            entry = self._lookup(key, version)
+            if entry is not None:
+                return entry.source
+            load = load_tracked_dataset if dataset.get('snapshots', True) else load_untracked_dataset
+            start = time.perf_counter()
+            source = open_source(dataset['path'], backend, load)
+            CACHE_COMPUTE_SECONDS.observe(time.perf_counter() - start, cache='dataset')
+            with self._lock:
+                self.misses += 1
+            self.add(dataset, backend, source, version)
+            return source
+
+    def cached(self, dataset, backend=DATA_BACKEND):
+        """데이터셋의 현재 버전 데이터 소스가 캐시에 있는지 반환합니다. (최근 사용 순서는 바꾸지 않음)"""
+        with self._lock:
+            entry = self._entries.get((os.path.abspath(dataset['path']), backend))
+        return entry is not None and entry.version == dataset_version(dataset['path'])
+
+    def add(self, dataset, backend, source, version=None):
+        """다른 곳(백그라운드 업로드 적재 등)에서 만든 데이터 소스를 캐시에 넣습니다."""
+        key = (os.path.abspath(dataset['path']), backend)
+        entry = _Entry(version or dataset_version(dataset['path']), source, estimate_bytes(source))
+        with self._lock:
+            previous = self._previous.pop(key, None)
+        if previous is not None:
+            self._carry_over(previous, entry)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            self._evict(key)
+
+    def _carry_over(self, previous, entry):
+        """이전 버전의 파생 객체 중 필터 범위 안에 바뀐 행이 없는 것을 새 항목으로 옮깁니다."""
+        previous_hashes, previous_derived = previous
+        scoped = [(key, item) for key, item in previous_derived.items() if item[2] is not None]
+        if not scoped:
+            return
+        entry.key_hashes = key_hashes(entry.source.select().frame())
+        entry.nbytes += estimate_bytes(entry.key_hashes)
+        changed = changed_keys(previous_hashes, entry.key_hashes)
+        for key, item in scoped:
+            if filter_dataset(changed, *item[2]).empty:
+                entry.derived[key] = item
+                entry.nbytes += item[1]
+        logger.info(
+            "데이터셋 새 버전 %s: 바뀐 키 %d개, 파생 객체 %d/%d개 이어 씀",
+            entry.version, len(changed), len(entry.derived), len(previous_derived),
+        )
+
+    def derived(self, source, key, builder, scope=None):
+        """데이터 소스에 딸린 파생 객체를 반환하고, 없으면 builder로 만들어 함께 보관합니다.
+
+        scope는 객체가 읽는 행의 필터 범위 (유통사, 매장명, 브랜드)이며 '전체'는
+        모든 값입니다. 범위를 지정하면 원본 CSV가 바뀌어도 범위 안의 행이 그대로인
+        동안 객체를 다시 만들지 않습니다. (범위 밖의 행을 읽는 객체에는 지정하지 않음)
+        소스가 이미 캐시에서 빠졌으면 만든 객체를 보관하지 않고 그대로 반환합니다.
+        """
+        with self._lock:
+            entry_key = self._key_of(source)
+            if entry_key is not None:
+                derived = self._entries[entry_key].derived
+                if key in derived:
+                    derived.move_to_end(key)
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return derived[key][0]
+
+        start = time.perf_counter()
+        value = builder()
+        CACHE_COMPUTE_SECONDS.observe(time.perf_counter() - start, cache='dataset')
+        nbytes = estimate_bytes(value)
+        hashes = None
+        if scope is not None:
+            with self._lock:
+                entry_key = self._key_of(source)
+                need_hashes = entry_key is not None and self._entries[entry_key].key_hashes is None
+            if need_hashes:
+                hashes = key_hashes(source.select().frame())
+        with self._lock:
+            self.misses += 1
+            entry_key = self._key_of(source)
+            if entry_key is not None:
+                entry = self._entries[entry_key]
+                if hashes is not None and entry.key_hashes is None:
+                    entry.key_hashes = hashes
+                    hashes_bytes = estimate_bytes(hashes)
+                    entry.nbytes += hashes_bytes
+                    self._bytes += hashes_bytes
+                self._drop_derived(entry, key)
+                entry.derived[key] = (value, nbytes, tuple(scope) if scope is not None else None)
+                entry.nbytes += nbytes
+                self._bytes += nbytes
+                while len(entry.derived) > self.derived_max_entries:
+                    self._drop_derived(entry, next(iter(entry.derived)))
+                self._entries.move_to_end(entry_key)
+                self._evict(entry_key)
+        return value
+
+    def _key_of(self, source):
+        for key, entry in self._entries.items():
+            if entry.source is source:
+                return key
+        return None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def _drop_derived(self, entry, key):
+        item = entry.derived.pop(key, None)
+        if item is not None:
+            entry.nbytes -= item[1]
+            self._bytes -= item[1]
+
+    def _evict(self, current):
+        """한도를 넘으면 current 외의 오래된 데이터셋부터, 그다음 current의 오래된 파생 객체를 내보냅니다."""
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            if oldest != current:
+                self._remove(oldest)
+                self.evictions += 1
+                continue
+            entry = self._entries[current]
+            if len(entry.derived) > 1:  # 방금 만든 파생 객체는 남김
+                self._drop_derived(entry, next(iter(entry.derived)))
+                continue
+            logger.warning(
+                "데이터셋 %s이(가) 캐시 한도(%.0fMB)보다 큽니다 (%.0fMB)",
+                current[0], self.max_bytes / 1024 / 1024, self._bytes / 1024 / 1024,
+            )
+            break
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._previous.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """캐시 상태 요약을 반환합니다."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# 프로세스 전역 캐시 (모든 세션 공유)
+_dataset_cache = DatasetCache()
+register_cache('dataset', _dataset_cache.stats)
+
+
+def get_dataset_cache():
+    return _dataset_cache
@@ -0,0 +1,83 @@
+"""사이드바 데이터셋 선택과 업로드
+
+레지스트리(dataset_registry.load_registry)에 등록된 데이터셋과 사이드바에서
+올린 파일(dataset_upload)을 선택 상자로 고르고, 선택한 데이터셋의 데이터
+소스를 프로세스 전역 LRU(dataset_registry.DatasetCache)에서 가져옵니다.
+업로드 파일은 백그라운드에서 적재되는 동안 진행률만 주기적으로 다시 그리고,
+적재가 끝나면 페이지를 다시 실행하여 업로드 데이터셋을 선택합니다.
+"""
+import streamlit as st
+
+from analytics import DATA_BACKEND
+from dataset_registry import get_dataset_cache, load_registry
+from dataset_upload import submit_upload
+
+UPLOAD_POLL_SECONDS = 0.5
+
+
+def select_dataset(backend=DATA_BACKEND):
+    """사이드바에서 데이터셋을 고르고 레지스트리 항목을 반환합니다. (레지스트리 오류 시 None)"""
+    try:
+        datasets = load_registry()
+    except (OSError, ValueError) as e:
+        st.error(f"데이터셋 레지스트리를 읽을 수 없습니다: {e}")
+        return None
+
+    selector = st.sidebar.container()
+    upload = render_upload(backend)
+    if upload is None:
+        st.session_state.pop('upload_selected', None)
+    else:
+        datasets = datasets + [upload]
+        if st.session_state.get('upload_selected') != upload['name']:
+            st.session_state['upload_selected'] = upload['name']
+            st.session_state['dataset'] = upload['name']  # 적재가 끝난 업로드를 바로 선택
+    if len(datasets) == 1:
+        return datasets[0]
+    names = [dataset['name'] for dataset in datasets]
+    name = selector.selectbox("📁 데이터셋", names, key="dataset")
+    return datasets[names.index(name)]
+
+
+def render_upload(backend=DATA_BACKEND):
+    """사이드바 업로드 영역을 그리고, 적재가 끝난 업로드의 레지스트리 항목을 반환합니다."""
+    uploaded = st.sidebar.file_uploader(
+        "📤 내 데이터로 보기 (CSV)", type=['csv'], key="upload_file",
+        help="MS DB와 같은 컬럼의 CSV를 올리면 백그라운드에서 적재한 뒤 같은 대시보드로 보여 줍니다.",
+    )
+    if uploaded is None:
+        return None
+
+    # 같은 파일이면 다시 해시하지 않고 세션의 작업을 사용
+    upload_id = (uploaded.file_id, backend)
+    if st.session_state.get('upload_id') != upload_id:
+        st.session_state['upload_job'] = submit_upload(uploaded.getvalue(), backend)
+        st.session_state['upload_id'] = upload_id
+    job = st.session_state['upload_job']
+
+    if not job.done:
+        with st.sidebar:
+            _upload_progress(job)
+        return None
+    if job.error is not None:
+        st.sidebar.error(f"업로드 파일을 적재하지 못했습니다: {job.error}")
+        return None
+    return job.dataset(f"📤 {uploaded.name}")
+
+
+@st.fragment(run_every=UPLOAD_POLL_SECONDS)
+def _upload_progress(job):
+    """적재 진행률을 주기적으로 다시 그리고, 끝나면 페이지 전체를 다시 실행합니다."""
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=job.stage)
+
+
+def load_dataset_source(dataset, backend=DATA_BACKEND):
+    """데이터셋의 데이터 소스를 설정된 백엔드로 반환합니다. (로드 실패 시 오류를 표시하고 None)"""
+    try:
+        with st.spinner(f"{dataset['name']} 데이터를 불러오는 중..."):
+            return get_dataset_cache().source(dataset, backend)
+    except Exception as e:
+        st.error(f"데이터 로드 중 오류가 발생했습니다: {e}")
+        return None
@@ -0,0 +1,112 @@
+"""데이터 드롭 스냅샷과 변경 내역
+
+새 MS DB 파일을 적재할 때마다 정제된 데이터셋을 내용 버전
+(analytics.content_version) 이름으로 저장해 두고, 직전 스냅샷과 비교한
+키 단위 변경 내역(analytics.DatasetChanges)을 함께 남깁니다. 내용이 같은
+파일을 다시 받으면(수정 시각만 바뀐 경우 포함) 새 스냅샷을 만들지 않고
+처음 저장할 때의 변경 내역을 그대로 사용합니다.
+
+디렉터리 구성 (<스냅샷 디렉터리>/<내용 버전>/):
+    frame.pkl      정제된 데이터셋
+    changes.json   직전 스냅샷 대비 변경 내역 (첫 스냅샷에는 없음)
+
+스냅샷 디렉터리는 데이터 CSV와 같은 이름의 .snapshots이며, DX_SNAPSHOT_DIR을
+지정하면 그 아래에 CSV 이름별로 만듭니다. 가장 최근에 적재한
+DX_SNAPSHOT_KEEP개(기본 5)만 남기고 오래된 스냅샷은 지웁니다. 스냅샷을 쓸
+수 없는 환경(읽기 전용 디렉터리 등)에서는 경고만 남기고 변경 내역 없이
+계속합니다.
+"""
+import logging
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from analytics import DATA_PATH, DatasetChanges, content_version, diff_datasets, load_validated_dataset
+
+SNAPSHOT_ROOT = os.environ.get('DX_SNAPSHOT_DIR')
+SNAPSHOT_KEEP = int(os.environ.get('DX_SNAPSHOT_KEEP', 5))
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_dir(path=DATA_PATH):
+    """데이터 CSV의 스냅샷 디렉터리 경로를 반환합니다."""
+    name = os.path.splitext(path)[0]
+    if SNAPSHOT_ROOT:
+        return os.path.join(SNAPSHOT_ROOT, os.path.basename(name))
+    return name + '.snapshots'
+
+
+def load_tracked_dataset(path=DATA_PATH, root=None):
+    """CSV를 로드/검증하고 스냅샷을 남겨 (데이터프레임, DataQuality, DatasetChanges 또는 None)을 반환합니다."""
+    df, quality = load_validated_dataset(path)
+    return df, quality, record_snapshot(df, root or snapshot_dir(path))
+
+
+def record_snapshot(df, root, keep=SNAPSHOT_KEEP):
+    """데이터셋 스냅샷을 (처음 보는 내용이면) 저장하고 직전 스냅샷 대비 변경 내역을 반환합니다.
+
+    비교할 이전 스냅샷이 없거나 스냅샷을 쓸 수 없으면 None을 반환합니다.
+    """
+    version = content_version(df)
+    directory = os.path.join(root, version)
+    try:
+        if os.path.isdir(directory):
+            os.utime(directory)  # 다음 데이터의 비교 기준이 되도록 최근 스냅샷으로 표시
+        else:
+            _write_snapshot(df, root, version)
+            _prune(root, keep)
+        return load_changes(directory)
+    except OSError as e:
+        logger.warning("데이터 스냅샷을 저장하지 못했습니다 (%s): %s", root, e)
+        return None
+
+
+def _write_snapshot(df, root, version):
+    os.makedirs(root, exist_ok=True)
+    previous = _latest(root)
+    directory = os.path.join(root, version)
+    tmp_dir = tempfile.mkdtemp(prefix=f'.{version}-', dir=root)
+    try:
+        df.to_pickle(os.path.join(tmp_dir, 'frame.pkl'))
+        if previous is not None:
+            changes = diff_datasets(load_snapshot(os.path.join(root, previous)), df, previous, version)
+            with open(os.path.join(tmp_dir, 'changes.json'), 'w', encoding='utf-8') as f:
+                f.write(changes.to_json())
+        os.rename(tmp_dir, directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)  # 다른 프로세스가 먼저 만든 경우
+
+
+def _snapshots(root):
+    """스냅샷 이름 목록을 최근에 적재한 순서로 반환합니다."""
+    names = [name for name in os.listdir(root) if not name.startswith('.')]
+    return sorted(names, key=lambda name: os.stat(os.path.join(root, name)).st_mtime_ns, reverse=True)
+
+
+def _latest(root):
+    names = _snapshots(root)
+    return names[0] if names else None
+
+
+def _prune(root, keep):
+    for name in _snapshots(root)[max(keep, 1):]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def load_snapshot(directory):
+    """스냅샷 디렉터리의 데이터셋을 읽습니다. (이 모듈이 직접 쓴 로컬 파일만 읽음)"""
+    return pd.read_pickle(os.path.join(directory, 'frame.pkl'))
+
+
+def load_changes(directory):
+    path = os.path.join(directory, 'changes.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return DatasetChanges.from_json(f.read())
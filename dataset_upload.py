@@ -0,0 +1,193 @@
+"""업로드 데이터셋 백그라운드 적재
+
+분석 담당자가 올린 MS DB 추출본을 공유 스레드 풀(DX_UPLOAD_WORKERS, 기본
+2)에서 적재하여 등록된 데이터셋과 같은 대시보드로 볼 수 있게 합니다.
+적재 중에도 페이지는 그대로 동작하며, 사이드바는 작업의 진행률만 주기적으로
+읽어 표시합니다.
+
+적재 순서:
+    1. 파일 내용 해시(sha1) 이름으로 업로드 디렉터리에 저장
+    2. CHUNK_ROWS행씩 나누어 읽으며 진행률 보고 (첫 조각에서 필수 컬럼 확인).
+       UTF-8이 아닌 파일은 UTF-8로 다시 저장하여 LRU에서 빠진 뒤 다시 불러올
+       때도 일반 CSV 로더로 읽을 수 있게 함
+    3. 적재 검증(analytics.validate_dataset)
+    4. 설정된 백엔드의 데이터 소스 생성 (SQLite 적재, 매출 행렬 등) 후
+       데이터셋 LRU(dataset_registry.DatasetCache)에 등록
+
+같은 내용의 파일을 다시 올리면 진행 중이거나 끝난 작업을 그대로 쓰고, LRU에서
+빠진 뒤에도 저장된 CSV와 SQLite 파일/행렬 디렉터리를 다시 엽니다. 업로드
+디렉터리(DX_UPLOAD_DIR, 기본 시스템 임시 디렉터리의 dx_uploads)에는 최근
+DX_UPLOAD_KEEP개(기본 20) 파일만 남깁니다. 업로드는 스냅샷/변경 내역을 남기지
+않습니다.
+"""
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from analytics import DATA_BACKEND, check_columns, validate_dataset
+from dataset_registry import get_dataset_cache, open_source
+
+UPLOAD_DIR = os.environ.get('DX_UPLOAD_DIR') or os.path.join(tempfile.gettempdir(), 'dx_uploads')
+UPLOAD_KEEP = int(os.environ.get('DX_UPLOAD_KEEP', 20))
+UPLOAD_WORKERS = int(os.environ.get('DX_UPLOAD_WORKERS', 2))
+CHUNK_ROWS = 20_000
+ENCODINGS = ['utf-8', 'cp949']  # 엑셀에서 저장한 한글 CSV는 cp949인 경우가 많음
+
+# 진행률 구간 (읽기가 대부분이고 검증/소스 생성은 남은 구간에 표시)
+READ_PROGRESS = 0.8
+VALIDATE_PROGRESS = 0.85
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+_jobs = OrderedDict()  # (내용 해시, 백엔드) → UploadJob
+
+
+class UploadJob:
+    """업로드 파일 하나의 적재 작업 상태 (여러 세션이 같은 작업을 공유)"""
+
+    def __init__(self, digest, backend):
+        self.digest = digest
+        self.backend = backend
+        self.path = os.path.join(UPLOAD_DIR, digest + '.csv')
+        self.progress = 0.0
+        self.stage = "대기 중"
+        self.error = None
+        self.done = False
+
+    def report(self, progress, stage):
+        self.progress = progress
+        self.stage = stage
+
+    def dataset(self, name):
+        """적재된 업로드를 레지스트리 항목 형식으로 반환합니다."""
+        return {'name': name, 'path': self.path, 'snapshots': False}
+
+
+def get_executor():
+    """업로드 적재용 공유 스레드 풀을 반환합니다."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='upload')
+        return _executor
+
+
+def submit_upload(data, backend=DATA_BACKEND):
+    """업로드 파일 내용을 적재 작업으로 제출하고 작업을 반환합니다. (같은 내용이면 기존 작업)"""
+    digest = hashlib.sha1(data).hexdigest()[:16]
+    key = (digest, backend)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.error is None:
+            _jobs.move_to_end(key)
+            return job
+        job = _jobs[key] = UploadJob(digest, backend)
+        while len(_jobs) > UPLOAD_KEEP:
+            _jobs.popitem(last=False)
+    if get_dataset_cache().cached(job.dataset(digest), backend):  # 같은 파일을 이미 불러온 경우
+        job.report(1.0, "완료")
+        job.done = True
+        return job
+    get_executor().submit(_ingest, job, data)
+    return job
+
+
+def read_csv_chunks(path, progress=None, chunk_rows=CHUNK_ROWS):
+    """CSV를 chunk_rows행씩 읽어 (데이터프레임, 인코딩)을 반환합니다.
+
+    첫 조각에서 필수 컬럼을 확인하므로 형식이 다른 파일은 전체를 읽기 전에
+    ValueError로 끝납니다. progress(읽은 비율, 읽은 행 수)를 조각마다 호출합니다.
+    """
+    size = os.path.getsize(path) or 1
+    for encoding in ENCODINGS:
+        chunks = []
+        rows = 0
+        try:
+            with open(path, 'rb') as f:
+                for chunk in pd.read_csv(f, chunksize=chunk_rows, encoding=encoding):
+                    if not chunks:
+                        check_columns(chunk.columns)
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    if progress is not None:
+                        progress(min(f.tell() / size, 1.0), rows)
+        except UnicodeDecodeError:
+            continue
+        if rows == 0:
+            raise ValueError("데이터 행이 없습니다")
+        return pd.concat(chunks, ignore_index=True), encoding
+    raise ValueError(f"파일 인코딩을 읽을 수 없습니다 ({', '.join(ENCODINGS)})")
+
+
+def _ingest(job, data):
+    try:
+        job.report(0.0, "파일 저장 중")
+        _save(job.path, data)
+
+        def on_chunk(fraction, rows):
+            job.report(fraction * READ_PROGRESS, f"파일 읽는 중 ({rows:,}행)")
+
+        raw, encoding = read_csv_chunks(job.path, on_chunk)
+        if encoding != 'utf-8':
+            job.report(READ_PROGRESS, "UTF-8로 변환 중")
+            _transcode(job.path, encoding)
+        job.report(READ_PROGRESS, f"검증 중 ({len(raw):,}행)")
+        df, quality = validate_dataset(raw)
+        del raw
+        job.report(VALIDATE_PROGRESS, "집계 데이터 생성 중")
+        source = open_source(job.path, job.backend, load=lambda _: (df, quality, None))
+        get_dataset_cache().add(job.dataset(job.digest), job.backend, source)
+        job.report(1.0, "완료")
+    except Exception as e:
+        logger.warning("업로드 파일을 적재하지 못했습니다 (%s): %s", job.digest, e)
+        job.error = str(e)
+    finally:
+        job.done = True
+
+
+def _save(path, data):
+    """업로드 내용을 저장합니다. (같은 내용의 파일이 있으면 그대로 사용하여 데이터셋 버전 유지)"""
+    if os.path.exists(path):
+        return
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.upload-', dir=UPLOAD_DIR)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    _prune()
+
+
+def _transcode(path, encoding):
+    """업로드 파일을 UTF-8로 다시 저장합니다."""
+    fd, tmp_path = tempfile.mkstemp(prefix='.upload-', dir=UPLOAD_DIR)
+    with open(path, encoding=encoding, newline='') as src, os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, path)
+
+
+def _prune(keep=UPLOAD_KEEP):
+    """오래된 업로드 파일과 그 SQLite 파일/행렬 디렉터리를 지웁니다."""
+    uploads = sorted(
+        (name for name in os.listdir(UPLOAD_DIR) if name.endswith('.csv')),
+        key=lambda name: os.stat(os.path.join(UPLOAD_DIR, name)).st_mtime_ns, reverse=True,
+    )
+    for name in uploads[max(keep, 1):]:
+        digest = name[:-len('.csv')]
+        for other in os.listdir(UPLOAD_DIR):
+            if other.startswith(digest):
+                path = os.path.join(UPLOAD_DIR, other)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    with contextlib.suppress(FileNotFoundError):  # 다른 프로세스가 먼저 지운 경우
+                        os.remove(path)
@@ -0,0 +1,149 @@
+"""집계 데이터 지문(fingerprint) 기반 Plotly 피겨 캐시
+
+차트 입력이 되는 집계 결과와 차트 옵션을 해시하여 키로 사용하고,
+만들어 둔 피겨 객체를 LRU 방식으로 보관합니다. 모듈 전역 캐시이므로
+같은 서버 프로세스의 모든 세션이 동일한 피겨를 재사용합니다.
+
+캐시가 줄이는 것은 피겨 생성(트레이스 구성과 검증) 비용입니다.
+st.plotly_chart는 넘겨받은 피겨를 그릴 때마다 JSON으로 직렬화하므로
+직렬화 비용은 캐시와 관계없이 듭니다. 직렬화 크기는 피겨를 만들 때 한 번
+재어 메모리 한도와 페이로드 기록에 사용합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import has_listeners, record_payload
+from metrics import register_cache
+
+# 캐시 한도 (환경변수로 조정 가능)
+FIGURE_CACHE_MAX_ENTRIES = int(os.environ.get('DX_FIGURE_CACHE_ENTRIES', 256))
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get('DX_FIGURE_CACHE_MB', 64)) * 1024 * 1024
+
+
+def _update_hash(hasher, part):
+    """지문 계산에 사용할 값을 해시에 반영합니다."""
+    if isinstance(part, pd.DataFrame):
+        hasher.update(b'df')
+        hasher.update(repr(list(part.columns)).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+    elif isinstance(part, (pd.Series, pd.Index)):
+        hasher.update(b'series')
+        hasher.update(repr(getattr(part, 'name', None)).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(part, index=isinstance(part, pd.Series)).values.tobytes())
+    elif isinstance(part, np.ndarray):
+        hasher.update(b'ndarray')
+        hasher.update(f"{part.dtype}{part.shape}".encode('utf-8'))
+        hasher.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(part, (list, tuple)) and any(isinstance(p, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)) for p in part):
+        for p in part:
+            _update_hash(hasher, p)
+    else:
+        hasher.update(json.dumps(part, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8'))
+
+
+def fingerprint(*parts):
+    """집계 입력과 차트 옵션으로부터 캐시 키를 생성합니다."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_hash(hasher, part)
+    return hasher.hexdigest()
+
+
+class FigureCache:
+    """피겨 객체와 직렬화 크기를 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=FIGURE_CACHE_MAX_ENTRIES, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """캐시된 (피겨, 직렬화 바이트) 항목을 반환합니다. 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, figure, size):
+        """피겨를 저장하고 한도를 넘으면 가장 오래된 항목부터 제거합니다."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (figure, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def get_or_build(self, key, builder):
+        """캐시된 (피겨, 직렬화 바이트)를 반환하고, 없으면 builder로 생성하여 저장합니다."""
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        figure = builder()
+        size = len(figure.to_json())
+        self.put(key, figure, size)
+        return figure, size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """캐시 상태 요약을 반환합니다."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# 프로세스 전역 캐시 (모든 세션 공유)
+_figure_cache = FigureCache()
+register_cache('figure', _figure_cache.stats)
+
+
+def get_figure_cache():
+    return _figure_cache
+
+
+def cached_figure(chart_name, inputs, builder, **options):
+    """집계 입력과 옵션이 같으면 캐시된 피겨를 재사용합니다.
+
+    반환된 피겨는 여러 세션이 공유하므로 호출 측에서 수정하면 안 됩니다.
+    """
+    figure, size = _figure_cache.get_or_build(fingerprint(chart_name, inputs, options), builder)
+    if has_listeners():
+        record_payload('figure', size)
+    return figure
+
+
+def warm_figure(chart_name, inputs, builder, **options):
+    """cached_figure와 같은 키로 피겨를 미리 만들어 캐시에 넣고 반환합니다.
+
+    백그라운드 워커에서 차트를 준비할 때 사용하며, 페이로드는 기록하지 않습니다.
+    (화면에 그릴 때 cached_figure가 캐시 적중으로 기록)
+    """
+    return _figure_cache.get_or_build(fingerprint(chart_name, inputs, options), builder)[0]
@@ -0,0 +1,166 @@
+"""재미나이 API 클라이언트
+
+스트리밍 응답(streamGenerateContent, SSE) 호출을 제공합니다. 여러 분석
+요청은 스레드 풀에서 동시에 실행되며, 생성된 텍스트 조각은 하나의 큐로
+모여 화면에 순서대로 표시됩니다.
+
+DX_GEMINI_API_BASE 환경변수로 API 주소를 바꿀 수 있어 로컬 스텁
+서버(tools/gemini_stub_server.py)로 동작을 확인할 수 있습니다.
+
+requests는 페이지 시작 시간을 줄이기 위해 첫 API 호출 때 불러옵니다.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import GEMINI_FIRST_CHUNK_SECONDS, GEMINI_REQUESTS, GEMINI_SECONDS
+
+GEMINI_API_BASE = os.environ.get('DX_GEMINI_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+GEMINI_MODEL = os.environ.get('DX_GEMINI_MODEL', 'gemini-2.0-flash-exp')
+AI_WORKERS = int(os.environ.get('DX_AI_WORKERS', 4))
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 120
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 2048,
+}
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _endpoint(method, api_key, **params):
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:{method}?key={api_key}"
+    return f"{url}&{query}" if query else url
+
+
+def _payload(prompt):
+    return {
+        "contents": [{
+            "parts": [{
+                "text": prompt
+            }]
+        }],
+        "generationConfig": GENERATION_CONFIG
+    }
+
+
+def _candidate_text(result):
+    """응답 JSON에서 첫 번째 후보의 텍스트를 추출합니다."""
+    candidates = result.get('candidates') or []
+    if not candidates:
+        return None
+    parts = candidates[0].get('content', {}).get('parts', [])
+    return "".join(part.get('text', '') for part in parts)
+
+
+def _record_request(method, outcome, start):
+    GEMINI_REQUESTS.inc(method=method, outcome=outcome)
+    GEMINI_SECONDS.observe(time.perf_counter() - start, method=method)
+
+
+class GeminiError(Exception):
+    """재미나이 API 호출 실패"""
+
+
+def iter_stream(api_key, prompt):
+    """재미나이 스트리밍 API를 호출하여 생성되는 텍스트 조각을 순서대로 반환합니다.
+
+    호출 실패나 빈 응답은 GeminiError로 알립니다.
+    """
+    import requests
+
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        with requests.post(
+            _endpoint('streamGenerateContent', api_key, alt='sse'),
+            headers={'Content-Type': 'application/json'},
+            json=_payload(prompt),
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        ) as response:
+            if response.status_code != 200:
+                outcome = f"http_{response.status_code}"
+                raise GeminiError(f"API 호출 실패: {response.status_code} - {response.text}")
+
+            response.encoding = 'utf-8'
+            received = False
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                # SSE 형식: "data: {...}" 한 줄이 하나의 부분 응답
+                if not line or not line.startswith('data:'):
+                    continue
+                text = _candidate_text(json.loads(line[5:].strip()))
+                if text:
+                    if not received:
+                        GEMINI_FIRST_CHUNK_SECONDS.observe(time.perf_counter() - start)
+                        received = True
+                    # 소비자가 중간에 그만두면(GeneratorExit) 취소로 기록
+                    outcome = 'cancelled'
+                    yield text
+                    outcome = 'error'
+            if not received:
+                outcome = 'empty'
+                raise GeminiError("API 응답에서 내용을 찾을 수 없습니다.")
+            outcome = 'ok'
+
+    except (requests.RequestException, ValueError) as e:
+        raise GeminiError(f"API 호출 중 오류 발생: {str(e)}") from e
+
+    finally:
+        _record_request('streamGenerateContent', outcome, start)
+
+
+def get_executor():
+    """AI 분석용 공유 스레드 풀을 반환합니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix='gemini')
+        return _executor
+
+
+def merge_streams(streams, on_error=None):
+    """여러 스트림을 스레드 풀에서 동시에 실행하고 (이름, 항목)을 도착 순서대로 반환합니다.
+
+    각 스트림이 끝나면 (이름, None)이 반환됩니다. 스트림에서 예외가 나면
+    로그를 남기고, on_error가 있으면 on_error(이름, 예외)의 반환값을 마지막
+    항목으로 전달합니다.
+
+    Args:
+        streams: {이름: 인자 없이 호출하면 이터레이터를 반환하는 함수} 딕셔너리
+        on_error: (이름, 예외)를 받아 오류 항목을 만드는 함수
+    """
+    items = queue.Queue()
+
+    def run(name, stream):
+        try:
+            for item in stream():
+                items.put((name, item))
+        except Exception as e:
+            logger.exception("스트림 %s 실행 중 오류", name)
+            if on_error is not None:
+                items.put((name, on_error(name, e)))
+        finally:
+            items.put((name, None))
+
+    executor = get_executor()
+    for name, stream in streams.items():
+        executor.submit(run, name, stream)
+
+    remaining = len(streams)
+    while remaining:
+        name, item = items.get()
+        if item is None:
+            remaining -= 1
+        yield name, item
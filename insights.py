@@ -0,0 +1,192 @@
+"""인사이트 제공자
+
+같은 분석 요청을 규칙 기반, LLM, 하이브리드 방식으로 처리하는 공통
+인터페이스입니다. 모든 제공자는 stream(request)로 (출처, 텍스트, 교체 여부)
+업데이트를 순서대로 반환하며, 화면은 교체 여부가 True이면 이전 내용을
+지우고 새 텍스트를 표시합니다.
+
+하이브리드 방식은 규칙 기반 결과를 즉시 표시하고, LLM의 첫 응답이 지연
+예산 안에 도착하면 LLM 결과로 교체합니다. 예산을 넘기거나 호출이 실패하면
+규칙 기반 결과를 그대로 유지합니다. 첫 응답 뒤에도 다음 조각이 지연 예산
+안에 오지 않으면 응답을 중단하며, 예산 초과/중단/화면 재실행으로 결과를 더
+읽지 않게 되면 LLM 스레드에 알려 스트림 연결을 닫게 합니다.
+"""
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from analytics import generate_ai_insights, season_columns
+from gemini_client import GeminiError, iter_stream
+
+# LLM 첫 응답 대기 시간 (초, 환경변수로 조정 가능)
+LATENCY_BUDGET = float(os.environ.get('DX_AI_LATENCY_BUDGET', 8))
+
+INSIGHT_MODES = ["하이브리드", "규칙 기반", "LLM"]
+SOURCE_LABELS = {'rule': '📐 규칙 기반', 'llm': '🤖 LLM', 'error': '⚠️ 오류'}
+
+
+class InsightRequest:
+    """분석 한 건의 입력 (규칙 기반용 데이터와 LLM용 프롬프트)
+
+    rules는 인자 없이 호출하면 이 분석의 규칙 기반 인사이트 카드 목록을
+    반환하는 함수이며, 없으면 df와 season으로 generate_ai_insights를 사용합니다.
+    """
+
+    def __init__(self, name, df, prompt, season='SS', rules=None):
+        self.name = name
+        self.df = df
+        self.prompt = prompt
+        self.season = season
+        self.rules = rules
+
+
+class InsightProvider(ABC):
+    """인사이트 제공자 기본 클래스"""
+
+    source = None
+
+    @abstractmethod
+    def stream(self, request):
+        """(출처, 텍스트, 교체 여부) 업데이트를 순서대로 반환합니다."""
+
+
+def format_insights_markdown(insights):
+    """규칙 기반 인사이트 카드 목록을 마크다운으로 변환합니다."""
+    if not insights:
+        return "현재 데이터로 생성할 수 있는 인사이트가 없습니다."
+    return "\n\n".join(
+        f"**{insight['title']}**\n\n{insight['content']}\n\n💡 **추천사항**: {insight['recommendation']}"
+        for insight in insights
+    )
+
+
+class RuleBasedInsightProvider(InsightProvider):
+    """데이터 규칙으로 즉시 인사이트를 생성하는 제공자"""
+
+    source = 'rule'
+
+    def generate(self, request):
+        if request.rules is not None:
+            return format_insights_markdown(request.rules())
+        current_col, previous_col = season_columns(request.season)
+        insights = generate_ai_insights(request.df, request.season, current_col, previous_col)
+        return format_insights_markdown(insights)
+
+    def stream(self, request):
+        yield self.source, self.generate(request), True
+
+
+class LLMInsightProvider(InsightProvider):
+    """재미나이 스트리밍 응답을 그대로 전달하는 제공자"""
+
+    source = 'llm'
+
+    def __init__(self, api_key, stream=iter_stream):
+        self.api_key = api_key
+        self._stream = stream
+
+    def iter_text(self, request):
+        """LLM 응답 조각을 반환합니다. 호출 실패는 GeminiError로 알립니다."""
+        return self._stream(self.api_key, request.prompt)
+
+    def stream(self, request):
+        try:
+            first = True
+            for chunk in self.iter_text(request):
+                yield self.source, chunk, first
+                first = False
+        except GeminiError as e:
+            yield self.source, str(e), True
+
+
+class HybridInsightProvider(InsightProvider):
+    """규칙 기반 결과를 먼저 표시하고 지연 예산 안에 도착한 LLM 결과로 교체하는 제공자"""
+
+    source = 'hybrid'
+
+    def __init__(self, rule_provider, llm_provider, latency_budget=LATENCY_BUDGET):
+        self.rule_provider = rule_provider
+        self.llm_provider = llm_provider
+        self.latency_budget = latency_budget
+
+    def _start_llm(self, request):
+        """LLM 스트림을 별도 스레드에서 실행하고 (조각이 쌓이는 큐, 중단 이벤트)를 반환합니다.
+
+        중단 이벤트가 설정되면 스레드는 다음 조각을 받는 즉시 스트림을 닫고 끝납니다.
+        """
+        chunks = queue.Queue()
+        stop = threading.Event()
+
+        def run():
+            stream = None
+            try:
+                stream = self.llm_provider.iter_text(request)
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    chunks.put(('chunk', chunk))
+                else:
+                    chunks.put(('done', None))
+            except Exception as e:
+                chunks.put(('error', e))
+            finally:
+                # 중간에 그만둔 제너레이터를 닫아 HTTP 스트림 연결도 닫음
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+
+        threading.Thread(target=run, name=f"insight-{request.name}", daemon=True).start()
+        return chunks, stop
+
+    def stream(self, request):
+        # LLM 호출을 먼저 시작한 뒤 규칙 기반 결과를 즉시 표시
+        deadline = time.monotonic() + self.latency_budget
+        chunks, stop = self._start_llm(request)
+        try:
+            rule_text = self.rule_provider.generate(request)
+            yield self.rule_provider.source, rule_text, True
+
+            try:
+                kind, value = chunks.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                yield self.rule_provider.source, (
+                    f"{rule_text}\n\n_⏱️ LLM 응답이 {self.latency_budget:.0f}초 안에 도착하지 않아 규칙 기반 결과를 표시합니다._"
+                ), True
+                return
+
+            first = True
+            while kind == 'chunk':
+                yield self.llm_provider.source, value, first
+                first = False
+                try:
+                    kind, value = chunks.get(timeout=self.latency_budget)
+                except queue.Empty:
+                    kind, value = 'error', f"{self.latency_budget:.0f}초 동안 다음 응답이 없습니다"
+
+            if kind == 'error':
+                if first:
+                    # LLM 응답을 받지 못했으면 규칙 기반 결과 유지
+                    yield self.rule_provider.source, f"{rule_text}\n\n_⚠️ LLM 분석 실패: {value}_", True
+                else:
+                    yield self.llm_provider.source, f"\n\n_⚠️ 응답이 중단되었습니다: {value}_", False
+        finally:
+            # 예산 초과/중단/소비자 종료 시 LLM 스레드가 스트림을 닫도록 알림
+            stop.set()
+
+
+def error_update(name, error):
+    """스트림 오류를 화면에 표시할 업데이트로 변환합니다. (merge_streams의 on_error)"""
+    return 'error', f"분석 중 오류가 발생했습니다: {error}", True
+
+
+def create_provider(mode, api_key=None, latency_budget=LATENCY_BUDGET):
+    """모드 이름에 맞는 인사이트 제공자를 생성합니다. API 키가 없으면 규칙 기반을 사용합니다."""
+    rule_provider = RuleBasedInsightProvider()
+    if not api_key or mode == "규칙 기반":
+        return rule_provider
+    llm_provider = LLMInsightProvider(api_key)
+    if mode == "LLM":
+        return llm_provider
+    return HybridInsightProvider(rule_provider, llm_provider, latency_budget)
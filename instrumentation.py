@@ -0,0 +1,132 @@
+"""페이지 섹션 계측
+
+대시보드의 각 섹션을 section(name) 컨텍스트로 감싸 실행 시간, 피크
+메모리(tracemalloc 추적 중일 때), 브라우저로 보내는 차트 페이로드 크기를
+수집합니다. 등록된 수집기(listener)가 없으면 시간 측정 외의 비용이 거의
+없으므로 운영 중에도 그대로 둘 수 있습니다.
+
+수집기는 on_section(name, seconds, peak_bytes)와
+on_payload(name, kind, nbytes) 메서드를 가진 객체입니다. 페이지 재실행
+전체를 page_run(page)으로 감싸면 on_rerun_start(page),
+on_rerun(page, seconds) 메서드가 있는 수집기에 재실행 시작과 시간이 함께
+전달됩니다.
+"""
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_listeners = []
+_listeners_lock = threading.Lock()
+_local = threading.local()
+
+
+def add_listener(listener):
+    """섹션 계측 수집기를 등록합니다."""
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener):
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def has_listeners():
+    return bool(_listeners)
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_section():
+    """현재 스레드에서 실행 중인 가장 안쪽 섹션 이름을 반환합니다."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def current_page():
+    """현재 스레드에서 재실행 중인 페이지 이름을 반환합니다."""
+    return getattr(_local, 'page', None)
+
+
+@contextmanager
+def page_run(page):
+    """페이지 재실행 전체를 계측합니다."""
+    _local.page = page
+    for listener in list(_listeners):
+        on_rerun_start = getattr(listener, 'on_rerun_start', None)
+        if on_rerun_start is not None:
+            on_rerun_start(page)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _local.page = None
+        for listener in list(_listeners):
+            on_rerun = getattr(listener, 'on_rerun', None)
+            if on_rerun is not None:
+                on_rerun(page, elapsed)
+
+
+@contextmanager
+def section(name):
+    """블록을 하나의 페이지 섹션으로 계측합니다."""
+    stack = _stack()
+    stack.append(name)
+    tracing = tracemalloc.is_tracing() and len(stack) == 1  # 피크는 최상위 섹션만 측정
+    if tracing:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base if tracing else None
+        stack.pop()
+        for listener in list(_listeners):
+            listener.on_section(name, elapsed, peak)
+
+
+def record_payload(kind, nbytes):
+    """현재 섹션에서 브라우저로 보내는 페이로드 크기를 기록합니다."""
+    if not _listeners:
+        return
+    name = current_section()
+    for listener in list(_listeners):
+        listener.on_payload(name, kind, nbytes)
+
+
+class SectionRecorder:
+    """섹션별 호출 수, 누적 시간, 최대 피크 메모리, 페이로드 크기를 모으는 수집기"""
+
+    def __init__(self):
+        self.sections = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name):
+        return self.sections.setdefault(name, {'calls': 0, 'seconds': 0.0, 'peak_bytes': 0, 'payload_bytes': 0})
+
+    def on_section(self, name, seconds, peak_bytes):
+        with self._lock:
+            entry = self._entry(name)
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            if peak_bytes is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'], peak_bytes)
+
+    def on_payload(self, name, kind, nbytes):
+        with self._lock:
+            self._entry(name)['payload_bytes'] += nbytes
+
+    def reset(self):
+        with self._lock:
+            self.sections = {}
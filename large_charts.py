@@ -0,0 +1,113 @@
+"""대용량 데이터 차트 렌더링 모드
+
+매장/브랜드 수가 많아지면 SVG 트레이스가 브라우저에서 매우 느려지므로,
+포인트 수에 따라 WebGL 트레이스 전환, 서버측 구간화(binning) 기반
+산점도 축소, 상위 N개 + 기타 막대 차트로 페이로드 크기를 제한합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics import FOCUS_BRAND
+
+# 대용량 모드 기준값 (환경변수로 조정 가능)
+WEBGL_POINT_THRESHOLD = int(os.environ.get('DX_WEBGL_POINT_THRESHOLD', 1000))
+SCATTER_MAX_POINTS = int(os.environ.get('DX_SCATTER_MAX_POINTS', 4000))
+BAR_TOP_N = int(os.environ.get('DX_BAR_TOP_N', 30))
+CHART_VIEWPORT_HEIGHT = 700
+
+
+def is_large(n_points, threshold=WEBGL_POINT_THRESHOLD):
+    """대용량 렌더링 모드 적용 여부를 반환합니다."""
+    return n_points > threshold
+
+
+def decimate_scatter(df, x, y, max_points=SCATTER_MAX_POINTS):
+    """산점도 데이터를 2차원 구간으로 묶어 포인트 수를 제한합니다.
+
+    각 구간은 평균 좌표 한 점으로 대체되며 '포인트 수' 컬럼에 구간에
+    포함된 원래 포인트 개수가 기록됩니다. 포인트 수가 한도 이하이면
+    원본을 그대로 반환합니다.
+    """
+    if len(df) <= max_points:
+        return df, False
+
+    bins = max(int(np.sqrt(max_points)), 1)
+    x_values = df[x].to_numpy(dtype=float)
+    y_values = df[y].to_numpy(dtype=float)
+
+    x_edges = np.linspace(x_values.min(), x_values.max(), bins + 1)
+    y_edges = np.linspace(y_values.min(), y_values.max(), bins + 1)
+    x_bin = np.clip(np.searchsorted(x_edges, x_values, side='right') - 1, 0, bins - 1)
+    y_bin = np.clip(np.searchsorted(y_edges, y_values, side='right') - 1, 0, bins - 1)
+    cell = x_bin * bins + y_bin
+
+    counts = np.bincount(cell, minlength=bins * bins)
+    x_sum = np.bincount(cell, weights=x_values, minlength=bins * bins)
+    y_sum = np.bincount(cell, weights=y_values, minlength=bins * bins)
+    occupied = counts > 0
+
+    binned = pd.DataFrame({
+        x: x_sum[occupied] / counts[occupied],
+        y: y_sum[occupied] / counts[occupied],
+        '포인트 수': counts[occupied],
+    })
+    return binned, True
+
+
+def build_scatter(df, x, y, title, labels, hover_name=None):
+    """포인트 수에 따라 SVG/WebGL/구간화 산점도를 자동 선택하여 생성합니다."""
+    import plotly.express as px
+
+    plot_df, decimated = decimate_scatter(df, x, y)
+    if decimated:
+        fig = px.scatter(
+            plot_df,
+            x=x,
+            y=y,
+            size='포인트 수',
+            color='포인트 수',
+            color_continuous_scale='Blues',
+            title=f"{title} (구간 집계: {len(df):,}개 → {len(plot_df):,}개)",
+            labels=labels,
+            render_mode='webgl'
+        )
+        return fig
+
+    render_mode = 'webgl' if is_large(len(plot_df)) else 'svg'
+    return px.scatter(
+        plot_df,
+        x=x,
+        y=y,
+        title=title,
+        labels=labels,
+        hover_name=hover_name,
+        render_mode=render_mode
+    )
+
+
+def top_n_with_others(current, previous, top_n=BAR_TOP_N, focus=FOCUS_BRAND, others_label='기타'):
+    """상위 N개 항목과 나머지 합계('기타')로 축약한 시리즈 쌍을 반환합니다.
+
+    current는 내림차순 정렬되어 있어야 하며, focus 항목은 순위와 무관하게
+    항상 포함됩니다. 항목 수가 N 이하이면 원본을 그대로 반환합니다.
+    """
+    if len(current) <= top_n:
+        return current, previous
+
+    keep = current.index[:top_n]
+    if focus in current.index and focus not in keep:
+        keep = keep[:-1].append(pd.Index([focus]))
+
+    rest = current.index.difference(keep, sort=False)
+    label = f"{others_label} ({len(rest)}개)"
+
+    reduced_current = pd.concat([current.loc[keep], pd.Series({label: current.loc[rest].sum()})])
+    reduced_previous = pd.concat([
+        previous.reindex(keep, fill_value=0),
+        pd.Series({label: previous.reindex(rest, fill_value=0).sum()})
+    ])
+    reduced_current.name = current.name
+    reduced_previous.name = previous.name
+    return reduced_current, reduced_previous
@@ -0,0 +1,265 @@
+"""세션별 메모리 진단 (tracemalloc)
+
+DX_MEMORY_DIAGNOSTICS=1로 실행하면 tracemalloc을 켜고 재실행마다 다음을
+기록합니다. 추적 비용이 크므로 운영 중에는 끄고 문제를 재현할 때만 켭니다.
+
+- 섹션별 할당: 최상위 섹션마다 피크 메모리와 섹션이 끝난 뒤에도 남은(retained)
+  메모리 증가량
+- 세션별 누적: 재실행 전후 추적 메모리 차이를 세션마다 쌓고, 최근
+  DX_MEMORY_WINDOW회 재실행 동안 계속 늘면서 합계가 DX_MEMORY_GROWTH_MB를
+  넘는 세션을 누수 의심으로 표시
+- 증가 지점: 워밍업(DX_MEMORY_WARMUP회) 재실행 직후의 기준 스냅샷과
+  보고서를 만드는 시점의 스냅샷을 비교하여 가장 많이 늘어난 소스 위치
+  (비교는 수십만 개의 할당을 훑으므로 보고서를 요청할 때만 실행)
+
+추적 메모리는 프로세스 전체 값이므로 다른 재실행과 겹친 재실행은 서로의
+할당이 섞입니다. 이런 재실행은 세션 누적과 누수 판정에서 빼고(JSONL에는
+attributed: false로 기록) 섹션별 할당에만 더합니다. 동시 접속이 많으면
+판정에 쓰이는 재실행이 줄어들므로 정확한 귀속이 필요하면 세션 하나로
+재현합니다.
+
+세션 기록은 DX_MEMORY_SESSION_TTL초 동안 재실행이 없으면 지우고, 최대
+DX_MEMORY_SESSIONS개까지 최근에 재실행한 세션만 남깁니다. 누수 의심 세션을
+표시할 때는 증가 지점 상위 목록을 경고 로그와 JSONL 기록에 함께 남깁니다.
+
+DX_MEMORY_REPORT에 경로를 지정하면 재실행마다 JSONL 한 줄을 추가합니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+from instrumentation import add_listener, current_section
+
+MEMORY_DIAGNOSTICS = os.environ.get('DX_MEMORY_DIAGNOSTICS', '') not in ('', '0')
+MEMORY_FRAMES = int(os.environ.get('DX_MEMORY_FRAMES', 1))
+MEMORY_WARMUP = int(os.environ.get('DX_MEMORY_WARMUP', 3))
+MEMORY_WINDOW = int(os.environ.get('DX_MEMORY_WINDOW', 5))
+MEMORY_GROWTH_MB = float(os.environ.get('DX_MEMORY_GROWTH_MB', 1))
+MEMORY_REPORT = os.environ.get('DX_MEMORY_REPORT')
+MEMORY_SESSION_TTL = float(os.environ.get('DX_MEMORY_SESSION_TTL', 1800))
+MEMORY_SESSIONS = int(os.environ.get('DX_MEMORY_SESSIONS', 1000))
+TOP_SITES = 10
+
+logger = logging.getLogger(__name__)
+
+# 진단 자체와 임포트 과정의 할당은 증가 지점에서 제외
+# (Snapshot.filter_traces는 할당마다 파일명을 비교하여 느리므로 비교 결과에서 거름)
+_IGNORED_FILES = {
+    tracemalloc.__file__,
+    __file__,
+    '<frozen importlib._bootstrap>',
+    '<frozen importlib._bootstrap_external>',
+    '<unknown>',
+}
+
+
+def _session_id():
+    """현재 Streamlit 세션 ID를 반환합니다. (Streamlit 밖에서는 스레드 이름)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else threading.current_thread().name
+
+
+class MemoryDiagnostics:
+    """재실행/섹션 단위 메모리 사용량을 모으는 instrumentation 수집기"""
+
+    def __init__(self, window=MEMORY_WINDOW, growth_mb=MEMORY_GROWTH_MB, warmup=MEMORY_WARMUP, report_path=MEMORY_REPORT,
+                 session_ttl=MEMORY_SESSION_TTL, max_sessions=MEMORY_SESSIONS):
+        self.window = window
+        self.growth_bytes = growth_mb * 1024 * 1024
+        self.warmup = warmup
+        self.report_path = report_path
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.sections = {}      # 섹션 → {calls, peak_bytes, retained_bytes}
+        self.sessions = OrderedDict()  # 세션 → {page, reruns, retained_bytes, recent, flagged, last_seen} (오래된 순)
+        self.reruns = 0
+        self.overlapped_reruns = 0
+        self._in_flight = 0
+        self._starts = 0
+        self._baseline = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _mark(self):
+        self._local.mark = tracemalloc.get_traced_memory()[0]
+
+    def on_rerun_start(self, page):
+        with self._lock:
+            self._local.overlapped = self._in_flight > 0
+            self._in_flight += 1
+            self._starts += 1
+            self._local.start_seq = self._starts
+        self._local.start = tracemalloc.get_traced_memory()[0]
+        self._local.sections = {}
+        self._mark()
+
+    def on_section(self, name, seconds, peak_bytes):
+        if current_section() is not None or not hasattr(self._local, 'mark'):
+            return  # 중첩 섹션은 바깥 섹션에 포함
+        retained = tracemalloc.get_traced_memory()[0] - self._local.mark
+        self._mark()
+        with self._lock:
+            entry = self.sections.setdefault(name, {'calls': 0, 'peak_bytes': 0, 'retained_bytes': 0})
+            entry['calls'] += 1
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak_bytes or 0)
+            entry['retained_bytes'] += retained
+        if hasattr(self._local, 'sections'):
+            self._local.sections[name] = {'peak_bytes': peak_bytes or 0, 'retained_bytes': retained}
+
+    def on_payload(self, name, kind, nbytes):
+        pass
+
+    def on_rerun(self, page, seconds):
+        if not hasattr(self._local, 'start'):
+            return
+        delta = tracemalloc.get_traced_memory()[0] - self._local.start
+        session_id = _session_id()
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            # 시작할 때 다른 재실행이 돌고 있었거나 도중에 다른 재실행이 시작되었으면 귀속하지 않음
+            attributed = not self._local.overlapped and self._starts == self._local.start_seq
+            self.reruns += 1
+            self.overlapped_reruns += not attributed
+            take_baseline = self.reruns == max(self.warmup, 1)
+        if take_baseline:
+            self._baseline = tracemalloc.take_snapshot()
+        with self._lock:
+            session = self.sessions.pop(session_id, None) or {
+                'page': page, 'reruns': 0, 'retained_bytes': 0,
+                'recent': deque(maxlen=self.window), 'flagged': False,
+            }
+            self.sessions[session_id] = session
+            session['last_seen'] = now
+            self._expire_sessions(now)
+            session['reruns'] += 1
+            if attributed:
+                session['retained_bytes'] += delta
+                session['recent'].append(delta)
+            newly_flagged = not session['flagged'] and self._is_leaking(session)
+            session['flagged'] = session['flagged'] or newly_flagged
+        growth = self.top_growth() if newly_flagged else None
+        if newly_flagged:
+            logger.warning(
+                "세션 %s(%s) 메모리가 최근 %d회 재실행 동안 계속 증가했습니다: +%.1fMB\n증가 지점 (기준 스냅샷 대비)\n%s",
+                session_id, page, self.window, sum(session['recent']) / 1024 / 1024, _format_growth(growth)
+            )
+        if self.report_path:
+            record = {
+                'session': session_id,
+                'page': page,
+                'seconds': seconds,
+                'retained_bytes': delta,
+                'attributed': attributed,
+                'session_retained_bytes': session['retained_bytes'],
+                'flagged': session['flagged'],
+                'sections': getattr(self._local, 'sections', {}),
+            }
+            if growth is not None:
+                record['top_growth'] = [
+                    {'site': site, 'size_diff': size_diff, 'count_diff': count_diff}
+                    for site, size_diff, count_diff in growth
+                ]
+            self._append_report(record)
+
+    def _expire_sessions(self, now):
+        """오래 재실행이 없는 세션과 한도를 넘는 오래된 세션 기록을 지웁니다. (잠금을 잡은 상태에서 호출)"""
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            expired = now - session['last_seen'] > self.session_ttl
+            if not expired and len(self.sessions) <= self.max_sessions:
+                break
+            self.sessions.popitem(last=False)
+
+    def _is_leaking(self, session):
+        recent = session['recent']
+        return (
+            len(recent) == self.window
+            and all(delta > 0 for delta in recent)
+            and sum(recent) >= self.growth_bytes
+        )
+
+    def _append_report(self, record):
+        with self._lock, open(self.report_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def top_growth(self, limit=TOP_SITES, key_type='lineno'):
+        """기준 스냅샷 대비 메모리가 가장 많이 늘어난 위치 [(위치, 증가 바이트, 증가 블록 수)]를 반환합니다."""
+        if self._baseline is None:
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline, key_type)
+        growth = []
+        for stat in stats:
+            if stat.size_diff <= 0 or stat.traceback[0].filename in _IGNORED_FILES:
+                continue
+            growth.append((str(stat.traceback[0]), stat.size_diff, stat.count_diff))
+            if len(growth) == limit:
+                break
+        return growth
+
+    def flagged_sessions(self):
+        with self._lock:
+            return [session_id for session_id, session in self.sessions.items() if session['flagged']]
+
+    def format_report(self, limit=TOP_SITES):
+        """섹션별 할당, 세션별 누적, 증가 지점을 사람이 읽을 수 있는 문자열로 만듭니다."""
+        lines = [
+            f"재실행 {self.reruns}회 (워밍업 {self.warmup}회 이후 기준, 다른 재실행과 겹쳐 세션에 귀속하지 않음 {self.overlapped_reruns}회)",
+            "", "섹션별 메모리",
+        ]
+        for name, entry in sorted(self.sections.items(), key=lambda item: -item[1]['retained_bytes']):
+            lines.append(
+                f"  {name:<24} 피크 {entry['peak_bytes'] / 1024 / 1024:8.2f}MB  "
+                f"누적 잔존 {entry['retained_bytes'] / 1024 / 1024:+8.2f}MB ({entry['calls']}회)"
+            )
+        lines += ["", "세션별 누적 잔존 메모리"]
+        for session_id, session in sorted(self.sessions.items(), key=lambda item: -item[1]['retained_bytes']):
+            mark = "  ⚠️ 누수 의심" if session['flagged'] else ""
+            lines.append(
+                f"  {session_id[:12]:<12} {session['page']:<24} {session['reruns']:>4}회  "
+                f"{session['retained_bytes'] / 1024 / 1024:+8.2f}MB{mark}"
+            )
+        lines += ["", "증가 지점 (기준 스냅샷 대비)", _format_growth(self.top_growth(limit))]
+        return "\n".join(lines)
+
+
+def _format_growth(growth):
+    """top_growth 결과를 한 줄에 한 위치씩 문자열로 만듭니다."""
+    if not growth:
+        return "  (비교할 스냅샷이 부족합니다)"
+    return "\n".join(
+        f"  {size_diff / 1024:+10.1f}KB {count_diff:+7d}블록  {site}" for site, size_diff, count_diff in growth
+    )
+
+
+_diagnostics = None
+_enable_lock = threading.Lock()
+
+
+def enable(frames=MEMORY_FRAMES, **options):
+    """tracemalloc을 켜고 메모리 진단 수집기를 등록합니다. (여러 번 호출해도 한 번만 등록)"""
+    global _diagnostics
+    with _enable_lock:
+        if _diagnostics is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            _diagnostics = MemoryDiagnostics(**options)
+            add_listener(_diagnostics)
+    return _diagnostics
+
+
+def enable_from_env():
+    """DX_MEMORY_DIAGNOSTICS가 설정되어 있으면 메모리 진단을 켭니다."""
+    return enable() if MEMORY_DIAGNOSTICS else None
+
+
+def get_diagnostics():
+    return _diagnostics
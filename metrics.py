@@ -0,0 +1,303 @@
+"""운영 지표 수집 및 내보내기
+
+카운터와 히스토그램을 프로세스 전역 레지스트리에 모으고 Prometheus
+텍스트 형식으로 내보냅니다. 페이지 재실행/섹션 시간은
+instrumentation 수집기로, 캐시 적중률은 등록된 캐시의 stats()로,
+재미나이 호출 지연은 gemini_client에서 직접 기록합니다.
+
+내보내기는 환경변수로 켭니다. (설정하지 않으면 기록만 하고 내보내지 않음)
+    DX_METRICS_PORT      /metrics를 제공할 로컬 HTTP 포트 (프로세스마다 다른 포트, 이미
+                         사용 중이면 경고만 남기고 HTTP 내보내기 없이 계속 실행)
+    DX_METRICS_FILE      Prometheus 텍스트를 주기적으로 기록할 파일 (node_exporter textfile 등)
+    DX_METRICS_JSONL     지표 스냅샷을 한 줄씩 추가할 JSONL 파일
+    DX_METRICS_INTERVAL  파일/JSONL 기록 주기 (초, 기본 60)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import instrumentation
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRICS_PORT = os.environ.get('DX_METRICS_PORT')
+METRICS_FILE = os.environ.get('DX_METRICS_FILE')
+METRICS_JSONL = os.environ.get('DX_METRICS_JSONL')
+METRICS_INTERVAL = float(os.environ.get('DX_METRICS_INTERVAL', 60))
+
+logger = logging.getLogger(__name__)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in key) + '}'
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    type = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    type = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][i] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, entry in self._values.items():
+                for bound, count in zip(self.buckets, entry['counts']):
+                    samples.append((f"{self.name}_bucket", key + (('le', repr(bound)),), count))
+                samples.append((f"{self.name}_bucket", key + (('le', '+Inf'),), entry['count']))
+                samples.append((f"{self.name}_sum", key, entry['sum']))
+                samples.append((f"{self.name}_count", key, entry['count']))
+        return samples
+
+
+class CallbackGauge:
+    """수집 시점에 함수를 호출해 값을 읽는 지표
+
+    collect()는 [(지표 이름, 라벨 딕셔너리, 값)] 목록을 반환해야 합니다.
+    """
+
+    type = 'gauge'
+
+    def __init__(self, name, help_text, collect, metric_type='gauge'):
+        self.name = name
+        self.help = help_text
+        self.type = metric_type
+        self._collect = collect
+
+    def samples(self):
+        return [(name, _label_key(labels), value) for name, labels, value in self._collect()]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식(0.0.4) 문자열을 반환합니다."""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """JSON으로 직렬화할 수 있는 지표 스냅샷을 반환합니다."""
+        return {
+            'timestamp': time.time(),
+            'metrics': {
+                metric.name: [
+                    {'name': name, 'labels': dict(key), 'value': value}
+                    for name, key, value in metric.samples()
+                ]
+                for metric in self.metrics()
+            },
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name, help_text):
+    return REGISTRY.register(Counter(name, help_text))
+
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, help_text, buckets))
+
+
+RERUNS = counter('dx_reruns_total', "페이지 재실행 횟수")
+RERUN_SECONDS = histogram('dx_rerun_seconds', "페이지 재실행 시간 (초)")
+SECTION_SECONDS = histogram('dx_section_seconds', "페이지 섹션 실행 시간 (초)")
+GEMINI_REQUESTS = counter('dx_gemini_requests_total', "재미나이 API 호출 수 (결과별)")
+GEMINI_SECONDS = histogram('dx_gemini_request_seconds', "재미나이 API 호출 완료까지 걸린 시간 (초)")
+CACHE_COMPUTE_SECONDS = histogram('dx_cache_compute_seconds', "캐시 미스 시 값을 계산하는 데 걸린 시간 (초)")
+GEMINI_FIRST_CHUNK_SECONDS = histogram('dx_gemini_first_chunk_seconds', "재미나이 스트리밍 첫 응답까지 걸린 시간 (초)")
+
+_enabled = False
+_enable_lock = threading.Lock()
+
+# 캐시 이름 → stats() 함수 (hits, misses, entries, bytes 키를 가진 딕셔너리 반환)
+_caches = {}
+
+
+def register_cache(name, stats):
+    """캐시 적중률 지표를 내보낼 캐시를 등록합니다."""
+    _caches[name] = stats
+
+
+def _cache_collector(key, metric_name):
+    def collect():
+        samples = []
+        for name, stats in list(_caches.items()):
+            values = stats()
+            if key in values:
+                samples.append((metric_name, {'cache': name}, values[key]))
+        return samples
+    return collect
+
+
+def _collect_process():
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return []
+    return [('dx_process_resident_memory_bytes', {}, rss)]
+
+
+for _key, _type, _help in [
+    ('hits', 'counter', "캐시 적중 누적 수"),
+    ('misses', 'counter', "캐시 미스 누적 수"),
+    ('entries', 'gauge', "캐시 항목 수"),
+    ('bytes', 'gauge', "캐시 크기 (바이트)"),
+]:
+    _name = f"dx_cache_{_key}_total" if _type == 'counter' else f"dx_cache_{_key}"
+    REGISTRY.register(CallbackGauge(_name, _help, _cache_collector(_key, _name), metric_type=_type))
+REGISTRY.register(CallbackGauge('dx_process_resident_memory_bytes', "프로세스 RSS (바이트)", _collect_process))
+
+
+class _SectionMetrics:
+    """instrumentation 섹션/재실행 기록을 지표로 옮기는 수집기"""
+
+    def on_section(self, name, seconds, peak_bytes):
+        SECTION_SECONDS.observe(seconds, page=instrumentation.current_page() or '', section=name)
+
+    def on_payload(self, name, kind, nbytes):
+        pass
+
+    def on_rerun(self, page, seconds):
+        RERUNS.inc(page=page)
+        RERUN_SECONDS.observe(seconds, page=page)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_prometheus_file(path):
+    """Prometheus 텍스트를 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(REGISTRY.render_prometheus())
+    os.replace(tmp_path, path)
+
+
+def append_snapshot(path):
+    """지표 스냅샷 한 줄을 JSONL 파일에 추가합니다."""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(REGISTRY.snapshot(), ensure_ascii=False) + "\n")
+
+
+def _export_loop(interval, metrics_file, jsonl_path):
+    while True:
+        time.sleep(interval)
+        try:
+            if metrics_file:
+                write_prometheus_file(metrics_file)
+            if jsonl_path:
+                append_snapshot(jsonl_path)
+        except OSError:
+            pass
+
+
+def enable_from_env():
+    """환경변수 설정에 따라 지표 수집과 내보내기를 시작합니다. (여러 번 호출해도 한 번만 실행)"""
+    global _enabled
+    if not (METRICS_PORT or METRICS_FILE or METRICS_JSONL):
+        return False
+    with _enable_lock:
+        if _enabled:
+            return True
+        _enabled = True
+
+    instrumentation.add_listener(_SectionMetrics())
+    if METRICS_PORT:
+        try:
+            server = ThreadingHTTPServer(('127.0.0.1', int(METRICS_PORT)), _MetricsHandler)
+        except OSError as e:  # 같은 호스트의 다른 프로세스가 포트를 쓰는 경우
+            logger.warning("지표 HTTP 포트 %s를 열 수 없어 /metrics를 제공하지 않습니다: %s", METRICS_PORT, e)
+        else:
+            threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    if METRICS_FILE or METRICS_JSONL:
+        threading.Thread(
+            target=_export_loop,
+            args=(METRICS_INTERVAL, METRICS_FILE, METRICS_JSONL),
+            name='metrics-export',
+            daemon=True
+        ).start()
+    return True
@@ -0,0 +1,194 @@
+"""서버측 페이지네이션 테이블
+
+정렬 순서와 검색용 텍스트를 인덱스로 미리 계산해 두고, 현재 페이지에
+해당하는 행과 선택된 컬럼만 잘라 브라우저로 전송합니다. 전송량과 렌더링
+비용이 전체 행 수와 무관하게 페이지 크기에 비례하도록 합니다.
+
+pyarrow가 있으면 인덱스를 만들 때 Arrow 테이블로 한 번 변환해 두고, 페이지는
+Arrow에서 컬럼 선택(select)과 행 추출(take)로 잘라 st.dataframe에 그대로
+넘깁니다. 페이지마다 pandas 부분 복사본을 만들고 다시 Arrow로 직렬화하는
+과정을 거치지 않습니다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 pandas 페이지를 전송
+    pa = None
+
+PAGE_SIZE_OPTIONS = [50, 100, 200]
+SEARCH_CACHE_SIZE = 32
+
+
+class TableIndex:
+    """정렬/검색 인덱스를 가진 서버측 테이블"""
+
+    def __init__(self, df, search_columns=None):
+        self.df = df.reset_index(drop=True)
+        self.table = pa.Table.from_pandas(self.df, preserve_index=False) if pa is not None else None
+        if search_columns is None:
+            search_columns = [col for col in self.df.columns if not pd.api.types.is_numeric_dtype(self.df[col])]
+        self.search_columns = list(search_columns)
+        self._sort_orders = {}
+        self._search_text = None
+        self._search_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def sort_order(self, column, ascending=True):
+        """컬럼 기준 정렬 위치 배열을 반환합니다. (컬럼/방향별 1회 계산)
+
+        두 방향 모두 값이 같은 행은 원래 순서를 유지합니다.
+        """
+        order = self._sort_orders.get((column, ascending))
+        if order is None:
+            values = self.df[column]
+            if pd.api.types.is_numeric_dtype(values):
+                values = values.to_numpy()
+            else:
+                values = values.astype(str).to_numpy()
+            order = np.argsort(values, kind='stable')
+            if not ascending:
+                # 같은 값끼리 같은 순위를 매긴 뒤 순위 역순으로 안정 정렬 (결측값은 오름차순처럼 맨 뒤)
+                ordered = values[order]
+                missing = pd.isna(ordered)
+                new_group = np.ones(len(ordered), dtype=bool)
+                new_group[1:] = (ordered[1:] != ordered[:-1]) & ~(missing[1:] & missing[:-1])
+                rank = np.empty(len(ordered), dtype=np.int64)
+                rank[order] = np.cumsum(new_group)
+                rank[order[missing]] = 0
+                order = np.argsort(-rank, kind='stable')
+            with self._lock:
+                self._sort_orders[(column, ascending)] = order
+        return order
+
+    def search_mask(self, query):
+        """검색어가 포함된 행의 불리언 마스크를 반환합니다."""
+        query = query.strip().lower()
+        with self._lock:
+            mask = self._search_cache.get(query)
+            if mask is not None:
+                self._search_cache.move_to_end(query)
+                return mask
+
+        if self._search_text is None:
+            if self.search_columns:
+                text = self.df[self.search_columns[0]].astype(str)
+                for col in self.search_columns[1:]:
+                    text = text + '\x1f' + self.df[col].astype(str)
+                self._search_text = text.str.lower()
+            else:
+                self._search_text = pd.Series([''] * len(self.df))
+
+        mask = self._search_text.str.contains(query, regex=False).to_numpy()
+        with self._lock:
+            self._search_cache[query] = mask
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return mask
+
+    def positions(self, sort_by=None, ascending=True, query=''):
+        """정렬/검색 조건을 적용한 행 위치 배열을 반환합니다."""
+        if sort_by:
+            positions = self.sort_order(sort_by, ascending)
+        else:
+            positions = np.arange(len(self.df))
+
+        if query and query.strip():
+            mask = self.search_mask(query)
+            positions = positions[mask[positions]]
+        return positions
+
+    def page(self, page, page_size, columns=None, sort_by=None, ascending=True, query=''):
+        """현재 페이지의 행과 선택된 컬럼만 반환합니다.
+
+        Returns:
+            (페이지 테이블, 조건에 맞는 전체 행 수)
+        """
+        positions = self.positions(sort_by, ascending, query)
+        start = max(page - 1, 0) * page_size
+        return self.take(positions[start:start + page_size], columns), len(positions)
+
+    def take(self, positions, columns=None):
+        """지정한 위치의 행을 선택된 컬럼만으로 반환합니다. (pyarrow가 있으면 Arrow 테이블)"""
+        if self.table is not None:
+            table = self.table if columns is None else self.table.select(list(columns))
+            return table.take(positions)
+        if columns is not None:
+            return self.df.iloc[positions, self.df.columns.get_indexer(list(columns))]
+        return self.df.iloc[positions]
+
+
+def _page_controls(key, columns):
+    """검색/정렬/페이지 크기 입력 위젯을 표시하고 선택값을 반환합니다."""
+    import streamlit as st
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("검색", key=f"{key}_query", placeholder="검색어를 입력하세요")
+    with col2:
+        sort_options = ['(기본 순서)'] + list(columns)
+        sort_by = st.selectbox("정렬 기준", sort_options, key=f"{key}_sort")
+    with col3:
+        ascending = st.radio("정렬", ["내림차순", "오름차순"], key=f"{key}_asc") == "오름차순"
+    with col4:
+        page_size = st.selectbox("페이지 크기", PAGE_SIZE_OPTIONS, key=f"{key}_size")
+
+    if sort_by == '(기본 순서)':
+        sort_by = None
+    return query, sort_by, ascending, page_size
+
+
+def _page_number(total, page_size, key):
+    """페이지 번호 입력 위젯을 표시하고 현재 페이지를 반환합니다."""
+    import streamlit as st
+
+    page_count = max((total + page_size - 1) // page_size, 1)
+    page = st.number_input(
+        f"페이지 (총 {page_count}페이지)",
+        min_value=1,
+        max_value=page_count,
+        value=1,
+        step=1,
+        key=f"{key}_page"
+    )
+    return min(int(page), page_count)
+
+
+def render_paged_table(index, key, columns=None, height=400, **dataframe_kwargs):
+    """TableIndex의 현재 페이지만 st.dataframe으로 표시합니다."""
+    import streamlit as st
+
+    columns = list(columns) if columns is not None else list(index.df.columns)
+    query, sort_by, ascending, page_size = _page_controls(key, columns)
+
+    positions = index.positions(sort_by, ascending, query)
+    total = len(positions)
+    page = _page_number(total, page_size, key)
+    start = (page - 1) * page_size
+    page_table = index.take(positions[start:start + page_size], columns)
+
+    st.caption(f"총 {total:,}건 중 {start + 1 if total else 0:,}–{start + len(page_table):,}건 표시")
+    st.dataframe(page_table, height=height, **dataframe_kwargs)
+    return page_table
+
+
+def render_paged_html_table(df, key, page_size=PAGE_SIZE_OPTIONS[0]):
+    """HTML 서식이 포함된 테이블을 현재 페이지만 HTML로 변환하여 표시합니다."""
+    import streamlit as st
+
+    total = len(df)
+    if total > page_size:
+        page = _page_number(total, page_size, key)
+        start = (page - 1) * page_size
+        page_df = df.iloc[start:start + page_size]
+        st.caption(f"총 {total:,}건 중 {start + 1:,}–{start + len(page_df):,}건 표시")
+    else:
+        page_df = df
+    st.markdown(page_df.to_html(escape=False, index=False), unsafe_allow_html=True)
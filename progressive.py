@@ -0,0 +1,104 @@
+"""점진적 렌더링 (무거운 섹션 백그라운드 계산)
+
+페이지가 모든 섹션의 제목과 '계산 중' 자리를 먼저 그리고, 무거운 섹션의
+집계/차트 생성은 공유 스레드 풀(DX_RENDER_WORKERS, 기본 4)에서 동시에
+실행한 뒤 끝나는 순서대로 자리를 채웁니다. 가장 느린 섹션이 끝나기 전에도
+KPI와 먼저 끝난 섹션이 화면에 나타납니다.
+
+Streamlit 요소는 스크립트 스레드에서만 그리고, 워커는 analytics 집계와
+피겨 캐시 채우기처럼 Streamlit을 호출하지 않는 계산만 합니다. 섹션
+계측(instrumentation.section)은 스크립트 스레드에서 그리는 구간(결과를
+기다리는 시간 포함)을 잽니다.
+
+한 섹션의 계산이나 그리기가 실패하면 그 섹션 자리에만 오류를 표시하고
+나머지 섹션은 계속 채웁니다.
+
+DX_PROGRESSIVE_RENDER=0이면 워커 없이 모든 섹션을 페이지 순서대로 계산하고
+그립니다.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import streamlit as st
+
+from instrumentation import section
+
+PROGRESSIVE_RENDER = os.environ.get('DX_PROGRESSIVE_RENDER', '1') not in ('', '0')
+RENDER_WORKERS = int(os.environ.get('DX_RENDER_WORKERS', 4))
+SKELETON_TEXT = "⏳ 계산 중..."
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """섹션 계산용 공유 스레드 풀을 반환합니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='render')
+        return _executor
+
+
+def section_slot():
+    """섹션 내용이 들어갈 자리를 만들고 계산 중 표시를 보여 줍니다."""
+    slot = st.empty()
+    slot.caption(SKELETON_TEXT)
+    return slot
+
+
+class SectionTask:
+    """자리 하나를 채우는 섹션 (compute()의 결과를 render(결과)로 그림)"""
+
+    def __init__(self, name, slot, compute, render, background=True):
+        self.name = name
+        self.slot = slot
+        self.compute = compute
+        self.render = render
+        self.background = background
+
+    def run(self):
+        """스크립트 스레드에서 계산하고 그립니다."""
+        with section(self.name):
+            self._draw(self.compute)
+
+    def fill(self, future):
+        """백그라운드에서 계산한 결과(future)로 자리를 채웁니다."""
+        with section(self.name):
+            self._draw(future.result)
+
+    def _draw(self, get_result):
+        # 실패하면 이 섹션 자리에만 오류를 표시 (다른 섹션은 계속 그림)
+        try:
+            result = get_result()
+            with self.slot.container():
+                self.render(result)
+        except Exception as e:
+            logger.exception("섹션 %s 실패", self.name)
+            self.slot.error(f"이 섹션을 표시하지 못했습니다: {e}")
+
+
+def run_sections(tasks, progressive=PROGRESSIVE_RENDER):
+    """섹션들을 계산하여 각 자리를 채웁니다.
+
+    점진적 렌더링이면 background가 아닌 섹션(KPI 등 가벼운 섹션)을 스크립트
+    스레드에서 먼저 그린 뒤, background 섹션을 스레드 풀에서 함께 계산하여
+    끝나는 순서대로 채웁니다. (pandas 집계는 대부분 GIL을 잡으므로 워커를
+    먼저 시작하면 KPI가 늦어짐) 아니면 모든 섹션을 순서대로 계산하고 그립니다.
+    """
+    if not progressive:
+        for task in tasks:
+            task.run()
+        return
+
+    for task in tasks:
+        if not task.background:
+            task.run()
+    executor = get_executor()
+    futures = {executor.submit(task.compute): task for task in tasks if task.background}
+    for future in as_completed(futures):
+        futures[future].fill(future)
@@ -0,0 +1,137 @@
+"""토큰 예산 기반 AI 분석 프롬프트 생성
+
+DataFrame.to_string() 대신 구분자 기반의 압축 표 형식으로 집계 데이터를
+직렬화하고, 상위 N개 + 기타 요약으로 행 수를 제한합니다. 전송 전에 토큰
+수를 추정하여 설정된 예산 안에 들어가는 가장 정보량이 많은 표현을
+선택하므로, 데이터가 커져도 프롬프트 크기와 응답 지연이 일정하게
+유지됩니다.
+"""
+import math
+import os
+
+import pandas as pd
+
+from analytics import FOCUS_BRAND
+
+# 프롬프트 토큰 예산 (환경변수로 조정 가능)
+PROMPT_TOKEN_BUDGET = int(os.environ.get('DX_PROMPT_TOKEN_BUDGET', 1200))
+TOP_N_CANDIDATES = [20, 10, 5, 3]
+AMOUNT_UNIT = 100000000  # 억원
+SEPARATOR = '|'
+
+
+def estimate_tokens(text):
+    """문자 종류별 평균 비율로 토큰 수를 추정합니다.
+
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당
+    1토큰으로 계산하여 실제보다 약간 크게 추정합니다.
+    """
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_count / 4) + (len(text) - ascii_count)
+
+
+def _format_cell(value, unit):
+    if isinstance(value, str):
+        return value.replace(SEPARATOR, '/').replace('\n', ' ')
+    if pd.isna(value):
+        return '-'
+    if unit:
+        scaled = value / unit
+        if value and abs(scaled) < 0.05:  # 0.1억 미만은 0.0 대신 크기만 표시
+            return '<0.1' if value > 0 else '>-0.1'
+        return f"{scaled:.1f}"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def serialize_table(df, amount_columns=(), unit=AMOUNT_UNIT):
+    """데이터프레임을 '|' 구분 압축 표 형식 문자열로 변환합니다.
+
+    amount_columns의 값은 항상 억원 단위 소수 1자리로 변환되며 헤더에 단위가
+    표시됩니다. (0.1억 미만은 '<0.1')
+    """
+    amount_columns = set(amount_columns)
+    header = [f"{col}(억)" if col in amount_columns else str(col) for col in df.columns]
+    lines = [SEPARATOR.join(header)]
+    columns = [
+        (df[col].tolist(), unit if col in amount_columns else None)
+        for col in df.columns
+    ]
+    for i in range(len(df)):
+        lines.append(SEPARATOR.join(_format_cell(values[i], col_unit) for values, col_unit in columns))
+    return "\n".join(lines)
+
+
+def top_n_rows(df, label_column, sort_column, top_n, keep=(FOCUS_BRAND,), sum_columns=None, others_label='기타'):
+    """sort_column 기준 상위 N개 행과 나머지 합계('기타') 행으로 축약합니다.
+
+    keep에 포함된 라벨은 순위와 무관하게 항상 포함됩니다. '기타' 행에는
+    sum_columns(기본: 모든 숫자 컬럼)의 합계만 기록됩니다. 행 수가 N
+    이하이면 정렬만 하여 반환합니다.
+    """
+    ordered = df.sort_values(sort_column, ascending=False, kind='stable')
+    if len(ordered) <= top_n:
+        return ordered
+
+    is_top = pd.Series(False, index=ordered.index)
+    is_top.iloc[:top_n] = True
+    is_top |= ordered[label_column].isin(keep)
+    top, rest = ordered[is_top], ordered[~is_top]
+
+    if sum_columns is None:
+        sum_columns = ordered.select_dtypes('number').columns
+    others = {col: '' for col in ordered.columns}
+    for col in sum_columns:
+        others[col] = rest[col].sum()
+    others[label_column] = f"{others_label}({len(rest)}개)"
+    return pd.concat([top, pd.DataFrame([others])], ignore_index=True)
+
+
+def table_candidates(df, label_column, sort_column, columns_options, keep=(FOCUS_BRAND,), sum_columns=None):
+    """정보량이 많은 순서로 (행 수, 컬럼) 축약 후보 데이터프레임을 생성합니다."""
+    row_limits = [len(df)] + [n for n in TOP_N_CANDIDATES if n < len(df)]
+    for columns in columns_options:
+        for top_n in row_limits:
+            yield top_n_rows(df, label_column, sort_column, top_n, keep, sum_columns)[list(columns)]
+
+
+def fit_table(df, label_column, sort_column, columns_options, budget, amount_columns=(), keep=(FOCUS_BRAND,)):
+    """토큰 예산 안에 들어가는 가장 상세한 표 문자열을 반환합니다.
+
+    columns_options는 상세한 컬럼 구성부터 순서대로 나열합니다. 어떤
+    후보도 예산에 맞지 않으면 가장 작은 후보를 반환합니다.
+    """
+    text = ''
+    sum_columns = list(amount_columns) or None
+    for candidate in table_candidates(df, label_column, sort_column, columns_options, keep, sum_columns):
+        text = serialize_table(candidate, amount_columns)
+        if estimate_tokens(text) <= budget:
+            return text
+    return text
+
+
+def build_prompt(title, sections, instructions, budget=PROMPT_TOKEN_BUDGET):
+    """고정 텍스트를 제외한 남은 예산을 표 섹션에 나누어 프롬프트를 만듭니다.
+
+    Args:
+        title: 프롬프트 제목
+        sections: (섹션 제목, 본문 또는 fit_table 인자 dict) 목록.
+            dict는 'df', 'label_column', 'sort_column', 'columns_options',
+            'amount_columns' 키를 가집니다.
+        instructions: 분석 요청사항 문자열 목록
+    """
+    fixed_parts = [title, '분석 요청사항:'] + [heading for heading, _ in sections] + instructions
+    fixed_parts += [body for _, body in sections if isinstance(body, str)]
+    table_count = sum(1 for _, body in sections if not isinstance(body, str))
+    remaining = max(budget - estimate_tokens("\n".join(fixed_parts)), 0)
+    table_budget = remaining // table_count if table_count else 0
+
+    lines = [title]
+    for heading, body in sections:
+        if not isinstance(body, str):
+            body = fit_table(budget=table_budget, **body)
+        lines += ['', heading, body]
+    lines += ['', '분석 요청사항:']
+    lines += [f"{i}. {instruction}" for i, instruction in enumerate(instructions, 1)]
+    return "\n".join(lines)
@@ -0,0 +1,31 @@
+"""사이드바 데이터 품질 요약
+
+적재 검증(analytics.validate_dataset) 결과를 사이드바에 표시합니다. 문제가
+없으면 한 줄 캡션만, 제외/경고 행이 있으면 규칙별 행 수와 격리 행 CSV
+내려받기 버튼을 펼침 영역에 보여 줍니다.
+"""
+import streamlit as st
+
+
+def render_quality_summary(quality):
+    """사이드바에 데이터 품질 요약을 표시합니다. (검증 결과가 없으면 표시하지 않음)"""
+    if quality is None:
+        return
+    summary = quality.summary
+    if quality.clean:
+        st.sidebar.caption(f"🧪 데이터 품질: {summary['rows']:,}개 행 모두 검증 통과")
+        return
+
+    title = f"🧪 데이터 품질: 제외 {summary['excluded']:,}행 · 경고 {summary['warned']:,}행"
+    with st.sidebar.expander(title, expanded=summary['excluded'] > 0):
+        st.caption(f"전체 {summary['rows']:,}개 행 중 제외된 행은 분석에서 빠지고, 경고 행은 그대로 사용됩니다.")
+        st.markdown("\n".join(
+            f"- {label}: {count:,}행" for label, count in summary['rules'].items() if count
+        ))
+        st.download_button(
+            label="📥 격리 행 다운로드 (CSV)",
+            data=lambda: quality.quarantine.to_csv(index=False, encoding='utf-8-sig'),  # 누를 때만 생성
+            file_name="quarantine.csv",
+            mime="text/csv",
+            key="quality_quarantine_download",
+        )
@@ -0,0 +1,274 @@
+"""메모리 맵 매출 행렬 (선택 백엔드)
+
+DX_DATA_BACKEND=mmap으로 실행하면 데이터셋의 수치 부분을 매장 × 브랜드
+(× 시즌) 행렬로 한 번 만들어 .npy 파일로 저장하고, 각 프로세스는 이를
+읽기 전용 메모리 맵으로 엽니다. 같은 파일 페이지를 운영체제가 프로세스
+사이에 공유하므로 워커를 늘려도 전체 메모리가 거의 늘지 않고, 두 번째
+프로세스부터는 CSV 파싱 없이 바로 시작합니다.
+
+디렉터리 구성 (<행렬 디렉터리>/<데이터셋 버전>.<MATRIX_LAYOUT>/):
+    sales.npy         (매장, 브랜드, 시즌) 매출
+    area.npy          (매장, 브랜드) 매장 면적
+    row_position.npy  (매장, 브랜드) 원본 첫 행 위치 (행이 없으면 -1)
+    dims.json         차원 사전 (매장/브랜드/시즌 이름, 매장별 유통사와 형태)
+    quality.json      적재 검증 결과 (analytics.DataQuality)
+    changes.json      이전 데이터 대비 변경 내역 (analytics.DatasetChanges, 있을 때만)
+
+매장 축은 (유통사, 매장명) 쌍이며 형태는 매장의 첫 행 값을 사용합니다.
+유통사가 다른 같은 이름의 매장은 따로 보관하고, 매장명별 집계(매장 수,
+매장별 매출/면적)에서만 pandas groupby처럼 이름 기준으로 합칩니다.
+같은 매장-브랜드 행이 여러 개면 매출은 합산하고 면적은 첫 행 값을 씁니다.
+
+행렬 디렉터리는 데이터 CSV와 같은 이름의 .matrix이며, 기본 데이터셋
+(DX_OUTLET_DATA)은 DX_MATRIX_DIR로 바꿀 수 있습니다. 생성은 임시
+디렉터리에 쓴 뒤 이름을 바꾸므로, 여러 프로세스가 동시에 만들어도 완성된
+한 벌만 남습니다.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from analytics import DATA_COLUMNS, DATA_PATH, SALES_COLUMNS, DataQuality, DatasetChanges, dataset_version
+from dataset_snapshots import load_tracked_dataset
+
+MATRIX_DIR = os.environ.get('DX_MATRIX_DIR') or os.path.splitext(DATA_PATH)[0] + '.matrix'
+MATRIX_LAYOUT = 2  # 행렬 구성이 바뀌면 올림 (이전 구성의 디렉터리는 다시 만듦)
+
+
+def build_matrix(df, directory, version, quality=None, changes=None):
+    """데이터프레임을 행렬 파일로 저장합니다."""
+    store_codes, store_keys = pd.factorize(pd.MultiIndex.from_frame(df[['유통사', '매장명']]))
+    brand_codes, brands = pd.factorize(df['브랜드'])
+    shape = (len(store_keys), len(brands))
+
+    values = df[SALES_COLUMNS].to_numpy()
+    sales = np.zeros(shape + (len(SALES_COLUMNS),), dtype=values.dtype)
+    np.add.at(sales, (store_codes, brand_codes), values)
+
+    # 역순으로 대입하여 셀마다 첫 행의 값이 남도록 함
+    reverse = slice(None, None, -1)
+    area = np.zeros(shape, dtype=float)
+    area[store_codes[reverse], brand_codes[reverse]] = df['매장 면적'].to_numpy(dtype=float)[reverse]
+    row_position = np.full(shape, -1, dtype=np.int64)
+    row_position[store_codes[reverse], brand_codes[reverse]] = np.arange(len(df))[reverse]
+
+    first_rows = df.drop_duplicates(['유통사', '매장명'])
+    dims = {
+        'version': version,
+        'seasons': SALES_COLUMNS,
+        'stores': first_rows['매장명'].tolist(),
+        'brands': brands.tolist(),
+        'store_distributor': first_rows['유통사'].tolist(),
+        'store_form': first_rows['형태'].tolist(),
+    }
+    np.save(os.path.join(directory, 'sales.npy'), sales)
+    np.save(os.path.join(directory, 'area.npy'), area)
+    np.save(os.path.join(directory, 'row_position.npy'), row_position)
+    with open(os.path.join(directory, 'dims.json'), 'w', encoding='utf-8') as f:
+        json.dump(dims, f, ensure_ascii=False)
+    if quality is not None:
+        with open(os.path.join(directory, 'quality.json'), 'w', encoding='utf-8') as f:
+            f.write(quality.to_json())
+    if changes is not None:
+        with open(os.path.join(directory, 'changes.json'), 'w', encoding='utf-8') as f:
+            f.write(changes.to_json())
+
+
+def matrix_root(source=DATA_PATH):
+    """데이터 CSV의 행렬 디렉터리 경로를 반환합니다."""
+    if os.path.abspath(source) == os.path.abspath(DATA_PATH):
+        return MATRIX_DIR
+    return os.path.splitext(source)[0] + '.matrix'
+
+
+def open_matrix(source=DATA_PATH, root=None, load=load_tracked_dataset):
+    """원본 데이터 버전에 해당하는 행렬을 (없으면 load로 읽어 만든 뒤) 메모리 맵으로 엽니다.
+
+    load(source)는 (데이터프레임, DataQuality, DatasetChanges 또는 None)을 반환합니다.
+    root 기본값은 matrix_root(source)입니다.
+    """
+    root = root or matrix_root(source)
+    version = dataset_version(source)
+    name = f'{version}.{MATRIX_LAYOUT}'
+    directory = os.path.join(root, name)
+    if not os.path.isdir(directory):
+        os.makedirs(root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f'.{name}-', dir=root)
+        os.chmod(tmp_dir, 0o755)  # 다른 사용자로 실행되는 워커도 읽을 수 있도록
+        try:
+            df, quality, changes = load(source)
+            build_matrix(df, tmp_dir, version, quality, changes)
+            os.rename(tmp_dir, directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # 다른 프로세스가 먼저 만든 경우
+        _remove_stale(root, name)
+    return SalesMatrix(directory)
+
+
+def _remove_stale(root, current):
+    """이전 버전 행렬을 지웁니다. (이미 매핑한 프로세스는 계속 읽을 수 있음)"""
+    for name in os.listdir(root):
+        if name != current and not name.startswith('.'):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def _read_report(path, report_class):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return report_class.from_json(f.read())
+
+
+class SalesMatrix:
+    """메모리 맵 매출 행렬 (sqlite_store.SQLiteStore와 같은 조회 인터페이스)"""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'dims.json'), encoding='utf-8') as f:
+            dims = json.load(f)
+        self.version = dims['version']
+        self.stores = np.array(dims['stores'], dtype=object)
+        self.brands = np.array(dims['brands'], dtype=object)
+        self.store_distributor = np.array(dims['store_distributor'], dtype=object)
+        self.store_form = np.array(dims['store_form'], dtype=object)
+        self.sales = np.load(os.path.join(directory, 'sales.npy'), mmap_mode='r')
+        self.area = np.load(os.path.join(directory, 'area.npy'), mmap_mode='r')
+        self.row_position = np.load(os.path.join(directory, 'row_position.npy'), mmap_mode='r')
+        self.columns = DATA_COLUMNS
+        self.quality = _read_report(os.path.join(directory, 'quality.json'), DataQuality)
+        self.changes = _read_report(os.path.join(directory, 'changes.json'), DatasetChanges)
+
+    def filter_options(self, column, distributor='전체'):
+        """필터 선택지('전체' + 정렬된 고유값)를 반환합니다."""
+        stores = slice(None) if distributor == '전체' else self.store_distributor == distributor
+        if column == '유통사':
+            values = self.store_distributor[stores]
+        elif column == '매장명':
+            values = self.stores[stores]
+        elif column == '브랜드':
+            values = self.brands[(self.row_position[stores] >= 0).any(axis=0)]
+        else:
+            raise ValueError(f"필터를 지원하지 않는 컬럼입니다: {column}")
+        return ['전체'] + sorted(set(values.tolist()))
+
+    def select(self, distributor='전체', store='전체', brand='전체'):
+        return MatrixSelection(self, distributor, store, brand)
+
+
+class MatrixSelection:
+    """유통사/매장/브랜드 필터를 적용한 행렬 조회 (analytics 집계 함수와 같은 결과)
+
+    필터가 없는 축은 메모리 맵을 그대로 사용하고, 필터가 있으면 선택된
+    매장/브랜드 부분만 복사합니다.
+    """
+
+    def __init__(self, matrix, distributor='전체', store='전체', brand='전체'):
+        self.matrix = matrix
+        store_mask = None
+        if distributor != '전체':
+            store_mask = matrix.store_distributor == distributor
+        if store != '전체':
+            mask = matrix.stores == store
+            store_mask = mask if store_mask is None else store_mask & mask
+        self._stores = None if store_mask is None else np.flatnonzero(store_mask)
+        self._brands = None if brand == '전체' else np.flatnonzero(matrix.brands == brand)
+        self._frame = None
+
+    def _cells(self, array):
+        if self._stores is not None:
+            array = array[self._stores]
+        if self._brands is not None:
+            array = array[:, self._brands]
+        return array
+
+    def _index(self, values, selected):
+        return values if selected is None else values[selected]
+
+    def _present(self):
+        return self._cells(self.matrix.row_position) >= 0
+
+    def __len__(self):
+        return int(self._present().sum())
+
+    def frame(self):
+        """필터된 행을 원본 순서의 데이터프레임으로 복원합니다."""
+        if self._frame is None:
+            positions = self._cells(self.matrix.row_position)
+            store_idx, brand_idx = np.nonzero(positions >= 0)
+            order = positions[store_idx, brand_idx].argsort(kind='stable')
+            store_idx, brand_idx = store_idx[order], brand_idx[order]
+            stores = self._index(np.arange(len(self.matrix.stores)), self._stores)[store_idx]
+            sales = self._cells(self.matrix.sales)[store_idx, brand_idx]
+            frame = pd.DataFrame({
+                '형태': self.matrix.store_form[stores],
+                '유통사': self.matrix.store_distributor[stores],
+                '매장명': self.matrix.stores[stores],
+                '브랜드': self._index(self.matrix.brands, self._brands)[brand_idx],
+            })
+            for i, season in enumerate(SALES_COLUMNS):
+                frame[season] = sales[:, i]
+            frame['매장 면적'] = self._cells(self.matrix.area)[store_idx, brand_idx]
+            self._frame = frame
+        return self._frame
+
+    def kpi_summary(self, sales_col='25SS'):
+        present = self._present()
+        rows = present.sum()
+        sales = self._cells(self.matrix.sales)[..., SALES_COLUMNS.index(sales_col)].sum()
+        return {
+            'stores': len(set(self._index(self.matrix.stores, self._stores)[present.any(axis=1)].tolist())),
+            'brands': int(present.any(axis=0).sum()),
+            'sales': sales,
+            'avg_area': self._cells(self.matrix.area)[present].sum() / rows if rows else None,
+        }
+
+    def season_totals(self):
+        return pd.Series(self._cells(self.matrix.sales).sum(axis=(0, 1)), index=SALES_COLUMNS)
+
+    def _grouped(self, by, columns):
+        """매장명 또는 브랜드별 합계 (행이 있는 그룹만, 이름순)를 반환합니다."""
+        sales = self._cells(self.matrix.sales)[..., [SALES_COLUMNS.index(col) for col in columns]]
+        present = self._present()
+        if by == '매장명':
+            totals, keep, names = sales.sum(axis=1), present.any(axis=1), self._index(self.matrix.stores, self._stores)
+        elif by == '브랜드':
+            totals, keep, names = sales.sum(axis=0), present.any(axis=0), self._index(self.matrix.brands, self._brands)
+        else:
+            raise ValueError(f"그룹 집계를 지원하지 않는 컬럼입니다: {by}")
+        grouped = pd.DataFrame(totals[keep], index=pd.Index(names[keep], name=by), columns=columns)
+        if by == '매장명':  # 유통사가 다른 같은 이름의 매장을 합침
+            return grouped.groupby(level=0).sum()
+        return grouped.sort_index()
+
+    def top_sales(self, by, column='25SS', top_n=10):
+        totals = self._grouped(by, [column])[column]
+        return totals.sort_values(ascending=False, kind='stable').head(top_n)
+
+    def area_sales(self, column='25SS'):
+        # 매장별 면적은 필터된 행 중 첫 행 기준
+        positions = self._cells(self.matrix.row_position).astype(float)
+        if positions.size == 0:
+            return pd.DataFrame(columns=['매장명', '매장 면적', column])
+        positions[positions < 0] = np.inf
+        first_brand = positions.argmin(axis=1)
+        area = self._cells(self.matrix.area)[np.arange(len(positions)), first_brand]
+        keep = np.isfinite(positions.min(axis=1))
+        sales = self._cells(self.matrix.sales)[..., SALES_COLUMNS.index(column)].sum(axis=1)
+        result = pd.DataFrame({
+            '매장명': self._index(self.matrix.stores, self._stores)[keep],
+            '매장 면적': area[keep],
+            column: sales[keep],
+        })
+        # 같은 이름의 매장은 원본에서 먼저 나온 매장의 면적과 매출 합계
+        result = result.iloc[positions.min(axis=1)[keep].argsort(kind='stable')]
+        return result.groupby('매장명').agg({'매장 면적': 'first', column: 'sum'}).reset_index()
+
+    def brand_season_matrix(self, top_n=15, sort_column='25SS'):
+        matrix = self._grouped('브랜드', SALES_COLUMNS)
+        return matrix.sort_values(sort_column, ascending=False, kind='stable').head(top_n)
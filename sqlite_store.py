@@ -0,0 +1,350 @@
+"""SQLite 데이터 저장소 (선택 백엔드)
+
+DX_DATA_BACKEND=sqlite로 실행하면 대시보드가 CSV 전체를 프로세스마다
+pandas로 들고 있지 않고, CSV를 로컬 SQLite 파일로 한 번 적재한 뒤 필터와
+그룹 집계를 SQL로 실행합니다. 파이썬으로는 필터된 행이나 집계 결과만
+넘어오며, 같은 파일을 여러 서버 프로세스가 함께 읽습니다.
+
+테이블:
+    sales          원본 행 (load_dataset 전처리 결과와 원본 순서, 내용 해시, 유통사/매장명/브랜드 인덱스)
+    brand_summary  (유통사, 브랜드) 단위 시즌 매출 합계 (매장 필터가 없을 때 사용)
+    store_summary  (유통사, 매장명) 단위 시즌 매출 합계와 면적 (브랜드 필터가 없을 때 사용)
+    meta           원본 CSV의 데이터셋 버전, 적재 검증 결과(analytics.DataQuality),
+                   이전 데이터 대비 변경 내역(analytics.DatasetChanges)
+
+시즌은 원본과 같이 컬럼(23SS ~ 25SS)으로 저장하므로 시즌 조건은 인덱스
+대신 컬럼 선택으로 처리됩니다. 적재는 BEGIN IMMEDIATE 트랜잭션 안에서
+원본 CSV 버전(경로, 크기, 수정 시각)을 비교하여 바뀌었을 때만 실행하므로, 여러
+프로세스가 동시에 시작해도 한 번만 적재되고 나머지는 완료를 기다립니다.
+다시 적재할 때는 행 내용 해시를 비교하여 바뀐 키만 반영합니다.
+
+환경변수:
+    DX_DATA_BACKEND  pandas(기본), sqlite 또는 mmap(sales_matrix)
+    DX_SQLITE_PATH   기본 데이터셋(DX_OUTLET_DATA)의 SQLite 파일 경로
+                     (기본: 데이터 CSV와 같은 이름의 .sqlite3, 다른 데이터셋은 항상 이 규칙)
+"""
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics import (
+    DATA_COLUMNS as COLUMNS, DATA_PATH, SALES_COLUMNS, DataQuality, DatasetChanges, dataset_version, row_hashes
+)
+from dataset_snapshots import load_tracked_dataset
+
+SQLITE_PATH = os.environ.get('DX_SQLITE_PATH') or os.path.splitext(DATA_PATH)[0] + '.sqlite3'
+BUSY_TIMEOUT = 120  # 다른 프로세스의 적재를 기다리는 최대 시간 (초)
+INSERT_BATCH = 50_000
+
+DIMENSIONS = ['형태', '유통사', '매장명', '브랜드']
+AREA_COLUMN = '매장 면적'
+
+ORDER_COLUMN = '순서'  # 원본 CSV 행 순서 (증분 반영으로 들어온 행은 앞뒤 행 사이의 실수 값)
+HASH_COLUMN = '해시'  # 행 내용 해시 (analytics.row_hashes, 다음 적재 때 바뀐 행 비교)
+STORED_COLUMNS = COLUMNS + [ORDER_COLUMN, HASH_COLUMN]
+KEY_COLUMNS = ['유통사', '매장명', '브랜드']
+INCREMENTAL_MAX_RATIO = 0.5  # 바뀐 행이 이 비율을 넘으면 전체를 다시 적재
+
+_SCHEMA = [
+    'CREATE UNIQUE INDEX idx_sales_key ON sales ("유통사", "매장명", "브랜드")',
+    'CREATE INDEX idx_sales_distributor ON sales ("유통사")',
+    'CREATE INDEX idx_sales_store ON sales ("매장명")',
+    'CREATE INDEX idx_sales_brand ON sales ("브랜드")',
+    'CREATE INDEX idx_sales_distributor_store ON sales ("유통사", "매장명")',
+    'CREATE INDEX idx_sales_order ON sales ("순서")',
+]
+
+# 요약 테이블: 이름 → (그룹 키, 집계 SELECT). 증분 반영 때는 영향받은 그룹만 같은 SELECT로 다시 계산
+# (매장 면적은 매장의 첫 행 기준, 평균 면적 계산용 합계와 행 수 포함)
+_SUMMARIES = {
+    'brand_summary': (('유통사', '브랜드'), '''
+        SELECT "유통사", "브랜드", COUNT(*) AS "행수", {sums}
+        FROM sales {where} GROUP BY "유통사", "브랜드"
+    '''),
+    'store_summary': (('유통사', '매장명'), '''
+        SELECT "유통사", "매장명", MIN("순서") AS "첫행", "매장 면적", COUNT(*) AS "행수",
+               SUM("매장 면적") AS "면적합계", {sums}
+        FROM sales {where} GROUP BY "유통사", "매장명"
+    '''),
+}
+
+
+def store_path(source=DATA_PATH):
+    """데이터 CSV를 적재할 SQLite 파일 경로를 반환합니다."""
+    if os.path.abspath(source) == os.path.abspath(DATA_PATH):
+        return SQLITE_PATH
+    return os.path.splitext(source)[0] + '.sqlite3'
+
+
+def _q(name):
+    """SQL 식별자를 따옴표로 감쌉니다. (허용된 컬럼만)"""
+    if name not in STORED_COLUMNS:
+        raise ValueError(f"알 수 없는 컬럼입니다: {name}")
+    return '"' + name + '"'
+
+
+def _sum_columns(columns=SALES_COLUMNS):
+    return ', '.join(f'SUM({_q(col)}) AS {_q(col)}' for col in columns)
+
+
+def _summary_select(name, where=''):
+    return _SUMMARIES[name][1].format(sums=_sum_columns(), where=where)
+
+
+def ingest(conn, source, load=load_tracked_dataset):
+    """CSV를 sales 테이블과 요약 테이블로 적재합니다. (호출자가 트랜잭션을 관리)
+
+    load(source)는 (데이터프레임, DataQuality, DatasetChanges 또는 None)을
+    반환합니다. 이전에 적재한 행에 내용 해시가 있으면 (유통사, 매장명,
+    브랜드) 키로 비교하여 추가/삭제/변경된 행만 반영하고, 요약 테이블도
+    영향받은 그룹만 다시 계산합니다. 바뀐 행이 많으면 전체를 다시 적재합니다.
+    """
+    df, quality, changes = load(source)
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('quality', ?)", (quality.to_json(),))
+    conn.execute("DELETE FROM meta WHERE key = 'changes'")
+    if changes is not None:
+        conn.execute("INSERT INTO meta VALUES ('changes', ?)", (changes.to_json(),))
+
+    df = df.assign(**{ORDER_COLUMN: np.arange(len(df)), HASH_COLUMN: row_hashes(df).view(np.int64)})
+    if not _ingest_changed(conn, df):
+        _ingest_all(conn, df)
+    return len(df)
+
+
+def _insert_rows(conn, df):
+    placeholders = ', '.join('?' * len(STORED_COLUMNS))
+    rows = df[STORED_COLUMNS].astype(object).itertuples(index=False, name=None)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH:
+            conn.executemany(f'INSERT INTO sales VALUES ({placeholders})', batch)
+            batch = []
+    if batch:
+        conn.executemany(f'INSERT INTO sales VALUES ({placeholders})', batch)
+
+
+def _ingest_all(conn, df):
+    for table in ('sales', 'brand_summary', 'store_summary'):
+        conn.execute(f'DROP TABLE IF EXISTS {table}')
+
+    types = {col: 'TEXT' for col in DIMENSIONS}
+    for col in SALES_COLUMNS + [AREA_COLUMN]:
+        types[col] = 'INTEGER' if pd.api.types.is_integer_dtype(df[col]) else 'REAL'
+    types[ORDER_COLUMN], types[HASH_COLUMN] = 'REAL', 'INTEGER'
+    conn.execute('CREATE TABLE sales (' + ', '.join(f'{_q(col)} {types[col]}' for col in STORED_COLUMNS) + ')')
+    _insert_rows(conn, df)
+    for statement in _SCHEMA:
+        conn.execute(statement)
+
+    for name, (keys, _) in _SUMMARIES.items():
+        conn.execute(f'CREATE TABLE {name} AS {_summary_select(name)}')
+        conn.execute(f'CREATE INDEX idx_{name} ON {name} ({", ".join(_q(col) for col in keys)})')
+    conn.execute('ANALYZE')
+
+
+def _ingest_changed(conn, df):
+    """바뀐 행만 반영합니다. 증분 반영이 어려우면(해시 없음, 변경 과다, 순서 변경) False를 반환합니다."""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(sales)')]
+    if HASH_COLUMN not in columns:
+        return False
+
+    # 해시는 64비트 정수이므로 한쪽에만 있는 키 때문에 실수로 바뀌지 않도록 nullable 정수로 비교
+    stored = pd.DataFrame(
+        conn.execute('SELECT rowid, "유통사", "매장명", "브랜드", "순서", "해시" FROM sales').fetchall(),
+        columns=['rowid'] + KEY_COLUMNS + [f'{ORDER_COLUMN} (이전)', f'{HASH_COLUMN} (이전)']
+    ).astype({f'{HASH_COLUMN} (이전)': 'Int64'})
+    current = df[KEY_COLUMNS].assign(
+        _position=np.arange(len(df)), **{HASH_COLUMN: pd.array(df[HASH_COLUMN].to_numpy(), dtype='Int64')}
+    )
+    merged = stored.merge(current, on=KEY_COLUMNS, how='outer', indicator=True)
+    side = merged['_merge'].to_numpy()
+    both = side == 'both'
+    modified = both & merged[f'{HASH_COLUMN} (이전)'].ne(merged[HASH_COLUMN]).fillna(False).to_numpy(dtype=bool)
+    removed = (side == 'left_only') | modified
+    added = (side == 'right_only') | modified
+    if (side != 'both').sum() + modified.sum() > INCREMENTAL_MAX_RATIO * max(len(df), 1):
+        return False
+
+    # 남은 행은 기존 순서 값을 그대로 두고, 새 행은 앞뒤 행의 순서 값 사이로 보간
+    # (남은 행끼리의 상대 순서가 바뀌었으면 전체를 다시 적재)
+    kept = merged[both].sort_values('_position')
+    kept_positions = kept['_position'].to_numpy(dtype=float)
+    kept_orders = kept[f'{ORDER_COLUMN} (이전)'].to_numpy(dtype=float)
+    if len(kept) == 0 or (np.diff(kept_orders) <= 0).any():
+        return False
+    anchors_x = np.concatenate([[-1.0], kept_positions, [float(len(df))]])
+    anchors_y = np.concatenate([
+        [kept_orders[0] - kept_positions[0] - 1], kept_orders, [kept_orders[-1] + len(df) - kept_positions[-1]]
+    ])
+    orders = np.interp(np.arange(len(df), dtype=float), anchors_x, anchors_y)
+
+    # 변경된 행은 지우고 다시 넣음
+    conn.executemany('DELETE FROM sales WHERE rowid = ?', ((int(rowid),) for rowid in merged.loc[removed, 'rowid']))
+    positions = np.sort(merged.loc[added, '_position'].to_numpy(dtype=np.int64))
+    _insert_rows(conn, df.iloc[positions].assign(**{ORDER_COLUMN: orders[positions]}))
+
+    # 영향받은 그룹만 요약 다시 계산
+    changed = merged[removed | added]
+    for name, (keys, _) in _SUMMARIES.items():
+        affected = changed[list(keys)].drop_duplicates()
+        if affected.empty:
+            continue
+        key_list = ', '.join(_q(col) for col in keys)
+        conn.execute('DROP TABLE IF EXISTS temp.affected_groups')
+        conn.execute(f'CREATE TEMP TABLE affected_groups ({key_list})')
+        conn.executemany('INSERT INTO temp.affected_groups VALUES (?, ?)', affected.itertuples(index=False, name=None))
+        where = f'WHERE ({key_list}) IN (SELECT {key_list} FROM temp.affected_groups)'
+        conn.execute(f'DELETE FROM {name} {where}')
+        conn.execute(f'INSERT INTO {name} {_summary_select(name, where)}')
+    conn.execute('DROP TABLE IF EXISTS temp.affected_groups')
+    return True
+
+
+class SQLiteStore:
+    """SQLite 파일에 적재된 데이터셋 (스레드마다 별도 연결 사용)"""
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        self.version = row[0]
+        self.columns = COLUMNS
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'quality'").fetchone()
+        self.quality = DataQuality.from_json(row[0]) if row else None  # 검증 도입 전에 적재한 파일은 없음
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'changes'").fetchone()
+        self.changes = DatasetChanges.from_json(row[0]) if row else None
+
+    @classmethod
+    def open(cls, path=None, source=DATA_PATH, load=load_tracked_dataset):
+        """원본 CSV가 바뀌었으면 load로 읽어 다시 적재한 뒤 저장소를 엽니다. (path 기본값: store_path(source))"""
+        path = path or store_path(source)
+        version = dataset_version(source)
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute('BEGIN IMMEDIATE')  # 다른 프로세스가 적재 중이면 끝날 때까지 대기
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                if row is None or row[0] != version:
+                    ingest(conn, source, load)
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+        return cls(path)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+            conn.execute('PRAGMA query_only=ON')
+        return conn
+
+    def query(self, sql, params=()):
+        return self._conn().execute(sql, params).fetchall()
+
+    def read_frame(self, sql, params=()):
+        return pd.read_sql_query(sql, self._conn(), params=params)
+
+    def filter_options(self, column, distributor='전체'):
+        """필터 선택지('전체' + 정렬된 고유값)를 반환합니다."""
+        where, params = _where(distributor)
+        rows = self.query(f'SELECT DISTINCT {_q(column)} FROM sales {where} ORDER BY 1', params)
+        return ['전체'] + [row[0] for row in rows]
+
+    def select(self, distributor='전체', store='전체', brand='전체'):
+        return SQLiteSelection(self, distributor, store, brand)
+
+
+def _where(distributor='전체', store='전체', brand='전체'):
+    conditions, params = [], []
+    for column, value in (('유통사', distributor), ('매장명', store), ('브랜드', brand)):
+        if value != '전체':
+            conditions.append(f'{_q(column)} = ?')
+            params.append(value)
+    return ('WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+
+class SQLiteSelection:
+    """유통사/매장/브랜드 필터를 적용한 조회 (analytics 집계 함수와 같은 결과를 SQL로 계산)
+
+    매장 필터가 없으면 brand_summary, 브랜드 필터가 없으면 store_summary를
+    읽어 원본 행을 훑지 않습니다.
+    """
+
+    def __init__(self, store, distributor='전체', store_name='전체', brand='전체'):
+        self.store = store
+        self.filters = (distributor, store_name, brand)
+        self._where, self._params = _where(distributor, store_name, brand)
+        self._frame = None
+
+    def _table(self, level):
+        distributor, store, brand = self.filters
+        if level == '브랜드' and store == '전체':
+            return 'brand_summary'
+        if level == '매장명' and brand == '전체':
+            return 'store_summary'
+        return 'sales'
+
+    def __len__(self):
+        return self.store.query(f'SELECT COUNT(*) FROM sales {self._where}', self._params)[0][0]
+
+    def frame(self):
+        """필터된 원본 행을 데이터프레임으로 반환합니다. (원본 순서 유지)"""
+        if self._frame is None:
+            columns = ', '.join(_q(col) for col in COLUMNS)
+            self._frame = self.store.read_frame(f'SELECT {columns} FROM sales {self._where} ORDER BY "순서"', self._params)
+        return self._frame
+
+    def kpi_summary(self, sales_col='25SS'):
+        brands = self.store.query(
+            f'SELECT COUNT(DISTINCT "브랜드") FROM {self._table("브랜드")} {self._where}', self._params
+        )[0][0]
+        if self._table('매장명') == 'store_summary':
+            sql = f'SELECT COUNT(DISTINCT "매장명"), SUM({_q(sales_col)}), SUM("면적합계") / SUM("행수") FROM store_summary {self._where}'
+        else:
+            sql = f'SELECT COUNT(DISTINCT "매장명"), SUM({_q(sales_col)}), AVG("매장 면적") FROM sales {self._where}'
+        stores, sales, avg_area = self.store.query(sql, self._params)[0]
+        return {'stores': stores, 'brands': brands, 'sales': sales or 0, 'avg_area': avg_area}
+
+    def season_totals(self):
+        table = self._table('브랜드')
+        if table == 'sales':
+            table = self._table('매장명')
+        row = self.store.query(f'SELECT {_sum_columns()} FROM {table} {self._where}', self._params)[0]
+        return pd.Series([value or 0 for value in row], index=SALES_COLUMNS)
+
+    def top_sales(self, by, column='25SS', top_n=10):
+        sql = (
+            f'SELECT {_q(by)}, SUM({_q(column)}) AS total FROM {self._table(by)} {self._where} '
+            f'GROUP BY {_q(by)} ORDER BY total DESC, {_q(by)} LIMIT ?'
+        )
+        rows = self.store.query(sql, self._params + [top_n])
+        return pd.Series(
+            [row[1] for row in rows], index=pd.Index([row[0] for row in rows], name=by), name=column
+        )
+
+    def area_sales(self, column='25SS'):
+        # 매장별 면적은 필터된 행 중 첫 행 기준 (SQLite는 MIN()과 함께 쓴 컬럼을 최솟값 행에서 가져옴)
+        first = 'MIN("첫행")' if self._table('매장명') == 'store_summary' else 'MIN("순서")'
+        return self.store.read_frame(
+            f'SELECT "매장명", "매장 면적", {first} AS _first, SUM({_q(column)}) AS {_q(column)} '
+            f'FROM {self._table("매장명")} {self._where} GROUP BY "매장명" ORDER BY "매장명"',
+            self._params
+        ).drop(columns='_first')
+
+    def brand_season_matrix(self, top_n=15, sort_column='25SS'):
+        matrix = self.store.read_frame(
+            f'SELECT "브랜드", {_sum_columns()} FROM {self._table("브랜드")} {self._where} '
+            f'GROUP BY "브랜드" ORDER BY {_q(sort_column)} DESC, "브랜드" LIMIT ?',
+            self._params + [top_n]
+        )
+        return matrix.set_index('브랜드')
@@ -0,0 +1,57 @@
+"""포커스 브랜드 행 강조 테이블 렌더링
+
+행마다 파이썬 함수를 호출하는 Styler.apply(axis=1) 대신, 미리 계산한
+불리언 마스크로 강조할 행을 표시합니다. 작은 테이블은 벡터화된 스타일
+배열을 한 번에 적용하고, 큰 테이블은 Styler 없이 체크박스 컬럼으로
+표시하여 일반 데이터프레임과 같은 속도로 렌더링합니다. 이때 pyarrow가
+있으면 Arrow 테이블에 체크박스 컬럼을 붙여 그대로 전송합니다.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 pandas로 전송
+    pa = None
+
+from analytics import FOCUS_BRAND
+
+HIGHLIGHT_STYLE = 'background-color: #FFE6E6'
+STYLER_ROW_LIMIT = 200
+FLAG_COLUMN = '강조'
+
+
+def focus_mask(values, focus=FOCUS_BRAND):
+    """포커스 브랜드에 해당하는 행의 불리언 배열을 반환합니다."""
+    return (pd.Series(values).to_numpy() == focus)
+
+
+def highlight_styles(df, mask):
+    """마스크 행에 강조 스타일을 지정한 스타일 데이터프레임을 반환합니다."""
+    styles = np.where(np.asarray(mask)[:, None], HIGHLIGHT_STYLE, '')
+    styles = np.broadcast_to(styles, df.shape)
+    return pd.DataFrame(styles, index=df.index, columns=df.columns)
+
+
+def render_highlighted_dataframe(df, mask, flag_label='🔥', column_config=None, **dataframe_kwargs):
+    """강조 행이 표시된 데이터프레임을 렌더링합니다.
+
+    행 수가 STYLER_ROW_LIMIT 이하이면 배경색으로, 그보다 많으면
+    Styler를 거치지 않고 맨 앞의 체크박스 컬럼으로 강조 행을 표시합니다.
+    """
+    import streamlit as st
+
+    mask = np.asarray(mask, dtype=bool)
+    if len(df) <= STYLER_ROW_LIMIT:
+        styles = highlight_styles(df, mask)
+        st.dataframe(df.style.apply(lambda _: styles, axis=None), column_config=column_config, **dataframe_kwargs)
+        return
+
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False).add_column(0, FLAG_COLUMN, pa.array(mask))
+    else:
+        table = df.copy(deep=False)
+        table.insert(0, FLAG_COLUMN, mask)
+    config = dict(column_config or {})
+    config[FLAG_COLUMN] = st.column_config.CheckboxColumn(flag_label, help=f"{FOCUS_BRAND} 강조 행", width='small')
+    st.dataframe(table, column_config=config, **dataframe_kwargs)
@@ -0,0 +1,104 @@
+"""재미나이 API 로컬 스텁 서버
+
+generateContent(전체 응답)와 streamGenerateContent(SSE 청크 응답)를
+흉내 내어 API 키나 네트워크 없이 AI 분석 화면을 확인할 수 있습니다.
+응답 텍스트는 프롬프트 첫 줄을 포함한 고정 문장이며, 청크 사이에
+지연을 두어 스트리밍 표시를 눈으로 확인할 수 있습니다.
+
+사용 예:
+    python tools/gemini_stub_server.py --port 8765 --delay 0.2
+    DX_GEMINI_API_BASE=http://127.0.0.1:8765/v1beta streamlit run dashboard_streamlit_backup.py
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSE_SENTENCES = [
+    "## 요약\n",
+    "디스커버리는 롯데 유통망에서 가장 높은 매출을 기록하고 있습니다. ",
+    "다만 25SS 매출은 전년 대비 감소하여 ",
+    "핵심 매장의 효율 개선이 필요합니다.\n\n",
+    "## 제안\n",
+    "- 평당매출 상위 매장의 운영 방식을 하위 매장에 확산하세요.\n",
+    "- 성장 중인 경쟁 브랜드의 상품 구성을 점검하세요.\n",
+]
+
+
+def _chunk(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+    latency = 0.0
+
+    def _read_prompt(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        try:
+            return body['contents'][0]['parts'][0]['text']
+        except (KeyError, IndexError):
+            return ''
+
+    def _sentences(self, prompt):
+        first_line = next((line for line in prompt.splitlines() if line.strip()), '')
+        return [f"**{first_line}** (스텁 응답)\n\n"] + RESPONSE_SENTENCES
+
+    def do_POST(self):
+        prompt = self._read_prompt()
+        time.sleep(self.latency)
+        if ':streamGenerateContent' in self.path:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for sentence in self._sentences(prompt):
+                event = f"data: {json.dumps(_chunk(sentence), ensure_ascii=False)}\r\n\r\n".encode('utf-8')
+                self._write_chunk(event)
+                time.sleep(self.delay)
+            self._write_chunk(b'')
+        elif ':generateContent' in self.path:
+            time.sleep(self.delay * len(RESPONSE_SENTENCES))
+            body = json.dumps(_chunk("".join(self._sentences(prompt))), ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def _write_chunk(self, data):
+        """HTTP/1.1 chunked 인코딩으로 한 조각을 전송합니다. (빈 조각은 응답 종료)"""
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="재미나이 API 로컬 스텁 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.2, help="청크 사이 지연 (초)")
+    parser.add_argument('--latency', type=float, default=0.0, help="첫 응답 전 지연 (초, 시간 초과 확인용)")
+    args = parser.parse_args(argv)
+
+    StubHandler.delay = args.delay
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"스텁 서버 실행 중: http://{args.host}:{args.port}/v1beta (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""임포트 시간 보고서 (콜드 스타트 추적)
+
+새 파이썬 프로세스에서 `python -X importtime`으로 대시보드 페이지를
+불러오고, 모듈별 자체(self)/누적(cumulative) 임포트 시간과 패키지별 합계를
+출력합니다. 기본은 페이지 모듈의 최상위 코드만 실행한 시간이며, --render를
+주면 Streamlit AppTest로 첫 화면을 그릴 때까지 불러온 모듈(차트/AI 호출 때
+지연 로드되는 plotly, requests 등 포함)을 함께 측정합니다.
+
+측정 도구(AppTest 등) 자체의 임포트는 구분 표시 이후의 기록만 집계하여
+제외합니다. 실행마다 편차가 크므로 --repeat로 여러 번 실행하면 임포트
+시간이 중앙값인 실행의 결과를 사용합니다. --json으로 결과를 저장해 두면
+배포마다 콜드 스타트 시간을 비교할 수 있습니다.
+
+사용 예:
+    python tools/import_report.py                                # 두 페이지 임포트 시간
+    python tools/import_report.py --render --top 20              # 첫 렌더링까지
+    python tools/import_report.py --repeat 5                     # 5회 중앙값
+    python tools/import_report.py --json /tmp/import_times.json
+"""
+import argparse
+import importlib
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ['streamlit_app.py', 'dashboard_streamlit.py', 'dashboard_streamlit_backup.py']
+MARKER = 'dx-import-report-start'
+RUN_TIMEOUT = 600
+TOP_N = 15
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 구분 표시 이후의 [(모듈, 자체 us, 누적 us, 깊이)]를 반환합니다."""
+    records = []
+    started = False
+    for line in stderr.splitlines():
+        if MARKER in line:
+            started = True
+            continue
+        match = _LINE.match(line)
+        if started and match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def summarize(records, wall_seconds, top_n=TOP_N):
+    """임포트 기록을 전체/패키지별/모듈별 요약으로 만듭니다."""
+    packages = {}
+    for name, self_us, _, _ in records:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    top_level = [(name, cumulative_us) for name, _, cumulative_us, depth in records if depth == 0]
+    return {
+        'wall_ms': wall_seconds * 1000,
+        'import_ms': sum(cumulative_us for _, cumulative_us in top_level) / 1000,
+        'modules': len(records),
+        'packages': {
+            name: us / 1000 for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top_n]
+        },
+        'top_level': {
+            name: us / 1000 for name, us in sorted(top_level, key=lambda item: -item[1])[:top_n]
+        },
+    }
+
+
+def measure(page, render=False, top_n=TOP_N):
+    """하위 프로세스에서 페이지를 불러오고 임포트 시간 요약을 반환합니다."""
+    command = [sys.executable, '-X', 'importtime', os.path.abspath(__file__), '--child', page]
+    if render:
+        command.append('--render')
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, timeout=RUN_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"{page}: {result.stderr.strip().splitlines()[-1:]}")
+    wall_seconds = json.loads(result.stdout.strip().splitlines()[-1])['wall_seconds']
+    return summarize(parse_importtime(result.stderr), wall_seconds, top_n)
+
+
+def measure_median(page, render=False, top_n=TOP_N, repeat=1):
+    """repeat회 측정하여 임포트 시간이 중앙값인 실행의 요약을 반환합니다."""
+    runs = sorted((measure(page, render, top_n) for _ in range(repeat)), key=lambda run: run['import_ms'])
+    summary = runs[len(runs) // 2]
+    summary['runs_import_ms'] = [run['import_ms'] for run in runs]
+    summary['stdev_ms'] = statistics.stdev(summary['runs_import_ms']) if repeat > 1 else 0.0
+    return summary
+
+
+def _child(page, render):
+    sys.path.insert(0, ROOT)
+    if render:
+        from streamlit.testing.v1 import AppTest
+    else:
+        import streamlit  # noqa: F401  페이지보다 먼저 불러와 측정 구간의 기준을 맞춤
+
+    from streamlit import logger
+    logger.set_log_level('error')
+
+    sys.stderr.write(f"{MARKER}\n")
+    sys.stderr.flush()
+    start = time.perf_counter()
+    if render:
+        at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=RUN_TIMEOUT)
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    else:
+        importlib.import_module(os.path.splitext(page)[0])
+    sys.stdout.write(json.dumps({'wall_seconds': time.perf_counter() - start}) + "\n")
+
+
+def format_report(page, summary, render):
+    mode = "첫 렌더링" if render else "페이지 임포트"
+    spread = f" (±{summary['stdev_ms']:.0f}ms)" if summary.get('stdev_ms') else ""
+    lines = [
+        f"{page} ({mode}) {summary['wall_ms']:.0f}ms, 임포트 {summary['import_ms']:.0f}ms{spread}, 모듈 {summary['modules']}개",
+        "  패키지별 자체 임포트 시간",
+    ]
+    lines += [f"    {name:<28} {ms:8.1f}ms" for name, ms in summary['packages'].items()]
+    lines.append("  최상위 임포트 누적 시간")
+    lines += [f"    {name:<28} {ms:8.1f}ms" for name, ms in summary['top_level'].items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 임포트 시간 보고서")
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    parser.add_argument('--render', action='store_true', help="AppTest로 첫 화면까지 실행하여 측정")
+    parser.add_argument('--top', type=int, default=TOP_N, help="표시할 패키지/모듈 수")
+    parser.add_argument('--repeat', type=int, default=1, help="페이지별 측정 횟수 (중앙값 사용)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--child', help=argparse.SUPPRESS)  # 하위 프로세스용
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child, args.render)
+        return 0
+
+    results = {}
+    for page in args.pages:
+        results[page] = measure_median(page, args.render, args.top, args.repeat)
+        print(format_report(page, results[page], args.render))
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'render': args.render, 'pages': results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장 → {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""동시 사용자 세션 부하 테스트
+
+Streamlit AppTest로 대시보드를 브라우저 없이 실행하고, N명의 사용자가
+동시에 필터/시즌/라디오를 바꾸며 화면을 다시 그리는 상황을 흉내 냅니다.
+세션 수별로 재실행(rerun) 지연 p50/p95/p99, 처리량, 프로세스 RSS를
+출력하여 레플리카 한 대가 감당할 수 있는 세션 수를 가늠합니다.
+
+모든 세션은 한 프로세스에서 실행되므로 Streamlit 서버와 마찬가지로
+프로세스 전역 캐시(데이터셋 LRU, 차트 피겨 캐시 등)를 공유합니다.
+
+사용 예:
+    python tools/load_test.py --users 1 5 10 --steps 20
+    python tools/load_test.py --app streamlit_app.py --users 10 --scale 10 --json load.json
+    python tools/load_test.py --app dashboard_streamlit.py --users 2 --steps 50 --memory
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from synthetic_data import write_scaled_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APPS = ['streamlit_app.py', 'dashboard_streamlit.py']
+RUN_TIMEOUT = 120
+
+# 앱별 사용자 행동 (위젯 종류, 키 또는 라벨, 가중치)
+SCENARIOS = {
+    'streamlit_app.py': [
+        ('selectbox', '시즌 선택', 3),
+        ('selectbox', '유통사 선택', 3),
+        ('selectbox', '매장명 선택', 2),
+        ('radio', 'ms_analysis_type', 2),
+    ],
+    'dashboard_streamlit.py': [
+        ('selectbox', '유통사 선택', 3),
+        ('selectbox', '매장 선택', 2),
+        ('selectbox', '브랜드 선택', 2),
+        ('selectbox', 'data_table_sort', 1),
+        ('radio', 'data_table_asc', 1),
+        ('text_input', 'data_table_query', 1),
+    ],
+}
+SEARCH_TERMS = ['', '롯데', '현대', '신세계', '디스커버리', '노스페이스', '이천']
+
+
+def current_rss_mb():
+    """현재 프로세스의 RSS(MB)를 반환합니다. /proc가 없으면 최대 RSS를 사용합니다."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _find_widget(at, kind, name):
+    """키 또는 라벨로 위젯을 찾습니다."""
+    for widget in getattr(at, kind):
+        if widget.key == name or widget.label == name:
+            return widget
+    return None
+
+
+def _apply_action(at, rng, kind, name):
+    """위젯 값을 임의로 바꾸고 적용 여부를 반환합니다."""
+    widget = _find_widget(at, kind, name)
+    if widget is None:
+        return False
+    if kind == 'text_input':
+        widget.input(rng.choice(SEARCH_TERMS))
+    else:
+        widget.set_value(rng.choice(list(widget.options)))
+    return True
+
+
+def simulate_user(app_path, scenario, steps, seed, think_time, latencies, errors):
+    """한 사용자 세션을 실행하며 재실행 지연(초)을 기록합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    actions = [(kind, name) for kind, name, _ in scenario]
+    weights = [weight for _, _, weight in scenario]
+
+    at = AppTest.from_file(app_path, default_timeout=RUN_TIMEOUT)
+    for step in range(steps + 1):
+        if step > 0 and not _apply_action(at, rng, *rng.choices(actions, weights)[0]):
+            continue
+        start = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            errors.append(repr(e))
+            return
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            errors.append(at.exception[0].message)
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+
+
+def run_level(app, users, steps, think_time, seed):
+    """동시 사용자 수 한 단계를 실행하고 결과 요약을 반환합니다."""
+    latencies = []
+    errors = []
+    threads = [
+        threading.Thread(
+            target=simulate_user,
+            args=(os.path.join(ROOT, app), SCENARIOS[app], steps, seed + i, think_time, latencies, errors),
+            name=f"user-{i}"
+        )
+        for i in range(users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        'app': app,
+        'users': users,
+        'reruns': len(latencies),
+        'p50_ms': float(np.percentile(ms, 50)) if len(ms) else None,
+        'p95_ms': float(np.percentile(ms, 95)) if len(ms) else None,
+        'p99_ms': float(np.percentile(ms, 99)) if len(ms) else None,
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'rss_mb': current_rss_mb(),
+        'errors': len(errors),
+        'error_samples': sorted(set(errors))[:3],
+    }
+
+
+def _format_row(row):
+    def ms(value):
+        return f"{value:8.0f}" if value is not None else "       -"
+    return (
+        f"{row['app']:<24} {row['users']:>5} {row['reruns']:>7} {ms(row['p50_ms'])} {ms(row['p95_ms'])} "
+        f"{ms(row['p99_ms'])} {row['throughput_rps']:>9.2f} {row['rss_mb']:>8.0f} {row['errors']:>6}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 동시 사용자 부하 테스트")
+    parser.add_argument('--app', nargs='+', default=DEFAULT_APPS, choices=sorted(SCENARIOS), dest='apps')
+    parser.add_argument('--users', nargs='+', type=int, default=[1, 5, 10], help="동시 세션 수 (단계별)")
+    parser.add_argument('--steps', type=int, default=20, help="세션당 위젯 조작 횟수")
+    parser.add_argument('--think-time', type=float, default=0.0, help="조작 사이 최대 대기 시간 (초)")
+    parser.add_argument('--scale', type=int, default=1, help="합성 데이터 배수 (1이면 원본 CSV)")
+    parser.add_argument('--data', help="데이터 CSV 경로 (--scale보다 우선)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--memory', action='store_true', help="tracemalloc 메모리 진단 보고서 출력 (느림)")
+    args = parser.parse_args(argv)
+
+    # 데이터 경로는 앱이 analytics를 처음 가져오기 전에 지정해야 함
+    if args.data:
+        os.environ['DX_OUTLET_DATA'] = os.path.abspath(args.data)
+    elif args.scale > 1:
+        path = os.path.join(tempfile.mkdtemp(prefix='dx_load_'), f"dx_outlet_{args.scale}x.csv")
+        os.environ['DX_OUTLET_DATA'] = write_scaled_csv(args.scale, path, seed=args.seed)
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    # 세션마다 반복되는 Streamlit 경고 로그 생략
+    from streamlit import logger
+    logger.set_log_level('error')
+
+    diagnostics = None
+    if args.memory:
+        import memory_diagnostics
+        diagnostics = memory_diagnostics.enable()
+
+    print(f"{'app':<24} {'users':>5} {'reruns':>7} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'rerun/s':>9} {'RSS(MB)':>8} {'errors':>6}")
+    results = []
+    for app in args.apps:
+        for users in args.users:
+            row = run_level(app, users, args.steps, args.think_time, args.seed)
+            results.append(row)
+            print(_format_row(row), flush=True)
+            for sample in row['error_samples']:
+                print(f"    ⚠️ {sample}")
+
+    if diagnostics is not None:
+        print()
+        print(diagnostics.format_report())
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'scale': args.scale, 'steps': args.steps, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""페이지 성능 예산(budget) 검사
+
+고정 시드의 합성 데이터셋(원본 CSV의 1배/10배/100배)으로 각 대시보드를
+Streamlit AppTest로 실행하고, 섹션별 재실행 시간, 피크 메모리, 차트
+페이로드 크기를 tools/perf_budgets.json의 예산과 비교합니다. 예산을 넘은
+섹션이 있으면 예산과 측정값의 차이를 출력하고 종료 코드 1로 끝납니다.
+브라우저 없이 일반 리눅스 환경에서 실행됩니다.
+
+시간은 같은 프로세스에서 먼저 잰 고정 pandas 작업(보정 작업)의 실행 시간을
+1로 둔 상대값(relative_time)으로 비교하므로, 예산을 기록한 머신보다 느리거나
+빠른 CI 머신에서도 같은 예산을 씁니다. 피크 메모리와 페이로드 크기는 머신과
+관계없으므로 절대값(MB, KB)으로 비교합니다.
+
+섹션은 앱 코드의 instrumentation.section()으로 구분되며, '_page'는
+재실행 전체를 뜻합니다. 측정된 섹션에 예산이 없어도(새 섹션) 실패합니다. 데이터 배수별 측정은 DX_OUTLET_DATA가 다른
+하위 프로세스에서 실행되므로 Streamlit 캐시가 서로 섞이지 않습니다.
+섹션별 값이 다른 섹션의 백그라운드 계산과 섞이지 않도록 점진적
+렌더링(DX_PROGRESSIVE_RENDER)은 끄고 섹션을 순서대로 측정합니다.
+
+사용 예:
+    python tools/perf_budget.py                    # 예산 검사
+    python tools/perf_budget.py --scales 1 10      # 일부 배수만 검사
+    python tools/perf_budget.py --update           # 현재 측정값으로 예산 갱신
+    python tools/perf_budget.py --add-missing      # 예산이 없는 새 섹션만 예산 추가
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import write_scaled_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf_budgets.json')
+PAGES = ['streamlit_app.py', 'dashboard_streamlit.py']
+SCALES = [1, 10, 100]
+WARM_RUNS = 3
+RUN_TIMEOUT = 600
+PAGE_SECTION = '_page'
+CALIBRATION_ROWS = 200_000
+CALIBRATION_RUNS = 7
+
+# --update 시 측정값에 곱하는 여유 배수와 최소 여유 (relative_time은 보정 작업 시간 단위)
+HEADROOM = {'relative_time': 3.0, 'peak_mb': 1.5, 'payload_kb': 1.25}
+MIN_SLACK = {'relative_time': 0.6, 'peak_mb': 2.0, 'payload_kb': 16.0}
+
+
+def calibrate(runs=CALIBRATION_RUNS):
+    """보정 작업(고정 시드 데이터의 그룹 합계와 정렬) 실행 시간의 중앙값(초)을 반환합니다."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'key': rng.integers(0, 1000, CALIBRATION_ROWS).astype(str),
+        'value': rng.random(CALIBRATION_ROWS),
+    })
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        df.groupby('key')['value'].sum().sort_values()
+        df.sort_values(['key', 'value'])
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _run_page(page, runs, trace_memory=False):
+    """페이지를 runs회 재실행하고 (실행별 섹션 기록, 실행별 전체 시간)을 반환합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    from instrumentation import SectionRecorder, add_listener, remove_listener
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=RUN_TIMEOUT)
+    at.run()  # 캐시 준비 (측정 제외)
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+    recorder = SectionRecorder()
+    add_listener(recorder)
+    records, totals = [], []
+    try:
+        for _ in range(runs):
+            recorder.reset()
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            at.run()
+            totals.append(time.perf_counter() - start)
+            if trace_memory:
+                tracemalloc.stop()
+            records.append(recorder.sections)
+    finally:
+        remove_listener(recorder)
+    return records, totals
+
+
+def measure_page(page, unit):
+    """페이지의 섹션별 측정값 {섹션: {relative_time, peak_mb, payload_kb}}를 반환합니다.
+
+    시간은 tracemalloc 없이 WARM_RUNS회 실행한 중앙값을 보정 작업 시간(unit초)으로
+    나눈 값, 메모리는
+    tracemalloc을 켠 별도 1회 실행의 섹션 피크값입니다. (섹션마다 피크를
+    초기화하므로 페이지 피크는 섹션 피크의 최댓값)
+    """
+    records, totals = _run_page(page, WARM_RUNS)
+    memory_records, _ = _run_page(page, 1, trace_memory=True)
+    section_peaks = [entry['peak_bytes'] for entry in memory_records[0].values()]
+
+    result = {
+        PAGE_SECTION: {
+            'relative_time': statistics.median(totals) / unit,
+            'peak_mb': max(section_peaks, default=0) / 1024 / 1024,
+            'payload_kb': sum(entry['payload_bytes'] for entry in records[-1].values()) / 1024,
+        }
+    }
+    for name in records[-1]:
+        result[name] = {
+            'relative_time': statistics.median(record.get(name, {}).get('seconds', 0.0) for record in records) / unit,
+            'peak_mb': memory_records[0].get(name, {}).get('peak_bytes', 0) / 1024 / 1024,
+            'payload_kb': records[-1][name]['payload_bytes'] / 1024,
+        }
+    return result
+
+
+def measure_scale(scale, pages, workdir):
+    """하위 프로세스에서 한 데이터 배수의 모든 페이지를 측정합니다.
+
+    {'calibration_seconds': 보정 작업 시간, 'pages': {페이지: 섹션별 측정값}}을 반환합니다.
+    """
+    data_path = write_scaled_csv(scale, os.path.join(workdir, f"dx_outlet_{scale}x.csv"))
+    result_path = os.path.join(workdir, f"result_{scale}x.json")
+    env = dict(os.environ, DX_OUTLET_DATA=data_path, DX_PROGRESSIVE_RENDER='0')
+    subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure', result_path, '--pages', *pages],
+        env=env, cwd=ROOT, check=True
+    )
+    with open(result_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _measure_child(result_path, pages):
+    sys.path.insert(0, ROOT)
+    from streamlit import logger
+    logger.set_log_level('error')
+
+    unit = calibrate()  # 페이지 측정과 같은 프로세스에서 측정
+    result = {'calibration_seconds': unit, 'pages': {page: measure_page(page, unit) for page in pages}}
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def compare(budgets, measured):
+    """예산을 넘은 항목 목록 [(페이지, 배수, 섹션, 지표, 예산, 측정값)]을 반환합니다."""
+    violations = []
+    for page, scales in measured.items():
+        for scale, sections in scales.items():
+            page_budgets = budgets.get(page, {}).get(scale, {})
+            for name, metrics in sections.items():
+                for metric, value in metrics.items():
+                    limit = page_budgets.get(name, {}).get(metric)
+                    if limit is not None and value > limit:
+                        violations.append((page, scale, name, metric, limit, value))
+    return violations
+
+
+def missing_budgets(budgets, measured):
+    """예산이 없는 측정 섹션 목록 [(페이지, 배수, 섹션)]을 반환합니다."""
+    return [
+        (page, scale, name)
+        for page, scales in measured.items()
+        for scale, sections in scales.items()
+        for name in sections
+        if name not in budgets.get(page, {}).get(scale, {})
+    ]
+
+
+def format_diff(budgets, measured, violations):
+    """예산 초과 섹션별로 예산과 측정값의 차이를 diff 형식으로 만듭니다."""
+    lines = []
+    offending = sorted({(page, scale, name) for page, scale, name, *_ in violations})
+    for page, scale, name in offending:
+        budget = budgets[page][scale][name]
+        actual = measured[page][scale][name]
+        lines.append(f"--- budget   {page} [{scale}x] {name}")
+        lines.append(f"+++ measured {page} [{scale}x] {name}")
+        for metric in sorted(actual):
+            limit = budget.get(metric)
+            value = actual[metric]
+            if limit is not None and value > limit:
+                lines.append(f"-  {metric}: {limit:.3f}")
+                lines.append(f"+  {metric}: {value:.3f}  ({(value / limit - 1) * 100:+.0f}%)")
+            else:
+                lines.append(f"   {metric}: {value:.3f}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_budgets(measured):
+    """측정값에 여유를 더한 예산을 만듭니다."""
+    return {
+        page: {
+            scale: {
+                name: {
+                    metric: round(max(value * HEADROOM[metric], value + MIN_SLACK[metric]), 3)
+                    for metric, value in metrics.items()
+                }
+                for name, metrics in sections.items()
+            }
+            for scale, sections in scales.items()
+        }
+        for page, scales in measured.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 페이지 성능 예산 검사")
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    parser.add_argument('--scales', nargs='+', type=int, default=SCALES)
+    parser.add_argument('--budgets', default=BUDGET_PATH, help="예산 JSON 경로")
+    parser.add_argument('--update', action='store_true', help="측정값으로 예산 파일 갱신")
+    parser.add_argument('--add-missing', action='store_true', help="예산이 없는 섹션만 측정값으로 예산 추가")
+    parser.add_argument('--measure', help=argparse.SUPPRESS)  # 하위 프로세스용
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        _measure_child(args.measure, args.pages)
+        return 0
+
+    measured = {page: {} for page in args.pages}
+    with tempfile.TemporaryDirectory(prefix='dx_perf_') as workdir:
+        for scale in args.scales:
+            start = time.perf_counter()
+            result = measure_scale(scale, args.pages, workdir)
+            unit = result['calibration_seconds']
+            for page, sections in result['pages'].items():
+                measured[page][str(scale)] = sections
+                page_total = sections[PAGE_SECTION]
+                print(
+                    f"{page:<24} {scale:>4}x  rerun {page_total['relative_time']:6.2f}단위 "
+                    f"({page_total['relative_time'] * unit * 1000:5.0f}ms)  "
+                    f"peak {page_total['peak_mb']:6.1f}MB  payload {page_total['payload_kb']:7.1f}KB"
+                )
+            print(f"  ({scale}x 측정 {time.perf_counter() - start:.1f}초, 보정 작업 1단위 = {unit * 1000:.0f}ms)")
+
+    if args.update or args.add_missing:
+        budgets = {}
+        if os.path.exists(args.budgets):
+            with open(args.budgets, encoding='utf-8') as f:
+                budgets = json.load(f)
+        new_budgets = make_budgets(measured)
+        if args.add_missing:
+            for page, scale, name in missing_budgets(budgets, measured):
+                budgets.setdefault(page, {}).setdefault(scale, {})[name] = new_budgets[page][scale][name]
+        else:
+            for page, scales in new_budgets.items():
+                budgets.setdefault(page, {}).update(scales)
+        with open(args.budgets, 'w', encoding='utf-8') as f:
+            json.dump(budgets, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"예산 갱신 → {args.budgets}")
+        return 0
+
+    with open(args.budgets, encoding='utf-8') as f:
+        budgets = json.load(f)
+    violations = compare(budgets, measured)
+    missing = missing_budgets(budgets, measured)
+    if violations:
+        print(f"\n❌ 성능 예산 초과 {len(violations)}건\n")
+        print(format_diff(budgets, measured, violations))
+    if missing:
+        print(f"\n❌ 예산이 없는 섹션 {len(missing)}건 (섹션을 추가했으면 --update로 예산 갱신)")
+        for page, scale, name in missing:
+            print(f"   {page} [{scale}x] {name}")
+    if violations or missing:
+        return 1
+    print("\n✅ 모든 섹션이 성능 예산 이내입니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""부하/성능 테스트용 합성 데이터셋 생성
+
+원본 CSV의 매장을 factor배로 복제하여 같은 스키마의 큰 데이터셋을
+만듭니다. 복제된 매장은 매장명 뒤에 ' #k'가 붙고, 시즌 매출은 고정
+시드의 난수 배율로 흔들어 집계 결과가 원본과 똑같지 않도록 합니다.
+
+사용 예:
+    python tools/synthetic_data.py --scale 10 --output /tmp/dx_outlet_10x.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(ROOT, 'DX OUTLET MS DB.csv')
+
+
+def scale_dataset(df, factor, seed=0):
+    """매장을 factor배로 복제한 합성 데이터프레임을 반환합니다.
+
+    analytics를 가져오지 않으므로 DX_OUTLET_DATA 환경변수를 설정하기 전에
+    사용할 수 있습니다.
+    """
+    if factor <= 1:
+        return df.copy()
+
+    # 시즌 매출 컬럼 (예: 23SS, 24FW)
+    sales_columns = df.columns[df.columns.str.fullmatch(r'\d{2}(SS|FW)')].tolist()
+    rng = np.random.default_rng(seed)
+    copies = [df]
+    for k in range(1, factor):
+        copy = df.copy()
+        copy['매장명'] = copy['매장명'] + f" #{k}"
+        noise = rng.lognormal(mean=0.0, sigma=0.15, size=(len(copy), len(sales_columns)))
+        copy[sales_columns] = (copy[sales_columns].to_numpy(dtype=float) * noise).round(-2).astype('int64')
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_scaled_csv(factor, path, source=SOURCE_PATH, seed=0):
+    """원본 CSV를 factor배로 복제하여 path에 저장하고 경로를 반환합니다."""
+    scale_dataset(pd.read_csv(source), factor, seed).to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터셋 생성")
+    parser.add_argument('--scale', type=int, default=10, help="매장 복제 배수")
+    parser.add_argument('--output', required=True, help="저장할 CSV 경로")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_scaled_csv(args.scale, args.output, seed=args.seed)
+    print(f"{args.scale}배 데이터셋 저장 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
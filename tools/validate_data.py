@@ -0,0 +1,49 @@
+"""데이터 CSV 적재 검증 (격리 보고서 생성)
+
+대시보드가 적재할 때와 같은 검증(analytics.validate_dataset)을 새 데이터
+파일에 미리 실행하여 규칙별 행 수를 출력하고, 제외/경고 행을 격리 CSV로
+저장합니다. 제외되는 행이 있으면 종료 코드 1을 반환하므로 배포 전에 새
+MS DB 파일을 확인하는 데 사용할 수 있습니다.
+
+사용 예:
+    python tools/validate_data.py
+    python tools/validate_data.py --data new_drop.csv --quarantine quarantine.csv
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics import DATA_PATH, VALIDATION_RULES, load_validated_dataset  # noqa: E402
+
+
+def format_summary(path, quality):
+    summary = quality.summary
+    lines = [
+        f"{path}: {summary['rows']:,}개 행, 제외 {summary['excluded']:,}행, 경고 {summary['warned']:,}행",
+    ]
+    for _, label, exclude in VALIDATION_RULES:
+        kind = "제외" if exclude else "경고"
+        lines.append(f"  {label:<16} {summary['rules'][label]:>10,}행 ({kind})")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 CSV 적재 검증")
+    parser.add_argument('--data', default=DATA_PATH, help="검증할 데이터 CSV 경로")
+    parser.add_argument('--quarantine', help="제외/경고 행을 저장할 CSV 경로 (기본: <데이터>.quarantine.csv)")
+    args = parser.parse_args(argv)
+
+    _, quality = load_validated_dataset(args.data)
+    print(format_summary(args.data, quality))
+    if not quality.clean:
+        path = args.quarantine or os.path.splitext(args.data)[0] + '.quarantine.csv'
+        quality.quarantine.to_csv(path, index=False, encoding='utf-8-sig')
+        print(f"격리 행 저장 → {path}")
+    return 1 if quality.summary['excluded'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())